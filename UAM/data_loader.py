@@ -1,11 +1,54 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-from sqlalchemy import create_engine
+from sklearn.decomposition import PCA, IncrementalPCA
+import joblib
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
 import json
+import warnings
+import os
+import glob
+import fnmatch
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from UAM import ingest_cache
+from UAM.streaming import ChunkStream, ReservoirSample, MomentAccumulator, CorrelationAccumulator, is_chunk_stream, is_reiterable
+
+# Above this many numeric columns preprocess_data(corr_method='auto') screens correlations on a row
+# sample instead of building the dense p x p matrix
+WIDE_TABLE_COLUMNS = 1000
+
+# Pooled SQLAlchemy engines shared by every load_data call for the same connection string
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
+
+def get_engine(connection_string, **engine_kwargs):
+    """Return the pooled engine registered for `connection_string`, creating it on first use."""
+    key = (connection_string, tuple(sorted(engine_kwargs.items())))
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(key)
+        if engine is None:
+            engine = create_engine(connection_string, pool_pre_ping=True, **engine_kwargs)
+            _ENGINES[key] = engine
+    return engine
+
+def _pool_capacity(engine):
+    """Connections the engine's pool can hand out at once, or None when it is unbounded."""
+    pool = engine.pool
+    if isinstance(pool, QueuePool) and pool._max_overflow >= 0:
+        return pool.size() + pool._max_overflow
+    return None
+
+def dispose_engines():
+    """Close every pooled connection and empty the engine registry."""
+    with _ENGINES_LOCK:
+        for engine in _ENGINES.values():
+            engine.dispose()
+        _ENGINES.clear()
+
+atexit.register(dispose_engines)
 
 def load_data(source_type, source_config):
     """
@@ -16,15 +59,83 @@ def load_data(source_type, source_config):
     - source_config: dict, configuration for the source
         For files: {'filepath': 'path/to/file'}
         For databases: {'connection_string': 'db_connection_string', 'query': 'SELECT ...'}
+        Optional for databases: 'chunksize' (int) to stream the result set through a server-side cursor,
+        or 'partition_column' (numeric column of the query result) with 'num_partitions' (int, default 4)
+        and optional 'lower_bound'/'upper_bound' to read key ranges in parallel over pooled connections
+        Optional for CSV: 'chunksize' (int) to stream the file instead of reading it at once,
+        'dtype' (dict) passed through to pandas.read_csv
+        For partitioned files, 'filepath' may be a directory or a glob pattern. The files are read
+        in a process pool ('max_workers') and get a categorical column named by 'partition_key'
+        (default 'partition') holding each file's name; 'partition_filter' (fnmatch pattern on the
+        file name) prunes files before anything is read
+        Optional for files: 'cache' (bool) to keep an uncompressed Arrow copy keyed by file content
+        and parse options, 'cache_dir' and 'cache_max_bytes' to place and bound it
+        (see UAM.ingest_cache.invalidate to drop entries)
+        Optional for all sources: 'infer_dtypes' (bool) to downcast numerics, turn repeated strings
+        into categories and parse date-like columns (see infer_schema), 'infer_sample_rows' (int)
+        for the size of the inference sample. The resulting schema is kept in df.attrs['schema'].
 
     Returns:
-    - df: pandas DataFrame
+    - df: pandas DataFrame, or a re-iterable ChunkStream of DataFrames when 'chunksize' is given
     """
     print(f"Loading data from source type: {source_type}")
     df = None
+    files = None
+    if source_type in ['csv', 'xlsx', 'json'] and _is_multi_file(source_config.get('filepath')):
+        files = _partition_files(source_type, source_config['filepath'], source_config.get('partition_filter'))
+        print(f"Found {len(files)} partition files.")
+    partition_key = source_config.get('partition_key', 'partition')
+    max_workers = source_config.get('max_workers')
+    use_cache = (source_config.get('cache') and source_type in ['csv', 'xlsx', 'json'] and files is None
+                 and not source_config.get('chunksize') and ingest_cache.cache_available())
+    if use_cache:
+        cache_dir = source_config.get('cache_dir', ingest_cache.DEFAULT_CACHE_DIR)
+        key = ingest_cache.cache_key(source_type, source_config)
+        df = ingest_cache.load(key, cache_dir)
+        if df is not None:
+            if source_config.get('infer_dtypes'):
+                df.attrs['schema'] = _schema_of(df)
+            print(f"Loaded {df.shape[0]} rows and {df.shape[1]} columns from columnar cache.")
+            return df
+
+    infer_dtypes = source_config.get('infer_dtypes', False)
+    sample_rows = source_config.get('infer_sample_rows', 10000)
+    schema = None
     if source_type == 'csv':
         filepath = source_config.get('filepath')
-        df = pd.read_csv(filepath)
+        chunksize = source_config.get('chunksize')
+        default_kwargs = {'dtype': source_config.get('dtype')}
+        read_kwargs = default_kwargs
+        if infer_dtypes:
+            sample_source = files[0] if files else filepath
+            schema = infer_schema(pd.read_csv(sample_source, nrows=sample_rows, dtype=source_config.get('dtype')))
+            read_kwargs = _schema_read_kwargs(schema, source_config.get('dtype'))
+            if hasattr(filepath, 'seek'):
+                filepath.seek(0)
+        if chunksize:
+            print(f"Streaming CSV in chunks of {chunksize} rows.")
+            if files is not None:
+                return ChunkStream(lambda: _read_partitioned_csv_chunks(files, chunksize, read_kwargs, partition_key),
+                                   description=f"csv:{filepath}")
+            return ChunkStream(lambda: _read_csv_chunks(filepath, chunksize, read_kwargs), description=f"csv:{filepath}")
+        def read_full(kwargs):
+            if files is not None:
+                return _read_partitioned_files('csv', files, kwargs, partition_key, max_workers)
+            if hasattr(filepath, 'seek'):
+                filepath.seek(0)
+            return pd.read_csv(filepath, **kwargs)
+
+        try:
+            df = read_full(read_kwargs)
+        except (ValueError, TypeError) as e:
+            # Only a schema taken from the sample can be wrong about the full file; other
+            # errors (e.g. a malformed CSV) would fail the same way on a second read
+            if read_kwargs == default_kwargs:
+                raise
+            print(f"Sampled dtypes did not fit the full file ({e}); re-reading with pandas defaults.")
+            df = read_full(default_kwargs)
+    elif source_type in ['xlsx', 'json'] and files is not None:
+        df = _read_partitioned_files(source_type, files, {}, partition_key, max_workers)
     elif source_type == 'xlsx':
         filepath = source_config.get('filepath')
         df = pd.read_excel(filepath, engine='openpyxl')
@@ -34,15 +145,278 @@ def load_data(source_type, source_config):
     elif source_type in ['sqlite', 'mysql', 'postgresql']:
         connection_string = source_config.get('connection_string')
         query = source_config.get('query')
-        engine = create_engine(connection_string)
-        df = pd.read_sql(query, engine)
+        engine = get_engine(connection_string)
+        chunksize = source_config.get('chunksize')
+        partition_column = source_config.get('partition_column')
+        if chunksize and partition_column:
+            raise ValueError("'chunksize' and 'partition_column' cannot be combined")
+        if chunksize:
+            print(f"Streaming query results in chunks of {chunksize} rows.")
+            return ChunkStream(lambda: _read_sql_chunks(engine, query, chunksize), description=f"{source_type}:{query}")
+        if partition_column:
+            df = _read_sql_partitioned(engine, query, partition_column, source_config.get('num_partitions', 4),
+                                       source_config.get('lower_bound'), source_config.get('upper_bound'))
+        else:
+            with engine.connect() as conn:
+                # User SQL goes to the driver as-is; text() would parse ':name' inside string literals as bind parameters
+                df = pd.read_sql(query, conn)
     else:
         raise ValueError(f"Unsupported source_type: {source_type}")
 
+    if infer_dtypes:
+        if schema is None:
+            schema = infer_schema(df.head(sample_rows))
+        df = apply_schema(df, schema)
+        df.attrs['schema'] = _schema_of(df)
+        print(f"Inferred dtypes reduced memory to {df.memory_usage(deep=True).sum() / 1024 ** 2:.2f} MB")
+
+    if use_cache:
+        ingest_cache.store(key, df, cache_dir, source_config.get('cache_max_bytes', ingest_cache.DEFAULT_CACHE_MAX_BYTES))
+
     print(f"Loaded {df.shape[0]} rows and {df.shape[1]} columns.")
     return df
 
-def preprocess_data(df, corr_threshold=0.95, missing_threshold=0.6, pca_variance=0.95):
+def _is_multi_file(filepath):
+    return isinstance(filepath, (str, os.PathLike)) and (os.path.isdir(filepath) or glob.has_magic(str(filepath)))
+
+def _partition_files(source_type, filepath, partition_filter=None):
+    """List the files of a directory or glob, pruned by an fnmatch pattern on the file name."""
+    filepath = str(filepath)
+    if os.path.isdir(filepath):
+        pattern = os.path.join(filepath, f"*.{source_type}")
+    else:
+        pattern = filepath
+    files = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    if partition_filter:
+        files = [path for path in files if fnmatch.fnmatch(os.path.basename(path), partition_filter)]
+    if not files:
+        raise FileNotFoundError(f"No {source_type} files match {filepath}")
+    return files
+
+def _partition_dtype(files):
+    """
+    Categorical dtype of the partition column, one category per file in order: the file name,
+    or the path relative to the files' common root when two files share a name.
+    """
+    names = [os.path.splitext(os.path.basename(path))[0] for path in files]
+    if len(set(names)) < len(names):
+        root = os.path.commonpath(files)
+        names = [os.path.splitext(os.path.relpath(path, root))[0] for path in files]
+    return pd.CategoricalDtype(names)
+
+def _add_partition_column(df, partition_key, codes, dtype):
+    """Add the partition column from per-row file indices, refusing to overwrite a data column."""
+    if partition_key in df.columns:
+        raise ValueError(f"Partition column '{partition_key}' clashes with a column of the data; set another 'partition_key'")
+    df[partition_key] = pd.Categorical.from_codes(codes, dtype=dtype)
+    return df
+
+def _read_file(source_type, filepath, read_kwargs):
+    if source_type == 'csv':
+        return pd.read_csv(filepath, **read_kwargs)
+    if source_type == 'xlsx':
+        return pd.read_excel(filepath, engine='openpyxl', **read_kwargs)
+    return pd.read_json(filepath, **read_kwargs)
+
+def _read_partitioned_files(source_type, files, read_kwargs, partition_key='partition', max_workers=None):
+    """
+    Read partition files in a process pool and concatenate them once. The partition column is
+    built afterwards from per-file row counts as a categorical, so no per-row labels are
+    materialized or shipped between processes.
+    """
+    workers = min(len(files), max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frames = list(pool.map(_read_file, [source_type] * len(files), files, [read_kwargs] * len(files)))
+    else:
+        frames = [_read_file(source_type, path, read_kwargs) for path in files]
+    df = pd.concat(frames, ignore_index=True)
+    codes = np.repeat(np.arange(len(files)), [len(frame) for frame in frames])
+    del frames
+    return _add_partition_column(df, partition_key, codes, _partition_dtype(files))
+
+def _read_partitioned_csv_chunks(files, chunksize, read_kwargs, partition_key='partition'):
+    """Chunks of every file in turn, with the same categorical partition column as _read_partitioned_files."""
+    dtype = _partition_dtype(files)
+    for i, path in enumerate(files):
+        for chunk in _read_csv_chunks(path, chunksize, read_kwargs):
+            yield _add_partition_column(chunk, partition_key, np.full(len(chunk), i), dtype)
+
+def _read_sql_chunks(engine, query, chunksize):
+    """Yield result chunks from a server-side cursor, so only `chunksize` rows are buffered client-side."""
+    with engine.connect() as conn:
+        conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+        for chunk in pd.read_sql(query, conn, chunksize=chunksize):
+            yield chunk
+
+def _read_sql_partitioned(engine, query, column, num_partitions, lower_bound=None, upper_bound=None):
+    """
+    Split `query` into contiguous ranges of a numeric column and read them concurrently,
+    one pooled connection per range. As with Spark's JDBC reader, the bounds only decide the
+    stride: the first and last ranges are open-ended, and NULL keys are read as a final partition.
+    """
+    col = engine.dialect.identifier_preparer.quote(column)
+    # A statement terminator is fine on its own but not inside the derived table below
+    query = query.rstrip().rstrip(';').rstrip()
+    # The generated queries are text() constructs with their own :lo/:hi parameters; escaping the
+    # user query's colons keeps text() from reading ':name' inside its literals as parameters
+    escaped = query.replace(':', '\\:')
+    source = f"({escaped}) AS uam_src"
+    if lower_bound is None or upper_bound is None:
+        with engine.connect() as conn:
+            low, high = conn.execute(text(f"SELECT MIN({col}), MAX({col}) FROM {source}")).one()
+        lower_bound = low if lower_bound is None else lower_bound
+        upper_bound = high if upper_bound is None else upper_bound
+
+    partitions = []
+    if lower_bound is not None and upper_bound is not None:
+        edges = np.linspace(float(lower_bound), float(upper_bound), max(int(num_partitions), 1) + 1)[1:-1]
+        conditions = [f"{col} IS NOT NULL"] if len(edges) == 0 else (
+            [f"{col} < :hi"] + [f"{col} >= :lo AND {col} < :hi"] * (len(edges) - 1) + [f"{col} >= :lo"])
+        bounds = [None] + list(edges) + [None]
+        for i, condition in enumerate(conditions):
+            params = {}
+            if ':lo' in condition:
+                params['lo'] = float(bounds[i])
+            if ':hi' in condition:
+                params['hi'] = float(bounds[i + 1])
+            partitions.append((f"SELECT * FROM {source} WHERE {condition}", params))
+    partitions.append((f"SELECT * FROM {source} WHERE {col} IS NULL", {}))
+
+    def read_partition(partition):
+        sql, params = partition
+        with engine.connect() as conn:
+            return pd.read_sql(text(sql), conn, params=params)
+
+    # More threads than pooled connections would only queue on the pool (and time out on slow ranges)
+    workers = min(len(partitions), _pool_capacity(engine) or len(partitions))
+    print(f"Reading {len(partitions)} partitions of '{column}' with {workers} connections.")
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(read_partition, partitions))
+    # The NULL-key partition comes back with object columns; let pandas re-infer the merged dtypes
+    return pd.concat(frames, ignore_index=True).infer_objects()
+
+def infer_schema(sample_df, category_ratio=0.5, downcast_floats=True):
+    """
+    Build an explicit dtype map from a sample of a source.
+
+    Parameters:
+    - sample_df: pandas DataFrame, rows sampled from the source with pandas' default dtypes
+    - category_ratio: float, string columns with at most this fraction of distinct values become 'category'
+    - downcast_floats: bool, map float64 columns to float32
+
+    Returns:
+    - schema: dict mapping column name to dtype name. Integer columns get the smallest type that
+      fits the sample, but load_data only applies it after checking the full column range.
+    """
+    schema = {}
+    for col in sample_df.columns:
+        series = sample_df[col]
+        if pd.api.types.is_bool_dtype(series):
+            schema[col] = 'bool'
+        elif pd.api.types.is_integer_dtype(series):
+            schema[col] = str(pd.to_numeric(series, downcast='integer').dtype)
+        elif pd.api.types.is_float_dtype(series):
+            schema[col] = 'float32' if downcast_floats else str(series.dtype)
+        elif pd.api.types.is_datetime64_any_dtype(series) or _looks_like_datetime(series):
+            schema[col] = 'datetime64[ns]'
+        elif series.notna().any() and series.nunique(dropna=True) <= category_ratio * series.notna().sum():
+            schema[col] = 'category'
+        else:
+            schema[col] = str(series.dtype)
+    return schema
+
+def apply_schema(df, schema):
+    """
+    Cast df to an inferred schema. Integers are downcast from the full column range rather than
+    the sample, so values never overflow; casts that do not fit leave the column unchanged.
+    """
+    for col, dtype in schema.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        try:
+            if dtype.startswith('int'):
+                if pd.api.types.is_integer_dtype(df[col]):
+                    df[col] = pd.to_numeric(df[col], downcast='integer')
+            elif dtype == 'float32':
+                if pd.api.types.is_float_dtype(df[col]):
+                    df[col] = df[col].astype('float32')
+            elif dtype == 'category':
+                df[col] = df[col].astype('category')
+            elif dtype.startswith('datetime64'):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    df[col] = pd.to_datetime(df[col], format='mixed')
+        except (ValueError, TypeError, OverflowError):
+            print(f"Keeping dtype {df[col].dtype} for column '{col}' (inferred {dtype} does not fit)")
+    return df
+
+def _looks_like_datetime(series, min_ratio=0.9):
+    values = series.dropna()
+    if values.empty or pd.api.types.is_numeric_dtype(values):
+        return False
+    values = values.astype(str)
+    if not values.str.contains(r'[-/:]').all():
+        return False
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        parsed = pd.to_datetime(values, errors='coerce', format='mixed')
+    return parsed.notna().mean() >= min_ratio
+
+def _schema_read_kwargs(schema, user_dtype=None):
+    """
+    read_csv arguments for an inferred schema. Integers are read at full width because read_csv
+    wraps out-of-range values silently instead of raising; apply_schema downcasts them afterwards.
+    """
+    dtype = {col: typ for col, typ in schema.items() if typ in ('float32', 'category')}
+    dtype.update(user_dtype or {})
+    parse_dates = [col for col, typ in schema.items() if typ.startswith('datetime64') and col not in dtype]
+    return {'dtype': dtype, 'parse_dates': parse_dates}
+
+def _schema_of(df):
+    return {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+def _read_csv_chunks(filepath, chunksize, read_kwargs=None):
+    """
+    Yield CSV chunks whose dtypes are pinned to the ones inferred for the first chunk,
+    so downstream consumers see a stable schema. Integer columns that later contain
+    missing values are widened to float64; numeric columns that later contain unparsable
+    values are widened to object, with a message, rather than losing those values.
+    Categorical columns keep the categories of their own chunk. File-like sources are
+    rewound first, so every pass of a ChunkStream reads the whole file.
+    """
+    if hasattr(filepath, 'seek'):
+        filepath.seek(0)
+    pinned = None
+    with pd.read_csv(filepath, chunksize=chunksize, **(read_kwargs or {})) as reader:
+        for chunk in reader:
+            if pinned is None:
+                pinned = chunk.dtypes.to_dict()
+            else:
+                _coerce_chunk_dtypes(chunk, pinned)
+            yield chunk
+
+def _coerce_chunk_dtypes(chunk, pinned):
+    for col, dtype in pinned.items():
+        if (col not in chunk.columns or chunk[col].dtype == dtype or pd.api.types.is_bool_dtype(dtype)
+                or isinstance(dtype, pd.CategoricalDtype)):
+            continue
+        if pd.api.types.is_numeric_dtype(dtype):
+            values = pd.to_numeric(chunk[col], errors='coerce')
+            unparsable = int((values.isnull() & chunk[col].notnull()).sum())
+            if unparsable:
+                print(f"Column '{col}' has {unparsable} non-numeric values after the first chunk; reading it as object from here on")
+                pinned[col] = np.dtype(object)
+                chunk[col] = chunk[col].astype(object)
+                continue
+            if pd.api.types.is_integer_dtype(dtype) and values.isnull().any():
+                dtype = pinned[col] = np.dtype('float64')
+            chunk[col] = values.astype(dtype)
+        else:
+            chunk[col] = chunk[col].astype(dtype)
+
+def preprocess_data(df, corr_threshold=0.95, missing_threshold=0.6, pca_variance=0.95, corr_method='auto',
+                    pca_method='full', pca_batch_size=10000, pca_model_path=None):
     """
     Preprocess the DataFrame by removing constant and redundant features,
     handling missing values, auto-detecting column types, and applying PCA.
@@ -52,114 +426,613 @@ def preprocess_data(df, corr_threshold=0.95, missing_threshold=0.6, pca_variance
     - corr_threshold: float, correlation threshold to remove redundant features
     - missing_threshold: float, threshold to drop columns with missing values above this fraction
     - pca_variance: float, variance ratio to keep in PCA
+    - corr_method: str, 'exact' builds the full correlation matrix, 'sampled' screens candidate pairs
+      on a row sample and confirms them exactly (see find_correlated_columns), 'auto' uses 'sampled'
+      above WIDE_TABLE_COLUMNS numeric columns
+    - pca_method: str, 'full' (exact SVD), 'randomized' (randomized SVD) or 'incremental'
+      (IncrementalPCA fitted in batches of pca_batch_size rows, always used for chunk streams)
+    - pca_batch_size: int, rows per batch for the incremental fit and for transforming
+    - pca_model_path: str, optional path where the fitted scaler and PCA are saved with joblib
+      so other datasets can be transformed with apply_pca_model without refitting
 
     Returns:
     - df_processed: pandas DataFrame after preprocessing (PCA applied if triggered)
     - metadata: dict with preprocessing summary and dataset profile
-    - pca_fig: matplotlib Figure object of explained variance plot (or None if PCA not applied)
-    """
-    metadata = {}
-    original_shape = df.shape
-    print(f"Original data shape: {original_shape}")
-
-    # 1. Remove constant features
-    constant_cols = [col for col in df.columns if df[col].nunique(dropna=False) == 1]
-    df = df.drop(columns=constant_cols)
-    print(f"Removed {len(constant_cols)} constant columns: {constant_cols}")
-
-    # 2. Remove redundant (highly correlated) features
-    numeric_df = df.select_dtypes(include=[np.number])
-    corr_matrix = numeric_df.corr().abs()
-    upper_tri = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-    to_drop = [column for column in upper_tri.columns if any(upper_tri[column] > corr_threshold)]
-    df = df.drop(columns=to_drop)
-    print(f"Dropped {len(to_drop)} highly correlated columns: {to_drop}")
-
-    # 3. Handle missing values
-    missing_percent = df.isnull().mean()
-    missing_report = missing_percent[missing_percent > 0].sort_values(ascending=False)
-    for col, pct in missing_report.items():
-        print(f"Column '{col}' has {pct:.2%} missing values")
-    drop_missing_cols = missing_percent[missing_percent > missing_threshold].index.tolist()
-    df = df.drop(columns=drop_missing_cols)
-    print(f"Dropped {len(drop_missing_cols)} columns with >{missing_threshold*100:.0f}% missing values: {drop_missing_cols}")
-
-    # Optionally, fill or flag minor missing entries - here we fill numeric with median, categorical with mode
-    minor_missing_cols = missing_percent[(missing_percent > 0) & (missing_percent <= missing_threshold)].index.tolist()
-    for col in minor_missing_cols:
-        if df[col].dtype in [np.float64, np.int64]:
-            median_val = df[col].median()
-            df[col] = df[col].fillna(median_val)
-            print(f"Filled missing values in numeric column '{col}' with median: {median_val}")
+    - pca_fig: LazyFigure handle to the explained variance plot, rendered on first access of
+      `.figure` (or None if PCA not applied)
+
+    `df` may also be a re-iterable chunk stream (see load_data with 'chunksize'). The statistics
+    are then gathered in a single pass and df_processed is a ChunkStream that applies the
+    learned column drops and fills chunk by chunk.
+
+    To apply the same preprocessing to later data, use PreprocessingPipeline directly.
+    """
+    pipeline = PreprocessingPipeline(corr_threshold, missing_threshold, pca_variance, corr_method,
+                                     pca_method, pca_batch_size, pca_model_path)
+    df_processed = pipeline.fit_transform(df)
+    return df_processed, pipeline.metadata_, pipeline.pca_fig_
+
+# Default file name of a saved PreprocessingPipeline inside a model directory such as models/
+PIPELINE_FILENAME = 'preprocessing_pipeline.pkl'
+
+class PreprocessingPipeline:
+    """
+    Fit/transform form of preprocess_data.
+
+    fit() learns the dropped columns, imputation values, column types and the optional
+    scaler/PCA from a DataFrame or chunk stream; transform() applies them to new data of the
+    same feed with one drop, one fillna and a batched PCA projection, without refitting.
+    Parameters are those of preprocess_data. After fitting, `metadata_` holds the same summary
+    preprocess_data returns and `pca_fig_` the (lazy) explained variance figure.
+    """
+
+    def __init__(self, corr_threshold=0.95, missing_threshold=0.6, pca_variance=0.95, corr_method='auto',
+                 pca_method='full', pca_batch_size=10000, pca_model_path=None, sample_size=10000):
+        self.corr_threshold = corr_threshold
+        self.missing_threshold = missing_threshold
+        self.pca_variance = pca_variance
+        self.corr_method = corr_method
+        self.pca_method = pca_method
+        self.pca_batch_size = pca_batch_size
+        self.pca_model_path = pca_model_path
+        self.sample_size = sample_size
+        self.dropped_columns_ = None
+        self.fill_values_ = None
+        self.default_fill_values_ = None
+        self.column_types_ = None
+        self.pca_model_ = None
+        self.metadata_ = None
+        self.pca_fig_ = None
+
+    def fit(self, df):
+        self.fit_transform(df)
+        return self
+
+    def fit_transform(self, df):
+        if is_chunk_stream(df):
+            self._fit_chunks(df)
+            return self.transform(df)
+        cleaned = self._fit_frame(df)
+        return self._project(cleaned)
+
+    def transform(self, df):
+        if self.dropped_columns_ is None:
+            raise ValueError("PreprocessingPipeline is not fitted yet")
+        if is_chunk_stream(df):
+            return ChunkStream(lambda: (self.transform(chunk) for chunk in df), description="preprocessed chunks")
+        return self._project(self._clean(df))
+
+    def save(self, path=os.path.join('models', PIPELINE_FILENAME)):
+        """Serialize the fitted pipeline with joblib, e.g. next to the trained models."""
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        joblib.dump(self, path)
+        return path
+
+    @staticmethod
+    def load(path=os.path.join('models', PIPELINE_FILENAME)):
+        return joblib.load(path)
+
+    def _clean(self, df):
+        dropped = [col for col in self.dropped_columns_ if col in df.columns]
+        fills = {col: val for col, val in self.default_fill_values_.items() if col in df.columns}
+        fills.update({col: val for col, val in self.fill_values_.items() if col in df.columns})
+        df = df.drop(columns=dropped)
+        # A category column can only be filled with one of its categories (e.g. the default 'Missing')
+        for col, val in fills.items():
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype) \
+                    and val not in df[col].cat.categories and df[col].isnull().any():
+                df[col] = df[col].cat.add_categories([val])
+        return df.fillna(fills)
+
+    def _project(self, df):
+        if self.pca_model_ is None:
+            return df
+        missing = [col for col in self.pca_model_['columns'] if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns required by the fitted PCA are missing: {missing}")
+        return apply_pca_model(df, self.pca_model_, self.pca_batch_size)
+
+    def _fit_frame(self, df):
+        corr_threshold, missing_threshold = self.corr_threshold, self.missing_threshold
+        original_shape = df.shape
+        schema = df.attrs.get('schema') or _schema_of(df)
+        print(f"Original data shape: {original_shape}")
+
+        # 1-3. Profile every column in one sweep, then drop constant, redundant and mostly-missing columns together
+        corr_method = self.corr_method
+        if corr_method == 'auto':
+            corr_method = 'sampled' if df.select_dtypes(include=[np.number]).shape[1] > WIDE_TABLE_COLUMNS else 'exact'
+        if corr_method not in ['exact', 'sampled']:
+            raise ValueError(f"Unsupported corr_method: {corr_method}")
+        profile, corr = profile_columns(df, with_corr=corr_method == 'exact')
+        constant_cols = profile.index[profile['is_constant']].tolist()
+        print(f"Removed {len(constant_cols)} constant columns: {constant_cols}")
+
+        numeric_cols = [col for col in df.select_dtypes(include=[np.number]).columns if col not in constant_cols]
+        if corr_method == 'exact':
+            corr_matrix = corr.loc[numeric_cols, numeric_cols].abs()
+            upper_tri = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
+            to_drop = [column for column in upper_tri.columns if any(upper_tri[column] > corr_threshold)]
         else:
-            mode_val = df[col].mode(dropna=True)
-            if not mode_val.empty:
-                mode_val = mode_val[0]
-                df[col] = df[col].fillna(mode_val)
-                print(f"Filled missing values in categorical column '{col}' with mode: {mode_val}")
+            to_drop = find_correlated_columns(df, numeric_cols, corr_threshold)
+        print(f"Dropped {len(to_drop)} highly correlated columns ({corr_method}): {to_drop}")
+
+        remaining = profile.index.difference(constant_cols + to_drop, sort=False)
+        missing_percent = profile.loc[remaining, 'null_count'] / max(len(df), 1)
+        missing_report = missing_percent[missing_percent > 0].sort_values(ascending=False)
+        for col, pct in missing_report.items():
+            print(f"Column '{col}' has {pct:.2%} missing values")
+        drop_missing_cols = missing_percent[missing_percent > missing_threshold].index.tolist()
+        df = df.drop(columns=constant_cols + to_drop + drop_missing_cols)
+        print(f"Dropped {len(drop_missing_cols)} columns with >{missing_threshold*100:.0f}% missing values: {drop_missing_cols}")
+
+        # Fill minor missing entries in bulk - numeric with median, categorical with mode
+        minor_missing_cols = missing_percent[(missing_percent > 0) & (missing_percent <= missing_threshold)].index.tolist()
+        median_cols = [col for col in minor_missing_cols
+                       if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])]
+        fill_values = df[median_cols].median().to_dict() if median_cols else {}
+        for col in minor_missing_cols:
+            if col not in fill_values:
+                mode_val = df[col].mode(dropna=True)
+                fill_values[col] = mode_val[0] if not mode_val.empty else 'Missing'
+        if fill_values:
+            df = df.fillna(fill_values)
+            print(f"Filled missing values (median for numeric, mode for categorical): {fill_values}")
+
+        # 4. Auto-detect column types
+        col_types = {}
+        for col in df.columns:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                col_types[col] = 'numerical'
+            elif pd.api.types.is_datetime64_any_dtype(df[col]):
+                col_types[col] = 'datetime'
+            elif profile.at[col, 'null_count'] == 0 and profile.at[col, 'nunique'] == df.shape[0]:
+                col_types[col] = 'id-like'
             else:
-                df[col] = df[col].fillna('Missing')
-                print(f"Filled missing values in categorical column '{col}' with 'Missing'")
-
-    # 4. Auto-detect column types
-    col_types = {}
-    for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            col_types[col] = 'numerical'
-        elif pd.api.types.is_datetime64_any_dtype(df[col]):
-            col_types[col] = 'datetime'
-        elif df[col].nunique() == df.shape[0]:
-            col_types[col] = 'id-like'
+                col_types[col] = 'categorical'
+        print(f"Detected column types: { {k: v for k, v in list(col_types.items())[:10]} } ...")
+
+        self.dropped_columns_ = constant_cols + to_drop + drop_missing_cols
+        self.fill_values_ = fill_values
+        # Columns complete at fit time may still have gaps in later batches: numeric ones get the
+        # fitted mean (free from the profile), the others a 'Missing' category
+        self.default_fill_values_ = {col: (profile.at[col, 'mean'] if typ == 'numerical' else 'Missing')
+                                     for col, typ in col_types.items() if typ in ('numerical', 'categorical')}
+        self.column_types_ = col_types
+
+        # 5. Dimensionality Reduction using PCA if features > 10
+        numeric_cols = [col for col, typ in col_types.items() if typ == 'numerical']
+        self._fit_pca_step(df[numeric_cols], self.pca_method, len(df))
+        self._record_metadata(original_shape, len(df.columns), constant_cols, to_drop, corr_method,
+                              drop_missing_cols, schema)
+        return df
+
+    def _fit_chunks(self, chunks):
+        """
+        Streaming fit. Null counts, constant detection and the correlation matrix are exact
+        mergeable statistics; medians, modes and id-like detection use a uniform reservoir sample
+        of `sample_size` rows. With corr_method 'sampled' (or 'auto' on wide streams) no p x p
+        matrix is accumulated: find_correlated_columns screens the reservoir sample and confirms
+        candidates with further passes. PCA is fitted incrementally with two further passes
+        (scaler, then IncrementalPCA).
+        """
+        if not is_reiterable(chunks):
+            raise TypeError("preprocess_data needs a re-iterable chunk stream, e.g. load_data(..., {'chunksize': N}), not a one-shot iterator")
+        corr_threshold, missing_threshold = self.corr_threshold, self.missing_threshold
+        if self.corr_method not in ['auto', 'exact', 'sampled']:
+            raise ValueError(f"Unsupported corr_method: {self.corr_method}")
+
+        columns = None
+        corr_acc = None
+        n_rows = 0
+        sample = ReservoirSample(self.sample_size)
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
+                schema = _schema_of(chunk)
+                null_counts = pd.Series(0, index=columns, dtype='int64')
+                constant_values = {col: chunk[col].iloc[0] for col in columns if len(chunk)}
+                stream_numeric = chunk.select_dtypes(include=[np.number]).columns.tolist()
+                corr_method = self.corr_method
+                if corr_method == 'auto':
+                    corr_method = 'sampled' if len(stream_numeric) > WIDE_TABLE_COLUMNS else 'exact'
+                if corr_method == 'exact':
+                    corr_acc = CorrelationAccumulator(stream_numeric)
+            n_rows += len(chunk)
+            null_counts += chunk.isnull().sum()
+            if corr_acc is not None:
+                corr_acc.update(chunk)
+            sample.update(chunk)
+            if constant_values:
+                candidates = list(constant_values)
+                nunique = chunk[candidates].nunique(dropna=False)
+                for col in candidates:
+                    first = chunk[col].iloc[0] if len(chunk) else constant_values[col]
+                    same = (pd.isnull(first) and pd.isnull(constant_values[col])) or first == constant_values[col]
+                    if nunique[col] > 1 or not same:
+                        del constant_values[col]
+        if columns is None:
+            raise ValueError("Chunk stream is empty")
+
+        original_shape = (n_rows, len(columns))
+        print(f"Original data shape: {original_shape}")
+
+        constant_cols = list(constant_values) if n_rows else []
+        print(f"Removed {len(constant_cols)} constant columns: {constant_cols}")
+
+        sample_df = sample.to_frame()
+        numeric_cols = [col for col in stream_numeric if col not in constant_cols]
+        if corr_method == 'exact':
+            corr_matrix = corr_acc.corr().loc[numeric_cols, numeric_cols].abs()
+            upper_tri = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
+            to_drop = [column for column in upper_tri.columns if any(upper_tri[column] > corr_threshold)]
         else:
-            col_types[col] = 'categorical'
-    print(f"Detected column types: { {k: v for k, v in list(col_types.items())[:10]} } ...")
-
-    # 5. Dimensionality Reduction using PCA if features > 10
-    pca_fig = None
-    numeric_cols = [col for col, typ in col_types.items() if typ == 'numerical']
-    df_numeric = df[numeric_cols].copy()
-    if df_numeric.shape[1] > 10:
-        print(f"Applying PCA on {df_numeric.shape[1]} numerical features")
-        scaler = StandardScaler()
-        scaled_data = scaler.fit_transform(df_numeric)
-        pca = PCA(n_components=pca_variance, svd_solver='full')
-        pca_data = pca.fit_transform(scaled_data)
+            to_drop = find_correlated_columns(chunks, numeric_cols, corr_threshold, sample=sample_df)
+        print(f"Dropped {len(to_drop)} highly correlated columns ({corr_method}): {to_drop}")
+
+        remaining = [col for col in columns if col not in constant_cols and col not in to_drop]
+        missing_percent = null_counts[remaining] / max(n_rows, 1)
+        missing_report = missing_percent[missing_percent > 0].sort_values(ascending=False)
+        for col, pct in missing_report.items():
+            print(f"Column '{col}' has {pct:.2%} missing values")
+        drop_missing_cols = missing_percent[missing_percent > missing_threshold].index.tolist()
+        print(f"Dropped {len(drop_missing_cols)} columns with >{missing_threshold*100:.0f}% missing values: {drop_missing_cols}")
+
+        fill_values = {}
+        minor_missing_cols = missing_percent[(missing_percent > 0) & (missing_percent <= missing_threshold)].index.tolist()
+        for col in minor_missing_cols:
+            if pd.api.types.is_numeric_dtype(sample_df[col]) and not pd.api.types.is_bool_dtype(sample_df[col]):
+                fill_values[col] = sample_df[col].median()
+            else:
+                mode_val = sample_df[col].mode(dropna=True)
+                fill_values[col] = mode_val[0] if not mode_val.empty else 'Missing'
+            print(f"Filling missing values in column '{col}' with: {fill_values[col]}")
+
+        dropped = constant_cols + to_drop + drop_missing_cols
+        kept = [col for col in columns if col not in dropped]
+        sample_df = sample_df[kept].fillna(fill_values)
+        col_types = {}
+        for col in kept:
+            if pd.api.types.is_numeric_dtype(sample_df[col]):
+                col_types[col] = 'numerical'
+            elif pd.api.types.is_datetime64_any_dtype(sample_df[col]):
+                col_types[col] = 'datetime'
+            elif sample_df[col].nunique() == sample_df.shape[0]:
+                col_types[col] = 'id-like'
+            else:
+                col_types[col] = 'categorical'
+        print(f"Detected column types: { {k: v for k, v in list(col_types.items())[:10]} } ...")
+
+        self.dropped_columns_ = dropped
+        self.fill_values_ = fill_values
+        self.default_fill_values_ = {col: (sample_df[col].mean() if typ == 'numerical' else 'Missing')
+                                     for col, typ in col_types.items() if typ in ('numerical', 'categorical')}
+        self.column_types_ = col_types
+
+        numeric_cols = [col for col, typ in col_types.items() if typ == 'numerical']
+        numeric_stream = ChunkStream(lambda: (self._clean(chunk)[numeric_cols] for chunk in chunks))
+        self._fit_pca_step(numeric_stream, 'incremental', n_rows)
+        self._record_metadata(original_shape, len(kept), constant_cols, to_drop, corr_method, drop_missing_cols, schema)
+        self.metadata_['chunked'] = True
+
+    def _fit_pca_step(self, numeric_data, pca_method, n_rows):
+        self.pca_model_ = None
+        self.pca_fig_ = None
+        n_numeric = len(self.numeric_columns_)
+        if n_numeric <= 10:
+            print(f"PCA not applied, number of numerical features ({n_numeric}) <= 10")
+            return
+        print(f"Applying PCA ({pca_method}) on {n_numeric} numerical features")
+        scaler, pca = fit_pca(numeric_data, self.pca_variance, pca_method, self.pca_batch_size, n_rows=n_rows)
         explained_var = np.cumsum(pca.explained_variance_ratio_) * 100
-        n_components = pca_data.shape[1]
-        print(f"PCA reduced features to {n_components} components explaining {explained_var[-1]:.2f}% variance")
-
-        # Create explained variance plot
-        fig, ax = plt.subplots(figsize=(8, 5))
-        sns.lineplot(x=range(1, n_components + 1), y=explained_var, marker='o', ax=ax)
-        ax.set_xlabel('Number of Components')
-        ax.set_ylabel('Cumulative Explained Variance (%)')
-        ax.set_title('PCA Explained Variance')
-        ax.grid(True)
-        pca_fig = fig
-
-        # Replace numerical columns with PCA components
-        pca_cols = [f'PCA_{i+1}' for i in range(n_components)]
-        df_pca = pd.DataFrame(pca_data, columns=pca_cols, index=df.index)
-
-        # Keep non-numerical columns as is
-        non_numeric_cols = [col for col in df.columns if col not in numeric_cols]
-        df_processed = pd.concat([df_pca, df[non_numeric_cols]], axis=1)
+        print(f"PCA reduced features to {pca.n_components_} components explaining {explained_var[-1]:.2f}% variance")
+        self.pca_model_ = {'columns': self.numeric_columns_, 'scaler': scaler, 'pca': pca, 'method': pca_method}
+        self.pca_fig_ = LazyFigure(_pca_variance_figure, explained_var)
+        if self.pca_model_path:
+            save_pca_model(self.pca_model_path, scaler, pca, self.numeric_columns_)
+
+    @property
+    def numeric_columns_(self):
+        return [col for col, typ in self.column_types_.items() if typ == 'numerical']
+
+    def _record_metadata(self, original_shape, n_kept, constant_cols, to_drop, corr_method, drop_missing_cols, schema):
+        n_final = n_kept
+        if self.pca_model_ is not None:
+            n_final += self.pca_model_['pca'].n_components_ - len(self.pca_model_['columns'])
+        final_shape = (original_shape[0], n_final)
+        print(f"Final data shape after preprocessing: {final_shape}")
+
+        metadata = {}
+        metadata['original_shape'] = original_shape
+        metadata['final_shape'] = final_shape
+        metadata['constant_columns_removed'] = constant_cols
+        metadata['highly_correlated_columns_removed'] = to_drop
+        metadata['correlation_method'] = corr_method
+        metadata['columns_dropped_missing'] = drop_missing_cols
+        metadata['column_types'] = self.column_types_
+        metadata['schema'] = schema
+        metadata['pca_applied'] = self.pca_model_ is not None
+        if self.pca_model_ is not None:
+            pca = self.pca_model_['pca']
+            metadata['pca_method'] = self.pca_model_['method']
+            metadata['pca_n_components'] = pca.n_components_
+            metadata['pca_explained_variance'] = np.sum(pca.explained_variance_ratio_) * 100
+            if self.pca_model_path:
+                metadata['pca_model_path'] = self.pca_model_path
+        self.metadata_ = metadata
+
+def fit_pca(X, pca_variance=0.95, method='full', batch_size=10000, n_rows=None, random_state=42):
+    """
+    Standardize numeric data and fit PCA with the fewest components explaining `pca_variance`.
+
+    Parameters:
+    - X: pandas DataFrame of numeric columns, or a re-iterable chunk stream of such frames
+    - pca_variance: float, cumulative explained variance ratio to keep
+    - method: str, 'full' (exact SVD on the standardized copy), 'randomized' (randomized SVD with a
+      doubling number of components until pca_variance is reached) or 'incremental' (StandardScaler
+      and IncrementalPCA fitted batch by batch, never holding the standardized data in memory)
+    - batch_size: int, rows per batch for the incremental fit
+    - n_rows: int, number of rows of a chunk stream (bounds the number of incremental components)
+
+    Returns:
+    - scaler: fitted StandardScaler
+    - pca: fitted PCA or IncrementalPCA truncated to the chosen number of components
+    """
+    if is_chunk_stream(X) and method != 'incremental':
+        raise ValueError("Chunk streams only support method='incremental'")
+    if method == 'full':
+        scaler = StandardScaler()
+        pca = PCA(n_components=pca_variance, svd_solver='full').fit(scaler.fit_transform(X))
+        return scaler, pca
+    if method == 'randomized':
+        scaler = StandardScaler()
+        scaled_data = scaler.fit_transform(X)
+        limit = min(scaled_data.shape)
+        k = min(limit, max(10, limit // 4))
+        while True:
+            pca = PCA(n_components=k, svd_solver='randomized', random_state=random_state).fit(scaled_data)
+            if pca.explained_variance_ratio_.sum() >= pca_variance or k >= limit:
+                break
+            k = min(limit, 2 * k)
+        return scaler, _truncate_pca(pca, pca_variance)
+    if method == 'incremental':
+        n_rows = len(X) if n_rows is None else n_rows
+        n_features = X.shape[1] if isinstance(X, pd.DataFrame) else None
+        scaler = StandardScaler()
+        for batch in _pca_batches(X, batch_size, 1):
+            scaler.partial_fit(batch)
+            n_features = batch.shape[1]
+        k_max = min(n_features, batch_size, n_rows)
+        pca = IncrementalPCA(n_components=k_max)
+        for batch in _pca_batches(X, batch_size, k_max):
+            pca.partial_fit(scaler.transform(batch))
+        return scaler, _truncate_pca(pca, pca_variance)
+    raise ValueError(f"Unsupported pca_method: {method}")
+
+def _truncate_pca(pca, pca_variance):
+    """Keep the leading components reaching pca_variance, using the same rule as PCA(n_components=float)."""
+    ratio_cumsum = np.cumsum(pca.explained_variance_ratio_)
+    k = min(int(np.searchsorted(ratio_cumsum, pca_variance, side='right')) + 1, len(ratio_cumsum))
+    for attr in ['components_', 'explained_variance_', 'explained_variance_ratio_', 'singular_values_']:
+        setattr(pca, attr, getattr(pca, attr)[:k])
+    pca.n_components_ = k
+    return pca
+
+def _pca_batches(X, batch_size, min_rows):
+    """
+    Yield row batches of a DataFrame or chunk stream with at least `min_rows` rows each
+    (except when there are fewer rows in total). Small trailing chunks are merged into the
+    previous batch, which is held back by one step for that purpose.
+    """
+    if isinstance(X, pd.DataFrame):
+        frames = (X.iloc[start:start + batch_size] for start in range(0, len(X), batch_size))
+    else:
+        frames = iter(X)
+    pending, held = [], None
+    for frame in frames:
+        pending.append(frame)
+        if sum(len(f) for f in pending) >= max(min_rows, 1):
+            if held is not None:
+                yield held
+            held = pd.concat(pending) if len(pending) > 1 else pending[0]
+            pending = []
+    if pending:
+        held = pd.concat(([held] if held is not None else []) + pending)
+    if held is not None:
+        yield held
+
+def _transform_pca(X, scaler, pca, batch_size=10000):
+    """Project X batch by batch into a preallocated array, without a standardized copy of X."""
+    out = np.empty((len(X), pca.n_components_))
+    for start in range(0, len(X), batch_size):
+        out[start:start + batch_size] = pca.transform(scaler.transform(X.iloc[start:start + batch_size]))
+    return out
+
+class LazyFigure:
+    """
+    Handle to a matplotlib figure that is only rendered when first used.
+
+    Headless runs that never look at the figure skip importing matplotlib/seaborn and drawing it.
+    `.figure` (or any Figure attribute, e.g. `savefig`) renders it once; pickling keeps only the
+    inputs, not the rendered figure.
+    """
+
+    def __init__(self, render, *args):
+        self._render = render
+        self._args = args
+        self._figure = None
+
+    @property
+    def figure(self):
+        if self._figure is None:
+            self._figure = self._render(*self._args)
+        return self._figure
+
+    @property
+    def rendered(self):
+        return self._figure is not None
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('_render', '_args', '_figure'):
+            raise AttributeError(name)
+        return getattr(self.figure, name)
+
+    def __getstate__(self):
+        return {'_render': self._render, '_args': self._args, '_figure': None}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+def _pca_variance_figure(explained_var):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.lineplot(x=range(1, len(explained_var) + 1), y=explained_var, marker='o', ax=ax)
+    ax.set_xlabel('Number of Components')
+    ax.set_ylabel('Cumulative Explained Variance (%)')
+    ax.set_title('PCA Explained Variance')
+    ax.grid(True)
+    return fig
+
+def save_pca_model(path, scaler, pca, columns):
+    """Persist a fitted scaler and PCA with the numeric columns they expect."""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump({'columns': list(columns), 'scaler': scaler, 'pca': pca}, path)
+
+def load_pca_model(path):
+    return joblib.load(path)
+
+def apply_pca_model(df, model, batch_size=10000):
+    """
+    Replace the model's numeric columns in df by its PCA components without refitting.
+    `model` is the dict saved by save_pca_model (or a path to it).
+    """
+    if isinstance(model, (str, os.PathLike)):
+        model = load_pca_model(model)
+    columns = model['columns']
+    pca_data = _transform_pca(df[columns], model['scaler'], model['pca'], batch_size)
+    pca_cols = [f'PCA_{i+1}' for i in range(pca_data.shape[1])]
+    df_pca = pd.DataFrame(pca_data, columns=pca_cols, index=df.index)
+    return pd.concat([df_pca, df.drop(columns=columns)], axis=1)
+
+def profile_columns(df, rows_per_block=100000, with_corr=True):
+    """
+    Profile every column of df in one sweep over row blocks.
+
+    Numeric columns are converted to float64 one block at a time; each block feeds mergeable
+    moment and pairwise-complete correlation accumulators, so temporary memory is bounded by
+    `rows_per_block` and the correlation matrix comes from BLAS matrix products. Non-numeric
+    columns get null counts and distinct counts.
+
+    Returns:
+    - profile: DataFrame indexed by column with null_count, nunique (non-numeric only),
+      is_constant, mean, std, min and max (numeric only)
+    - corr: DataFrame, Pearson correlation matrix of the numeric columns (None unless with_corr)
+    """
+    n_rows = len(df)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    other_cols = df.columns.difference(numeric_cols, sort=False)
+    moments = MomentAccumulator(numeric_cols)
+    corr_acc = CorrelationAccumulator(numeric_cols) if with_corr else None
+    for start in range(0, n_rows, rows_per_block):
+        values = df[numeric_cols].iloc[start:start + rows_per_block].to_numpy(dtype=np.float64, na_value=np.nan)
+        moments.merge(MomentAccumulator.from_array(values, numeric_cols))
+        if corr_acc is not None:
+            corr_acc.update_array(values)
+
+    stats = moments.to_frame()[['count', 'mean', 'std', 'min', 'max']]
+    profile = pd.DataFrame(index=df.columns)
+    profile['null_count'] = n_rows
+    profile.loc[numeric_cols, 'null_count'] = n_rows - stats['count'].to_numpy(dtype=np.int64) if n_rows else 0
+    profile.loc[other_cols, 'null_count'] = df[other_cols].isnull().sum()
+    profile['nunique'] = np.nan
+    if len(other_cols):
+        profile.loc[other_cols, 'nunique'] = df[other_cols].nunique(dropna=True)
+    for stat in ['mean', 'std', 'min', 'max']:
+        profile[stat] = stats[stat] if n_rows else np.nan
+    # Constant when a single distinct value, counting NaN as a value: all missing, or no missing and one value
+    all_missing = profile['null_count'] == n_rows
+    numeric_single = profile['min'] == profile['max']
+    other_single = profile['nunique'] == 1
+    profile['is_constant'] = all_missing | ((profile['null_count'] == 0) & (numeric_single | other_single))
+    return profile, corr_acc.corr() if corr_acc is not None else None
+
+def find_correlated_columns(df, columns, corr_threshold=0.95, sample_rows=5000, block_size=512, margin=0.05,
+                            rows_per_block=100000, random_state=42, sample=None):
+    """
+    Redundant-feature detection for very wide tables without a dense p x p matrix.
+
+    Candidate pairs are screened on a uniform row sample: columns are standardized in float32
+    (missing values at the column mean) and correlated `block_size` columns at a time, keeping
+    pairs whose sample |corr| exceeds corr_threshold - margin. Each candidate is then confirmed
+    with the exact pairwise-complete correlation over all rows, in batches of columns.
+
+    `df` may also be a re-iterable chunk stream; `sample` is then a DataFrame of rows drawn
+    uniformly from it (e.g. a ReservoirSample) to screen on, and every batch of candidates is
+    confirmed with one pass over the chunks.
+
+    Returns the columns to drop, using the same rule as the exact method: a column is dropped
+    when it correlates above corr_threshold with any column before it in `columns`.
+    """
+    columns = list(columns)
+    if is_chunk_stream(df):
+        if sample is None:
+            raise ValueError("find_correlated_columns needs a row sample to screen a chunk stream")
+        row_blocks = lambda: iter(df)
     else:
-        print(f"PCA not applied, number of numerical features ({df_numeric.shape[1]}) <= 10")
-        df_processed = df
-
-    final_shape = df_processed.shape
-    print(f"Final data shape after preprocessing: {final_shape}")
-
-    metadata['original_shape'] = original_shape
-    metadata['final_shape'] = final_shape
-    metadata['constant_columns_removed'] = constant_cols
-    metadata['highly_correlated_columns_removed'] = to_drop
-    metadata['columns_dropped_missing'] = drop_missing_cols
-    metadata['column_types'] = col_types
-    metadata['pca_applied'] = df_numeric.shape[1] > 10
-    if df_numeric.shape[1] > 10:
-        metadata['pca_n_components'] = n_components
-        metadata['pca_explained_variance'] = explained_var[-1]
-
-    return df_processed, metadata, pca_fig
+        n = len(df)
+        rng = np.random.default_rng(random_state)
+        sample = df.iloc[np.sort(rng.choice(n, size=min(n, sample_rows), replace=False))]
+        row_blocks = lambda: (df.iloc[start:start + rows_per_block] for start in range(0, n, rows_per_block))
+    p = len(columns)
+    if p < 2 or len(sample) < 2:
+        return []
+    sample = sample[columns].to_numpy(dtype=np.float32, na_value=np.nan, copy=True)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        sample -= np.nan_to_num(np.nanmean(sample, axis=0))
+    np.nan_to_num(sample, copy=False)
+    norms = np.sqrt((sample * sample).sum(axis=0))
+    sample /= np.where(norms > 0, norms, 1.0)
+
+    candidates = []
+    for start in range(0, p, block_size):
+        block_corr = sample[:, start:start + block_size].T @ sample[:, start:]
+        i_idx, j_idx = np.nonzero(np.abs(block_corr) > corr_threshold - margin)
+        i_idx = i_idx + start
+        j_idx = j_idx + start
+        upper = j_idx > i_idx
+        candidates.extend(zip(i_idx[upper].tolist(), j_idx[upper].tolist()))
+    del sample
+    print(f"Sampled correlation screen found {len(candidates)} candidate pairs among {p} columns")
+
+    to_drop = set()
+    batch_cols, batch_pairs = [], []
+
+    def confirm():
+        acc = CorrelationAccumulator([columns[k] for k in batch_cols])
+        for block in row_blocks():
+            acc.update(block)
+        exact = acc.corr().abs().to_numpy()
+        position = {k: pos for pos, k in enumerate(batch_cols)}
+        for i, j in batch_pairs:
+            if exact[position[i], position[j]] > corr_threshold:
+                to_drop.add(j)
+
+    for i, j in sorted(candidates, key=lambda pair: (pair[1], pair[0])):
+        if j in to_drop:
+            continue
+        new_cols = [k for k in (i, j) if k not in batch_cols]
+        if batch_pairs and len(batch_cols) + len(new_cols) > 128:
+            confirm()
+            batch_cols, batch_pairs = [], []
+            if j in to_drop:
+                continue
+            new_cols = [i, j]
+        batch_cols.extend(new_cols)
+        batch_pairs.append((i, j))
+    if batch_pairs:
+        confirm()
+    return [columns[k] for k in sorted(to_drop)]
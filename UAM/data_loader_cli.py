@@ -6,6 +6,8 @@ import modeling as model
 import os
 from nl_query_interface import NaturalLanguageQueryInterface
 import report_generator as rg
+from fingerprint import dataset_fingerprint
+import frame_cache
 
 def prompt_data_source():
     print("Select data source type:")
@@ -49,6 +51,7 @@ def prompt_source_config(source_type):
                 print("No file selected. Exiting.")
                 sys.exit(1)
             config['filepath'] = filepath
+            config['cache'] = True
         except Exception as e:
             print(f"Could not open file dialog due to: {e}")
             filepath = input(f"Enter the file path for the {source_type.upper()} file: ").strip()
@@ -56,6 +59,7 @@ def prompt_source_config(source_type):
                 print("No file path entered. Exiting.")
                 sys.exit(1)
             config['filepath'] = filepath
+            config['cache'] = True
     else:
         connection_string = input(f"Enter the connection string for the {source_type.upper()} database: ").strip()
         query = input("Enter the SQL query to fetch data: ").strip()
@@ -76,7 +80,11 @@ def main():
             continue
 
         try:
-            df_processed, metadata, pca_fig = dl.preprocess_data(df)
+            pipeline = dl.PreprocessingPipeline()
+            df_processed = pipeline.fit_transform(df)
+            metadata, pca_fig = pipeline.metadata_, pipeline.pca_fig_
+            # Content key of the processed data, shared by the EDA, insight, modeling and report outputs
+            metadata['dataset_fingerprint'] = dataset_fingerprint(df_processed)
         except Exception as e:
             print(f"Error during preprocessing: {e}")
             continue
@@ -88,6 +96,7 @@ def main():
         if pca_fig:
             try:
                 import matplotlib.pyplot as plt
+                pca_fig.figure  # renders the deferred figure so plt.show() picks it up
                 plt.show()
             except ImportError:
                 print("matplotlib not installed, cannot show PCA plot.")
@@ -98,7 +107,9 @@ def main():
             if source_type in ['csv', 'xlsx', 'json']:
                 dataset_name = os.path.splitext(os.path.basename(source_config.get('filepath', '')))[0]
             save_path = os.path.join("reports", dataset_name) if dataset_name else "reports/"
-            eda.run_full_eda(df_processed, save_path=save_path)
+            # Derived results (outlier fences, ...) shared by the EDA and insight steps of this dataset
+            run_cache = frame_cache.FrameCache()
+            eda.run_full_eda(df_processed, save_path=save_path, cache=run_cache)
         except Exception as e:
             print(f"Error during EDA: {e}")
             continue
@@ -108,7 +119,7 @@ def main():
             insight_report_dir = os.path.join("reports", dataset_name) if dataset_name else "reports/general"
             os.makedirs(insight_report_dir, exist_ok=True)
             insight_report_path = os.path.join(insight_report_dir, "insight_report.md")
-            ie.run_insight_extraction(df_processed, output_path=insight_report_path)
+            ie.run_insight_extraction(df_processed, output_path=insight_report_path, cache=run_cache)
         except Exception as e:
             print(f"Error during Insight Extraction: {e}")
             continue
@@ -120,6 +131,9 @@ def main():
             model_report_path = os.path.join(model_report_dir, "model_report.md")
             model_dir = os.path.join("models", dataset_name) if dataset_name else "models/general"
             model.run_modeling(df_processed, output_dir=model_report_dir, model_dir=model_dir)
+            # Saved next to the models so new data can be preprocessed the same way before predicting
+            pipeline_path = pipeline.save(os.path.join(model_dir, dl.PIPELINE_FILENAME))
+            print(f"Preprocessing pipeline saved to {pipeline_path}")
         except Exception as e:
             print(f"Error during Modeling: {e}")
             continue
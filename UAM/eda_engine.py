@@ -3,63 +3,127 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from scipy.stats import skew, kurtosis
 from typing import List, Optional
 from matplotlib.colors import LinearSegmentedColormap, to_hex
 import re
+import json
 import warnings
+from scipy.signal import fftconvolve
 from matplotlib import font_manager
+from UAM.streaming import MomentAccumulator, SummaryAccumulator, is_chunk_stream
+from UAM.sketches import has_at_most_distinct
+from UAM.outliers import count_outliers
+from UAM import frame_cache
+from UAM.fingerprint import column_fingerprints, combine as combine_fingerprints
+from UAM.parallel import resolve_n_jobs
 
 sns.set_style('whitegrid')
 
-def generate_summary_statistics(df: pd.DataFrame) -> dict:
+def generate_summary_statistics(df: pd.DataFrame, top_k: int = 5, exact: bool = False, capacity: int = 1000,
+                                cache: Optional[frame_cache.FrameCache] = None) -> dict:
+    """
+    Numerical and categorical summary tables. Categorical columns are profiled in bounded memory:
+    the `top_k` most frequent values, mode frequency and dominance ratio come from a Space-Saving
+    summary of `capacity` values and distinct counts from HyperLogLog (both exact for columns with
+    at most `capacity` distinct values). `exact` counts every value instead.
+    `cache` is an optional FrameCache for df shared with the other steps of the same run.
+    """
+    if is_chunk_stream(df):
+        return _summary_statistics_from_chunks(df, top_k, exact, capacity)
+
     summary = {}
 
+    # Moments (count, mean, std, min, max, skew, kurtosis) in one vectorized pass over the numeric block
     num_cols = df.select_dtypes(include=[np.number]).columns
-    num_stats = df[num_cols].agg(['count', 'mean', 'median', 'std', 'min', 'max']).T
-    num_stats['skew'] = df[num_cols].apply(skew)
-    num_stats['kurtosis'] = df[num_cols].apply(kurtosis)
+    num_stats = MomentAccumulator.from_frame(df[num_cols]).to_frame()
+    num_stats.insert(2, 'median', df[num_cols].median())
     summary['numerical'] = num_stats
 
-    cat_cols = df.select_dtypes(include=['object', 'category']).columns
-    cat_stats = pd.DataFrame(index=cat_cols, columns=['unique_count', 'mode_freq', 'missing'])
-    for col in cat_cols:
-        unique_count = df[col].nunique(dropna=True)
-        mode_freq = df[col].value_counts(dropna=True).max() if unique_count > 0 else 0
-        missing = df[col].isnull().sum()
-        cat_stats.loc[col] = [unique_count, mode_freq, missing]
-    summary['categorical'] = cat_stats
+    summary['categorical'] = categorical_summary(df, top_k, exact, capacity, cache)
 
     return summary
 
-def extract_eda_insights(df: pd.DataFrame) -> List[str]:
+def categorical_summary(df: pd.DataFrame, top_k: int = 5, exact: bool = False, capacity: int = 1000,
+                        cache: Optional[frame_cache.FrameCache] = None) -> pd.DataFrame:
+    """Categorical summary table (see generate_summary_statistics), shared by the summary and insight steps."""
+    cat_cols = df.select_dtypes(include=['object', 'category']).columns
+
+    def compute():
+        stats = SummaryAccumulator([], cat_cols, capacity=capacity, exact=exact)
+        return stats.update(df).categorical(top_k)
+
+    return frame_cache.cached(cache, 'categorical_summary', (top_k, exact, capacity, tuple(cat_cols)), compute).copy()
+
+def _summary_statistics_from_chunks(chunks, top_k: int = 5, exact: bool = False, capacity: int = 1000) -> dict:
+    """
+    Single streaming pass over a chunk stream. Moments are exact, medians come from t-digests,
+    distinct counts from HyperLogLog and top values from Space-Saving, so memory stays bounded.
+    """
+    stats = None
+    for chunk in chunks:
+        if stats is None:
+            stats = SummaryAccumulator.for_frame(chunk, capacity=capacity, exact=exact)
+        stats.update(chunk)
+    if stats is None:
+        return {'numerical': pd.DataFrame(), 'categorical': pd.DataFrame()}
+    return {'numerical': stats.numerical(), 'categorical': stats.categorical(top_k)}
+
+def correlation_matrix(df: pd.DataFrame, columns=None, cache: Optional[frame_cache.FrameCache] = None) -> pd.DataFrame:
+    """Pearson correlation of the numeric columns; with a `cache`, computed once per run and shared by the insight and visual steps."""
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    columns = list(columns)
+    return frame_cache.cached(cache, 'corr', tuple(columns), lambda: df[columns].corr())
+
+def correlated_pairs(corr: pd.DataFrame, threshold: float = 0.8, top_k: Optional[int] = None,
+                     absolute: bool = True, upper: float = None) -> List[tuple]:
+    """
+    (col_a, col_b, value) for upper-triangle pairs with value above `threshold` (and below `upper`),
+    in matrix order. With `top_k`, only the k strongest pairs are returned, strongest first.
+    """
+    values = corr.to_numpy()
+    if absolute:
+        values = np.abs(values)
+    rows, cols = np.triu_indices(len(corr.columns), k=1)
+    pair_values = values[rows, cols]
+    with np.errstate(invalid='ignore'):
+        mask = pair_values > threshold
+        if upper is not None:
+            mask &= pair_values < upper
+    rows, cols, pair_values = rows[mask], cols[mask], pair_values[mask]
+    if top_k is not None and len(pair_values) > top_k:
+        order = np.argsort(-pair_values, kind='stable')[:top_k]
+        rows, cols, pair_values = rows[order], cols[order], pair_values[order]
+    names = corr.columns
+    return [(names[i], names[j], float(v)) for i, j, v in zip(rows, cols, pair_values)]
+
+def extract_eda_insights(df: pd.DataFrame, max_correlation_pairs: Optional[int] = 100, exact: bool = False,
+                         cache: Optional[frame_cache.FrameCache] = None) -> List[str]:
+    """
+    Rule-based insights. At most `max_correlation_pairs` strongly correlated pairs are listed
+    (the strongest ones) so very wide datasets do not produce millions of lines; None lists all.
+    Class dominance comes from the bounded categorical summary unless `exact` is set.
+    """
     insights = []
 
     num_cols = df.select_dtypes(include=[np.number]).columns
-    for col in num_cols:
-        Q1 = df[col].quantile(0.25)
-        Q3 = df[col].quantile(0.75)
-        IQR = Q3 - Q1
-        outliers = df[(df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))]
-        if not outliers.empty:
-            insights.append(f"Feature '{col}' has {len(outliers)} potential outliers.")
+    outlier_counts = count_outliers(df, num_cols, cache=cache)
+    for col, count in outlier_counts[outlier_counts > 0].items():
+        insights.append(f"Feature '{col}' has {count} potential outliers.")
 
-    cat_cols = df.select_dtypes(include=['object', 'category']).columns
-    for col in cat_cols:
-        counts = df[col].value_counts(normalize=True, dropna=True)
-        if counts.iloc[0] > 0.9:
+    dominance = categorical_summary(df, exact=exact, cache=cache)['dominance']
+    for col, share in dominance.items():
+        if share > 0.9:
             insights.append(f"Categorical feature '{col}' is highly imbalanced (dominant class > 90%).")
 
-    corr_matrix = df[num_cols].corr().abs()
-    strong_corrs = []
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i+1, len(corr_matrix.columns)):
-            val = corr_matrix.iloc[i, j]
-            if isinstance(val, (float, np.floating)) and val > 0.8:
-                strong_corrs.append((corr_matrix.columns[i], corr_matrix.columns[j], val))
-    if strong_corrs:
-        for c1, c2, val in strong_corrs:
-            insights.append(f"Features '{c1}' and '{c2}' have strong correlation: {val:.2f}")
+    corr_matrix = correlation_matrix(df, num_cols, cache)
+    strong_corrs = correlated_pairs(corr_matrix, 0.8)
+    if max_correlation_pairs is not None and len(strong_corrs) > max_correlation_pairs:
+        shown = correlated_pairs(corr_matrix, 0.8, top_k=max_correlation_pairs)
+        insights.append(f"{len(strong_corrs)} feature pairs have strong correlation (> 0.80); the {len(shown)} strongest are listed.")
+        strong_corrs = shown
+    for c1, c2, val in strong_corrs:
+        insights.append(f"Features '{c1}' and '{c2}' have strong correlation: {val:.2f}")
 
     variances = df[num_cols].var()
     high_var = variances[variances > variances.quantile(0.75)].index.tolist()
@@ -78,99 +142,557 @@ def extract_eda_insights(df: pd.DataFrame) -> List[str]:
 
     return insights
 
-def generate_eda_visuals(df, output_dir):
+def generate_eda_visuals(df, output_dir, n_jobs: int = 1, max_points: Optional[int] = 10000,
+                         scatter_mode: str = 'hexbin', trend_mode: str = 'minmax',
+                         fingerprints: Optional[dict] = None, previous: Optional[List[dict]] = None,
+                         output: str = 'png', cache: Optional[frame_cache.FrameCache] = None) -> List[dict]:
+    """
+    Render the EDA charts as PNGs into output_dir and return a manifest with one entry
+    ({'chart', 'file', 'columns'}) per file written.
+
+    With output='data' no figure is drawn: every chart is written as a compact JSON file of
+    aggregated data (histogram bins and KDE, category counts, correlation matrix, box-plot
+    quartiles, point-budgeted scatter and trend points) for a client-side chart component.
+
+    Every chart is an independent job. With n_jobs > 1 (-1 for all CPUs) the jobs run in a
+    process pool with the Agg backend; each worker reads only the columns its chart needs from
+    shared memory instead of receiving a pickled copy of the frame.
+
+    Scatter and trend charts draw at most `max_points` points (None plots every row). Above the
+    budget the scatter becomes a hexbin with a least-squares line (scatter_mode='hexbin') or a
+    grid-stratified sample (scatter_mode='sample'), and the trend is reduced with per-bucket
+    min/max (trend_mode='minmax', no sort of the full column) or LTTB (trend_mode='lttb').
+
+    With per-column `fingerprints` (see UAM.fingerprint) each manifest entry records the
+    fingerprint of its inputs and options; charts whose entry in `previous` (an earlier manifest)
+    has the same fingerprint are reused from disk instead of rendered, and files of charts that
+    are no longer produced are removed.
+    """
+    if scatter_mode not in ('hexbin', 'sample'):
+        raise ValueError(f"Unsupported scatter_mode: {scatter_mode}")
+    if trend_mode not in ('minmax', 'lttb'):
+        raise ValueError(f"Unsupported trend_mode: {trend_mode}")
+    if output not in ('png', 'data'):
+        raise ValueError(f"Unsupported output: {output}")
     os.makedirs(output_dir, exist_ok=True)
-
+    jobs = _plan_eda_charts(df, cache)
+    for job in jobs:
+        job['output'] = output
+        if output == 'data':
+            job['file'] = os.path.splitext(job['file'])[0] + '.json'
+        if job['chart'] == 'scatter':
+            job['payload'] = {'max_points': max_points, 'mode': scatter_mode}
+        elif job['chart'] == 'trend':
+            job['payload'] = {'max_points': max_points, 'mode': trend_mode}
+    reused = {}
+    if fingerprints is not None:
+        previous_entries = {entry['file']: entry for entry in previous or []}
+        for i, job in enumerate(jobs):
+            job['fingerprint'] = _job_fingerprint(job, fingerprints)
+            entry = previous_entries.get(os.path.join(output_dir, job['file']))
+            if (entry is not None and entry.get('fingerprint') == job['fingerprint']
+                    and all(os.path.exists(entry[key]) for key in ('file', 'data') if key in entry)):
+                reused[i] = entry
+    stale = [job for i, job in enumerate(jobs) if i not in reused]
+
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_jobs > 1 and len(stale) > 1:
+        rendered = _render_charts_in_pool(df, stale, output_dir, n_jobs)
+    else:
+        encoded = {col: _encode_column(df[col]) for col in _job_columns(stale)}
+        rendered = []
+        for job in stale:
+            data = {col: _decode_column(*encoded[col], col) for col in job['columns']}
+            rendered.append(_render_chart(job, data, output_dir))
+    rendered = iter(rendered)
+    manifest = [reused[i] if i in reused else next(rendered) for i in range(len(jobs))]
+
+    produced = {path for entry in manifest for path in (entry['file'], entry.get('data')) if path}
+    for entry in previous or []:
+        for path in (entry['file'], entry.get('data')):
+            if path and path not in produced and os.path.exists(path):
+                os.remove(path)
+
+    if reused:
+        print(f"Reused {len(reused)} unchanged charts, rendered {len(stale)}")
+    print(f"✅ EDA visuals saved in {output_dir}")
+    return manifest
+
+def _job_fingerprint(job, fingerprints) -> str:
+    # The heatmap payload is derived from its inputs; the scatter/trend payloads are render options
+    options = json.dumps(job['payload'], sort_keys=True) if isinstance(job['payload'], dict) else ''
+    return combine_fingerprints(job['chart'], job['file'], options, *(fingerprints[col] for col in job['inputs']))
+
+def _plan_eda_charts(df, cache=None) -> List[dict]:
+    """
+    One job per chart: 'columns' are the arrays shipped to the renderer, 'inputs' the dataset
+    columns the chart depends on, 'payload' any small precomputed input (e.g. the correlation matrix).
+    """
     # Identify column types
     numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
     categorical_cols = df.select_dtypes(exclude=[np.number]).columns.tolist()
 
     # Limit high-cardinality categoricals for plots
-    low_card_cats = [col for col in categorical_cols if df[col].nunique() <= 20]
+    low_card_cats = [col for col in categorical_cols if has_at_most_distinct(df[col], 20)]
+
+    def job(chart, file, columns, inputs=None, payload=None):
+        return {'chart': chart, 'file': file, 'columns': list(columns),
+                'inputs': list(columns if inputs is None else inputs), 'payload': payload}
 
+    jobs = []
     # ----- 1. Correlation Heatmap -----
     if len(numeric_cols) >= 2:
-        plt.figure(figsize=(8, 6))
-        corr = df[numeric_cols].corr()
-        sns.heatmap(corr, annot=False, cmap="coolwarm", center=0)
-        plt.title("Correlation Heatmap")
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, "correlation_heatmap.png"))
-        plt.close()
+        jobs.append(job('heatmap', "correlation_heatmap.png", [], numeric_cols, correlation_matrix(df, numeric_cols, cache)))
 
     # ----- 2. Key Numeric Distribution Plots -----
     for col in numeric_cols:
-        plt.figure(figsize=(6, 4))
-        sns.histplot(df[col].dropna(), kde=True, bins=30)
-        plt.title(f"Distribution of {col}")
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, f"dist_{col}.png"))
-        plt.close()
+        jobs.append(job('dist', f"dist_{col}.png", [col]))
 
     # ----- 3. Categorical Count Plots -----
     for col in low_card_cats:
-        plt.figure(figsize=(6, 4))
-        sns.countplot(x=df[col])
-        plt.xticks(rotation=45)
-        plt.title(f"Count of {col}")
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, f"count_{col}.png"))
-        plt.close()
+        jobs.append(job('count', f"count_{col}.png", [col]))
 
     # ----- 4. Numeric vs Numeric (Top Correlated Pair) -----
     if len(numeric_cols) >= 2:
-        corr_pairs = (
-            df[numeric_cols]
-            .corr()
-            .unstack()
-            .sort_values(ascending=False)
-            .drop_duplicates()
-        )
-        corr_pairs = corr_pairs[(corr_pairs < 0.999) & (corr_pairs > 0.3)]
-        if not corr_pairs.empty:
-            top_pair = corr_pairs.index[0]
-            plt.figure(figsize=(6, 4))
-            sns.scatterplot(x=df[top_pair[0]], y=df[top_pair[1]], alpha=0.6)
-            sns.regplot(x=df[top_pair[0]], y=df[top_pair[1]], scatter=False, color='red')
-            plt.title(f"Relationship: {top_pair[0]} vs {top_pair[1]}")
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, f"scatter_{top_pair[0]}_{top_pair[1]}.png"))
-            plt.close()
+        corr_pairs = correlated_pairs(correlation_matrix(df, numeric_cols, cache), 0.3, top_k=1, absolute=False, upper=0.999)
+        if corr_pairs:
+            top_pair = corr_pairs[0]
+            jobs.append(job('scatter', f"scatter_{top_pair[0]}_{top_pair[1]}.png", top_pair[:2], numeric_cols))
 
     # ----- 5. Numeric vs Categorical (Only Low-Cardinality) -----
     if numeric_cols and low_card_cats:
         for cat_col in low_card_cats:
             num_col = numeric_cols[0]  # First numeric for speed
-            plt.figure(figsize=(6, 4))
-            sns.boxplot(x=df[cat_col], y=df[num_col])
-            plt.xticks(rotation=45)
-            plt.title(f"{num_col} by {cat_col}")
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, f"box_{num_col}by{cat_col}.png"))
-            plt.close()
+            jobs.append(job('box', f"box_{num_col}by{cat_col}.png", [cat_col, num_col]))
 
     # ----- 6. Time-Series Plot (if datetime exists) -----
     datetime_cols = df.select_dtypes(include=["datetime64"]).columns.tolist()
     if datetime_cols and numeric_cols:
         date_col = datetime_cols[0]
         num_col = numeric_cols[0]
-        plt.figure(figsize=(8, 4))
-        df_sorted = df.sort_values(by=date_col)
-        sns.lineplot(x=df_sorted[date_col], y=df_sorted[num_col])
-        plt.title(f"Trend of {num_col} over {date_col}")
+        jobs.append(job('trend', f"trend_{num_col}over{date_col}.png", [date_col, num_col]))
+
+    return jobs
+
+def _job_columns(jobs) -> List[str]:
+    return list(dict.fromkeys(col for job in jobs for col in job['columns']))
+
+def _encode_column(series: pd.Series):
+    """Flat numpy array plus the metadata needed to rebuild the Series in another process."""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan), {'kind': 'numeric'}
+    if pd.api.types.is_datetime64_any_dtype(series):
+        tz = getattr(series.dt, 'tz', None)
+        values = (series.dt.tz_convert(None) if tz is not None else series).to_numpy(dtype='datetime64[ns]')
+        return values.view(np.int64), {'kind': 'datetime', 'tz': str(tz) if tz is not None else None}
+    # Categories in order of first appearance, as seaborn orders plain object columns
+    codes, uniques = pd.factorize(series)
+    return codes.astype(np.int64), {'kind': 'categorical', 'categories': list(uniques)}
+
+def _decode_column(values: np.ndarray, meta: dict, name) -> pd.Series:
+    if meta['kind'] == 'numeric':
+        return pd.Series(values, name=name)
+    if meta['kind'] == 'datetime':
+        series = pd.Series(values.view('datetime64[ns]'), name=name)
+        return series.dt.tz_localize('UTC').dt.tz_convert(meta['tz']) if meta['tz'] else series
+    categories = np.empty(len(meta['categories']) + 1, dtype=object)
+    categories[:-1] = meta['categories']
+    categories[-1] = None
+    return pd.Series(categories[values], name=name)
+
+def _render_charts_in_pool(df, jobs, output_dir, n_jobs) -> List[dict]:
+    from multiprocessing import shared_memory
+    from concurrent.futures import ProcessPoolExecutor
+
+    blocks, specs = [], {}
+    try:
+        for col in _job_columns(jobs):
+            values, meta = _encode_column(df[col])
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(values.shape, values.dtype, buffer=block.buf)[:] = values
+            specs[col] = (block.name, values.dtype.str, values.shape, meta)
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_render_worker) as pool:
+            futures = [pool.submit(_render_shared_chart, job, {col: specs[col] for col in job['columns']}, output_dir)
+                       for job in jobs]
+            return [future.result() for future in futures]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def _init_render_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _render_shared_chart(job, specs, output_dir) -> dict:
+    from multiprocessing import shared_memory
+
+    data = {}
+    for col, (name, dtype, shape, meta) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            values = np.ndarray(shape, dtype, buffer=block.buf).copy()
+        finally:
+            block.close()
+        data[col] = _decode_column(values, meta, col)
+    return _render_chart(job, data, output_dir)
+
+def _render_chart(job, data, output_dir) -> dict:
+    """
+    Draw one job and save its PNG, plus a JSON file with the plotted arrays when the renderer
+    returns them. For output='data' jobs only the JSON is written.
+    """
+    path = os.path.join(output_dir, job['file'])
+    if job.get('output') == 'data':
+        chart_data = _CHART_DATA[job['chart']](job, data)
+    else:
+        chart_data = _CHART_RENDERERS[job['chart']](job, data)
         plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, f"trend_{num_col}over{date_col}.png"))
+        plt.savefig(path)
         plt.close()
-
-    print(f"✅ EDA visuals saved in {output_dir}")
-
-def generate_eda_report(df: pd.DataFrame, save_path: str = "eda_outputs/", problem_type: Optional[str] = None):
+    entry = {'chart': job['chart'], 'file': path, 'columns': job['inputs']}
+    if 'fingerprint' in job:
+        entry['fingerprint'] = job['fingerprint']
+    if chart_data is not None:
+        entry['data'] = os.path.splitext(path)[0] + '.json'
+        with open(entry['data'], 'w', encoding='utf-8') as f:
+            json.dump({'chart': job['chart'], **chart_data}, f)
+    return entry
+
+def _json_values(values) -> list:
+    """Floats for JSON, with NaN/inf as null."""
+    values = np.asarray(values, dtype=np.float64)
+    return [float(v) if np.isfinite(v) else None for v in values]
+
+def _heatmap_data(job, data):
+    corr = job['payload']
+    return {'columns': [str(col) for col in corr.columns],
+            'matrix': [_json_values(row) for row in corr.to_numpy()]}
+
+def _dist_data(job, data):
+    col, = job['columns']
+    return {'column': col, **histogram_data(data[col].to_numpy())}
+
+def _count_data(job, data):
+    col, = job['columns']
+    counts = data[col].value_counts(sort=False, dropna=True)
+    return {'column': col, 'categories': [str(cat) for cat in counts.index], 'counts': counts.tolist()}
+
+def _scatter_data(job, data):
+    x, y = (data[col] for col in job['columns'])
+    xv, yv = x.to_numpy(), y.to_numpy()
+    max_points = (job['payload'] or {}).get('max_points')
+    if max_points is None:
+        keep = np.flatnonzero(np.isfinite(xv) & np.isfinite(yv))
+    else:
+        keep = stratified_sample_indices(xv, yv, max_points)
+    valid = np.isfinite(xv) & np.isfinite(yv)
+    fit = None
+    if valid.sum() > 1 and np.ptp(xv[valid]) > 0:
+        slope, intercept = np.polyfit(xv[valid], yv[valid], 1)
+        fit = {'slope': float(slope), 'intercept': float(intercept)}
+    return {'x_column': x.name, 'y_column': y.name, 'n': int(valid.sum()),
+            'x': _json_values(xv[keep]), 'y': _json_values(yv[keep]), 'fit': fit}
+
+def _box_data(job, data):
+    cat, num = (data[col] for col in job['columns'])
+    frame = pd.DataFrame({'cat': cat, 'num': num}).dropna()
+    grouped = frame.groupby('cat', sort=False)['num']
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats = pd.concat([quartiles, grouped.min().rename('min'), grouped.max().rename('max'),
+                       grouped.size().rename('count')], axis=1)
+    iqr = stats[0.75] - stats[0.25]
+    # Whiskers reach the furthest points within 1.5 IQR, as in seaborn's boxplot
+    frame = frame.join((stats[0.25] - 1.5 * iqr).rename('lo_fence'), on='cat').join(
+        (stats[0.75] + 1.5 * iqr).rename('hi_fence'), on='cat')
+    inside = frame[(frame['num'] >= frame['lo_fence']) & (frame['num'] <= frame['hi_fence'])].groupby('cat', sort=False)['num']
+    whisker_lo, whisker_hi = inside.min(), inside.max()
+    return {'category_column': cat.name, 'value_column': num.name, 'groups': [
+        {'category': str(key), 'count': int(row['count']), 'q1': float(row[0.25]), 'median': float(row[0.5]),
+         'q3': float(row[0.75]), 'whisker_low': float(whisker_lo[key]), 'whisker_high': float(whisker_hi[key]),
+         'min': float(row['min']), 'max': float(row['max'])}
+        for key, row in stats.iterrows()]}
+
+def _trend_data(job, data):
+    dates, values = (data[col] for col in job['columns'])
+    options = job['payload'] or {}
+    max_points = options.get('max_points')
+    x = dates.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+    x[dates.isna().to_numpy()] = np.nan
+    y = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    if max_points is None:
+        keep = lttb_indices(x, y, len(x))
+    elif options.get('mode') == 'lttb':
+        keep = lttb_indices(x, y, max_points)
+    else:
+        keep = minmax_bucket_indices(x, y, max_points // 2)
+    return {'date_column': dates.name, 'value_column': values.name, 'n': int(len(dates)),
+            'x': [stamp.isoformat() for stamp in dates.iloc[keep]], 'y': _json_values(y[keep])}
+
+def _render_heatmap(job, data):
+    plt.figure(figsize=(8, 6))
+    sns.heatmap(job['payload'], annot=False, cmap="coolwarm", center=0)
+    plt.title("Correlation Heatmap")
+
+def histogram_data(values, bins: int = 30, gridsize: int = 200, kde_grid: int = 1024) -> dict:
+    """
+    Histogram counts and a count-scaled Gaussian KDE curve for one numeric column, matching
+    sns.histplot(kde=True, bins=bins) without evaluating the kernel at every row.
+
+    The KDE uses Scott's bandwidth like seaborn, but is computed by linear binning onto
+    `kde_grid` points and one FFT convolution, so its cost is O(n + kde_grid log kde_grid).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    n = len(values)
+    if n == 0:
+        return {'n': 0, 'bin_edges': [], 'counts': [], 'kde_x': [], 'kde_y': []}
+    counts, edges = np.histogram(values, bins=bins)
+    result = {'n': n, 'bin_edges': edges.tolist(), 'counts': counts.tolist(), 'kde_x': [], 'kde_y': []}
+
+    lo, hi = values.min(), values.max()
+    std = values.std(ddof=1) if n > 1 else 0.0
+    if n < 2 or std == 0 or hi == lo:
+        return result
+    bandwidth = std * n ** (-1 / 5)
+    grid = np.linspace(lo, hi, kde_grid)
+    delta = grid[1] - grid[0]
+    position = (values - lo) / delta
+    left = np.clip(np.floor(position).astype(np.int64), 0, kde_grid - 2)
+    frac = position - left
+    weights = np.bincount(left, 1 - frac, kde_grid) + np.bincount(left + 1, frac, kde_grid)
+    half = min(int(np.ceil(5 * bandwidth / delta)), kde_grid - 1)
+    offsets = np.arange(-half, half + 1) * delta
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = fftconvolve(weights, kernel, mode='same') / n
+    kde_x = np.linspace(lo, hi, gridsize)
+    kde_y = np.interp(kde_x, grid, np.clip(density, 0, None)) * n * (edges[1] - edges[0])
+    result['kde_x'] = kde_x.tolist()
+    result['kde_y'] = kde_y.tolist()
+    return result
+
+def _render_dist(job, data):
+    col, = job['columns']
+    binned = _dist_data(job, data)
+    edges = np.asarray(binned['bin_edges'])
+    plt.figure(figsize=(6, 4))
+    if binned['n']:
+        # Bars are drawn from the precomputed counts, one weighted point per bin
+        bars = pd.DataFrame({col: (edges[:-1] + edges[1:]) / 2, 'count': binned['counts']})
+        sns.histplot(data=bars, x=col, weights='count', bins=binned['bin_edges'], alpha=0.5 if binned['kde_x'] else 0.75)
+        if binned['kde_x']:
+            plt.plot(binned['kde_x'], binned['kde_y'], color=sns.color_palette()[0])
+    plt.title(f"Distribution of {col}")
+    return binned
+
+def _render_count(job, data):
+    col, = job['columns']
+    plt.figure(figsize=(6, 4))
+    sns.countplot(x=data[col])
+    plt.xticks(rotation=45)
+    plt.title(f"Count of {col}")
+
+def stratified_sample_indices(x: np.ndarray, y: np.ndarray, max_points: int, grid: int = 50,
+                              random_state: int = 42) -> np.ndarray:
+    """
+    Row positions of at most `max_points` points, taking up to the same number of random points
+    from every cell of a grid x grid partition of the (x, y) range. Sparse regions and outliers
+    survive the cut while dense cells are thinned.
+    """
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if len(valid) <= max_points:
+        return valid
+    rng = np.random.default_rng(random_state)
+    valid = rng.permutation(valid)
+    cells = _grid_cell(x[valid], grid) * grid + _grid_cell(y[valid], grid)
+    counts = np.bincount(cells, minlength=grid * grid)
+    # Largest per-cell cap whose total sum(min(count, cap)) stays within the budget. The total at
+    # cap = sorted_counts[k] is nondecreasing in k: the k smaller cells are taken whole and the
+    # cap is solved directly over the remaining cells, in O(grid^2) whatever the largest cell
+    sorted_counts = np.sort(counts)
+    taken = np.r_[0, np.cumsum(sorted_counts)]
+    n_cells = len(sorted_counts)
+    totals = taken[:-1] + sorted_counts * (n_cells - np.arange(n_cells))
+    k = int(np.searchsorted(totals, max_points, side='right'))
+    cap = max((max_points - taken[k]) // (n_cells - k), 1)
+    order = np.argsort(cells, kind='stable')
+    starts = np.cumsum(counts) - counts
+    rank = np.empty(len(cells), dtype=np.int64)
+    rank[order] = np.arange(len(cells)) - np.repeat(starts, counts)
+    # With more occupied cells than the budget even one point per cell is too many; `valid` is
+    # already shuffled, so its first max_points survivors are a uniform pick among the cells
+    return np.sort(valid[rank < cap][:max_points])
+
+def _grid_cell(values: np.ndarray, grid: int) -> np.ndarray:
+    lo, hi = values.min(), values.max()
+    if hi == lo:
+        return np.zeros(len(values), dtype=np.int64)
+    return np.minimum(((values - lo) / (hi - lo) * grid).astype(np.int64), grid - 1)
+
+def _render_scatter(job, data):
+    x, y = (data[col] for col in job['columns'])
+    options = job['payload'] or {}
+    max_points = options.get('max_points')
+    plt.figure(figsize=(6, 4))
+    if max_points is None or len(x) <= max_points:
+        sns.scatterplot(x=x, y=y, alpha=0.6)
+        sns.regplot(x=x, y=y, scatter=False, color='red')
+    elif options.get('mode') == 'sample':
+        keep = stratified_sample_indices(x.to_numpy(), y.to_numpy(), max_points)
+        sns.scatterplot(x=x.iloc[keep], y=y.iloc[keep], alpha=0.6)
+        sns.regplot(x=x.iloc[keep], y=y.iloc[keep], scatter=False, color='red')
+    else:
+        valid = np.isfinite(x.to_numpy()) & np.isfinite(y.to_numpy())
+        xv, yv = x.to_numpy()[valid], y.to_numpy()[valid]
+        plt.hexbin(xv, yv, gridsize=50, mincnt=1, cmap='Blues')
+        plt.colorbar(label='Count')
+        if len(xv) > 1 and np.ptp(xv) > 0:
+            slope, intercept = np.polyfit(xv, yv, 1)
+            line_x = np.array([xv.min(), xv.max()])
+            plt.plot(line_x, slope * line_x + intercept, color='red')
+        plt.xlabel(x.name)
+        plt.ylabel(y.name)
+    plt.title(f"Relationship: {x.name} vs {y.name}")
+
+def _render_box(job, data):
+    cat, num = (data[col] for col in job['columns'])
+    plt.figure(figsize=(6, 4))
+    sns.boxplot(x=cat, y=num)
+    plt.xticks(rotation=45)
+    plt.title(f"{num.name} by {cat.name}")
+
+def minmax_bucket_indices(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Positions of the minimum and maximum y in each of `n_buckets` equal-width x ranges, ordered
+    by x. Keeps every spike visible in O(n) without sorting the full series.
+    """
+    valid = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    if len(valid) <= 2 * n_buckets:
+        return valid[np.argsort(x[valid], kind='stable')]
+    buckets = _grid_cell(x[valid], n_buckets)
+    grouped = pd.Series(y[valid]).groupby(buckets)
+    keep = valid[np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))]
+    return keep[np.argsort(x[keep], kind='stable')]
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets downsampling (Steinarsson, 2013): positions of n_out points in x order."""
+    valid = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    valid = valid[np.argsort(x[valid], kind='stable')]
+    n = len(valid)
+    if n <= n_out or n_out < 3:
+        return valid
+    xs, ys = x[valid], y[valid]
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xs[end:next_end].mean(), ys[end:next_end].mean()
+        area = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a]) - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return valid[selected]
+
+def _render_trend(job, data):
+    dates, values = (data[col] for col in job['columns'])
+    options = job['payload'] or {}
+    max_points = options.get('max_points')
+    plt.figure(figsize=(8, 4))
+    if max_points is None or len(dates) <= max_points:
+        order = np.argsort(dates.to_numpy(), kind='stable')
+        sns.lineplot(x=dates.iloc[order].reset_index(drop=True), y=values.iloc[order].reset_index(drop=True))
+    else:
+        x = dates.to_numpy(dtype='datetime64[ns]').view(np.int64).astype(np.float64)
+        x[dates.isna().to_numpy()] = np.nan
+        y = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        if options.get('mode') == 'lttb':
+            keep = lttb_indices(x, y, max_points)
+        else:
+            keep = minmax_bucket_indices(x, y, max_points // 2)
+        sns.lineplot(x=dates.iloc[keep].reset_index(drop=True), y=values.iloc[keep].reset_index(drop=True))
+    plt.title(f"Trend of {values.name} over {dates.name}")
+
+_CHART_RENDERERS = {
+    'heatmap': _render_heatmap,
+    'dist': _render_dist,
+    'count': _render_count,
+    'scatter': _render_scatter,
+    'box': _render_box,
+    'trend': _render_trend,
+}
+
+_CHART_DATA = {
+    'heatmap': _heatmap_data,
+    'dist': _dist_data,
+    'count': _count_data,
+    'scatter': _scatter_data,
+    'box': _box_data,
+    'trend': _trend_data,
+}
+
+EDA_MANIFEST = 'eda_manifest.json'
+EDA_MANIFEST_VERSION = 2
+_CORRELATION_FILE = 'correlation_matrix.npy'
+
+def generate_eda_report(df: pd.DataFrame, save_path: str = "eda_outputs/", problem_type: Optional[str] = None,
+                        n_jobs: int = 1, max_points: Optional[int] = 10000, incremental: bool = True,
+                        cache: Optional[frame_cache.FrameCache] = None):
+    """
+    Write eda_report.md with summary statistics, insights and charts into save_path.
+
+    Outliers, correlations and categorical summaries are computed once per report; pass a
+    FrameCache as `cache` to share them with the insight step of the same run.
+
+    With `incremental`, per-column fingerprints and the artifacts built from them are recorded
+    in save_path/eda_manifest.json. A later run on a changed dataset recomputes summary rows and
+    re-renders charts only for columns whose content changed, reuses the correlation matrix when
+    no numeric column changed, and reuses the insights when no column changed at all.
+    """
     os.makedirs(save_path, exist_ok=True)
     report_path = os.path.join(save_path, "eda_report.md")
-
-    summary_stats = generate_summary_statistics(df)
-    insights = extract_eda_insights(df)
-    generate_eda_visuals(df, save_path)
+    if cache is None:
+        cache = frame_cache.FrameCache()
+
+    if not incremental:
+        summary_stats = generate_summary_statistics(df, cache=cache)
+        insights = extract_eda_insights(df, cache=cache)
+        generate_eda_visuals(df, save_path, n_jobs=n_jobs, max_points=max_points, cache=cache)
+    else:
+        fingerprints = column_fingerprints(df)
+        previous = _load_eda_manifest(save_path)
+        old_fingerprints = previous.get('columns', {})
+        changed = [col for col in df.columns if old_fingerprints.get(col) != fingerprints[col]]
+        print(f"Incremental EDA: {len(changed)} of {len(df.columns)} columns changed")
+
+        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        corr_path = os.path.join(save_path, _CORRELATION_FILE)
+        if previous.get('numeric_columns') == numeric_cols and not set(changed) & set(numeric_cols) and os.path.exists(corr_path):
+            corr = pd.DataFrame(np.load(corr_path), index=numeric_cols, columns=numeric_cols)
+            cache.put('corr', tuple(numeric_cols), corr)
+
+        summary_stats = _incremental_summary_statistics(df, changed, previous.get('summary', {}))
+        if not changed and list(old_fingerprints) == list(df.columns) and 'insights' in previous:
+            insights = previous['insights']
+        else:
+            insights = extract_eda_insights(df, cache=cache)
+        artifacts = generate_eda_visuals(df, save_path, n_jobs=n_jobs, max_points=max_points,
+                                         fingerprints=fingerprints, previous=previous.get('artifacts'), cache=cache)
+
+        np.save(corr_path, correlation_matrix(df, numeric_cols, cache).to_numpy())
+        manifest = {
+            'version': EDA_MANIFEST_VERSION,
+            'columns': fingerprints,
+            'numeric_columns': numeric_cols,
+            'summary': {kind: json.loads(table.to_json(orient='index')) for kind, table in summary_stats.items()},
+            'insights': insights,
+            'artifacts': artifacts,
+        }
+        with open(os.path.join(save_path, EDA_MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
 
     with open(report_path, 'w', encoding='utf-8') as f:
         f.write("# Exploratory Data Analysis Report\n\n")
@@ -197,6 +719,37 @@ def generate_eda_report(df: pd.DataFrame, save_path: str = "eda_outputs/", probl
 
     print(f"EDA report generated at: {report_path}")
 
+def _load_eda_manifest(save_path: str) -> dict:
+    path = os.path.join(save_path, EDA_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == EDA_MANIFEST_VERSION else {}
+
+def _incremental_summary_statistics(df: pd.DataFrame, changed: List[str], previous: dict) -> dict:
+    """Summary rows are per column: recompute changed columns and take the others from the previous manifest."""
+    fresh = generate_summary_statistics(df[changed]) if changed else {}
+    summary = {}
+    for kind, dtypes in [('numerical', [np.number]), ('categorical', ['object', 'category'])]:
+        columns = df.select_dtypes(include=dtypes).columns
+        cached = previous.get(kind, {})
+        rows = []
+        for col in columns:
+            if col in changed:
+                rows.append(fresh[kind].loc[col])
+            else:
+                rows.append(pd.Series(cached[col], name=col))
+        fields = fresh[kind].columns if changed else None
+        table = pd.DataFrame(rows, columns=fields) if rows else generate_summary_statistics(df.iloc[:0])[kind]
+        if kind == 'categorical':
+            table = table.astype(object)
+        summary[kind] = table
+    return summary
+
 def check_existing_visualizations(save_path: str) -> bool:
     """Check if visualizations already exist in the given directory"""
     if not os.path.exists(save_path):
@@ -210,7 +763,10 @@ def check_existing_visualizations(save_path: str) -> bool:
     existing_files = [f for f in os.listdir(save_path) if f.endswith('.png')]
     return len(existing_files) > 0
 
-def run_full_eda(df: pd.DataFrame, save_path: str = "eda_outputs/", problem_type: Optional[str] = None):
+def run_full_eda(df: pd.DataFrame, save_path: str = "eda_outputs/", problem_type: Optional[str] = None,
+                 n_jobs: int = 1, max_points: Optional[int] = 10000, incremental: bool = True,
+                 cache: Optional[frame_cache.FrameCache] = None):
     print("Starting full EDA analysis...")
-    generate_eda_report(df, save_path, problem_type)
+    generate_eda_report(df, save_path, problem_type, n_jobs=n_jobs, max_points=max_points, incremental=incremental,
+                        cache=cache)
     print("EDA analysis completed.")
@@ -0,0 +1,201 @@
+import warnings
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import OneHotEncoder
+
+# Shared feature encoding for the insight and modeling steps. Every column type becomes a
+# block of a scipy CSR matrix, so memory scales with the non-zeros instead of rows x categories:
+# - numeric and boolean columns are passed through as floats
+# - datetime columns are expanded into standardized calendar features (NaT becomes NaN)
+# - categoricals with few categories are one-hot encoded
+# - high-cardinality categoricals are frequency encoded or hashed into a fixed number of columns
+# NativeEncoder is the counterpart for estimators with native categorical and missing-value
+# support (HistGradientBoosting): a DataFrame with pandas categorical columns and NaNs left in place.
+
+DATETIME_FEATURES = ('year', 'month', 'day', 'dayofweek', 'hour')
+# Multiplier of the 64-bit golden-ratio hash mix used to give every hashed column its own hash stream
+_HASH_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def calendar_features(df: pd.DataFrame, columns, features=DATETIME_FEATURES) -> np.ndarray:
+    """Float array with one column per (datetime column, calendar attribute); NaT becomes NaN."""
+    parts = []
+    for col in columns:
+        values = df[col].dt
+        parts += [getattr(values, part).to_numpy(dtype=np.float64, na_value=np.nan) for part in features]
+    return np.column_stack(parts) if parts else np.empty((len(df), 0))
+
+
+class SparseEncoder:
+    """
+    Fit/transform encoder from a DataFrame to a CSR matrix (see the module comment).
+
+    Parameters:
+    - max_onehot_categories: int, categoricals with more distinct values count as high-cardinality
+    - high_cardinality: str, 'frequency' (share of training rows with the value, 0 for unseen values)
+      or 'hashing' (signed hashing trick into `hash_features` shared columns)
+    - hash_features: int, number of hashed columns, a power of two
+    - datetime_features: calendar attributes extracted from datetime columns. They are standardized
+      with the training mean and standard deviation, so raw years (~2000) do not dominate
+      distance- and gradient-based models; the block is dense either way.
+
+    After fitting, get_feature_names_out() names the output columns in order and
+    `discrete_features_` flags the one-hot and hashed columns.
+    """
+
+    def __init__(self, max_onehot_categories=50, high_cardinality='frequency', hash_features=1024,
+                 datetime_features=DATETIME_FEATURES):
+        if high_cardinality not in ['frequency', 'hashing']:
+            raise ValueError(f"Unsupported high-cardinality encoding: {high_cardinality}")
+        if hash_features & (hash_features - 1):
+            raise ValueError("hash_features must be a power of two")
+        self.max_onehot_categories = max_onehot_categories
+        self.high_cardinality = high_cardinality
+        self.hash_features = hash_features
+        self.datetime_features = tuple(datetime_features)
+        self.numeric_columns_ = None
+        self.datetime_columns_ = None
+        self.onehot_columns_ = None
+        self.high_cardinality_columns_ = None
+        self.onehot_encoder_ = None
+        self.frequencies_ = None
+        self.calendar_mean_ = None
+        self.calendar_scale_ = None
+
+    def fit(self, df: pd.DataFrame):
+        self.numeric_columns_ = df.select_dtypes(include=[np.number, 'bool']).columns.tolist()
+        self.datetime_columns_ = df.select_dtypes(include=['datetime64', 'datetimetz']).columns.tolist()
+        encoded = set(self.numeric_columns_) | set(self.datetime_columns_)
+        categorical = [col for col in df.columns if col not in encoded]
+        self.onehot_columns_ = [col for col in categorical
+                                if df[col].nunique(dropna=False) <= self.max_onehot_categories]
+        self.high_cardinality_columns_ = [col for col in categorical if col not in self.onehot_columns_]
+        calendar = calendar_features(df, self.datetime_columns_, self.datetime_features)
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            # All-NaT columns have no mean; they stay NaN after scaling
+            warnings.simplefilter('ignore', RuntimeWarning)
+            self.calendar_mean_ = np.nan_to_num(np.nanmean(calendar, axis=0))
+            scale = np.nanstd(calendar, axis=0)
+        self.calendar_scale_ = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        self.onehot_encoder_ = None
+        if self.onehot_columns_:
+            self.onehot_encoder_ = OneHotEncoder(sparse_output=True, handle_unknown='ignore')
+            self.onehot_encoder_.fit(self._categories(df, self.onehot_columns_))
+        self.frequencies_ = {}
+        if self.high_cardinality == 'frequency':
+            self.frequencies_ = {col: df[col].value_counts(normalize=True, dropna=False)
+                                 for col in self.high_cardinality_columns_}
+        return self
+
+    def fit_transform(self, df: pd.DataFrame) -> sp.csr_matrix:
+        return self.fit(df).transform(df)
+
+    def transform(self, df: pd.DataFrame) -> sp.csr_matrix:
+        if self.numeric_columns_ is None:
+            raise ValueError("SparseEncoder is not fitted yet")
+        blocks = []
+        if self.numeric_columns_:
+            blocks.append(sp.csr_matrix(df[self.numeric_columns_].to_numpy(dtype=np.float64, na_value=np.nan)))
+        if self.datetime_columns_:
+            blocks.append(sp.csr_matrix(self._calendar(df)))
+        if self.onehot_columns_:
+            blocks.append(self.onehot_encoder_.transform(self._categories(df, self.onehot_columns_)))
+        if self.high_cardinality_columns_:
+            if self.high_cardinality == 'frequency':
+                shares = np.column_stack([df[col].map(self.frequencies_[col]).fillna(0.0).to_numpy(dtype=np.float64)
+                                          for col in self.high_cardinality_columns_])
+                blocks.append(sp.csr_matrix(shares))
+            else:
+                blocks.append(self._hash(df))
+        if not blocks:
+            return sp.csr_matrix((len(df), 0))
+        return sp.hstack(blocks, format='csr', dtype=np.float64)
+
+    def get_feature_names_out(self) -> list:
+        names = list(map(str, self.numeric_columns_))
+        names += [f"{col}_{part}" for col in self.datetime_columns_ for part in self.datetime_features]
+        if self.onehot_columns_:
+            names += self.onehot_encoder_.get_feature_names_out(list(map(str, self.onehot_columns_))).tolist()
+        if self.high_cardinality == 'frequency':
+            names += [f"{col}_frequency" for col in self.high_cardinality_columns_]
+        elif self.high_cardinality_columns_:
+            names += [f"hash_{i}" for i in range(self.hash_features)]
+        return names
+
+    @property
+    def discrete_features_(self) -> np.ndarray:
+        """Boolean mask of the output columns holding one-hot or hashed indicators."""
+        n_continuous = len(self.numeric_columns_) + len(self.datetime_columns_) * len(self.datetime_features)
+        n_total = len(self.get_feature_names_out())
+        if self.high_cardinality == 'frequency':
+            n_discrete = n_total - n_continuous - len(self.high_cardinality_columns_)
+            return np.r_[np.zeros(n_continuous, bool), np.ones(n_discrete, bool),
+                         np.zeros(len(self.high_cardinality_columns_), bool)]
+        return np.r_[np.zeros(n_continuous, bool), np.ones(n_total - n_continuous, bool)]
+
+    @staticmethod
+    def _categories(df, columns):
+        # One dtype for the encoder: strings, with missing values as their own category
+        return df[columns].astype(object).where(df[columns].notna(), 'nan').astype(str)
+
+    def _calendar(self, df) -> np.ndarray:
+        calendar = calendar_features(df, self.datetime_columns_, self.datetime_features)
+        return (calendar - self.calendar_mean_) / self.calendar_scale_
+
+    def _hash(self, df) -> sp.csr_matrix:
+        n = len(df)
+        bits = np.uint64(64 - int(np.log2(self.hash_features)))
+        rows, cols, signs = [], [], []
+        for i, col in enumerate(self.high_cardinality_columns_):
+            hashes = pd.util.hash_pandas_object(df[col].astype(str), index=False).to_numpy()
+            with np.errstate(over='ignore'):
+                mixed = (hashes ^ np.uint64(i + 1)) * _HASH_MIX
+            rows.append(np.arange(n))
+            cols.append((mixed >> bits).astype(np.int64))
+            signs.append(np.where(mixed & np.uint64(1), -1.0, 1.0))
+        matrix = sp.coo_matrix((np.concatenate(signs), (np.concatenate(rows), np.concatenate(cols))),
+                               shape=(n, self.hash_features))
+        return matrix.tocsr()
+
+
+class NativeEncoder:
+    """
+    Fit/transform encoder from a DataFrame to the DataFrame form used by estimators with native
+    categorical support, such as HistGradientBoosting with categorical_features='from_dtype'.
+
+    Numeric and boolean columns become floats and datetimes calendar features, with missing values
+    kept as NaN. Other columns become pandas categoricals over the `max_categories` most frequent
+    training values; rarer and unseen values are treated as missing.
+    """
+
+    def __init__(self, max_categories=255, datetime_features=DATETIME_FEATURES):
+        self.max_categories = max_categories
+        self.datetime_features = tuple(datetime_features)
+        self.numeric_columns_ = None
+        self.datetime_columns_ = None
+        self.categories_ = None
+
+    def fit(self, df: pd.DataFrame):
+        self.numeric_columns_ = df.select_dtypes(include=[np.number, 'bool']).columns.tolist()
+        self.datetime_columns_ = df.select_dtypes(include=['datetime64', 'datetimetz']).columns.tolist()
+        encoded = set(self.numeric_columns_) | set(self.datetime_columns_)
+        self.categories_ = {col: df[col].astype(str).where(df[col].notna()).value_counts().index[:self.max_categories]
+                            for col in df.columns if col not in encoded}
+        return self
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.numeric_columns_ is None:
+            raise ValueError("NativeEncoder is not fitted yet")
+        parts = {str(col): df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in self.numeric_columns_}
+        calendar = calendar_features(df, self.datetime_columns_, self.datetime_features)
+        names = [f"{col}_{part}" for col in self.datetime_columns_ for part in self.datetime_features]
+        parts.update({name: calendar[:, i] for i, name in enumerate(names)})
+        for col, categories in self.categories_.items():
+            values = df[col].astype(str).where(df[col].notna())
+            values = values.where(values.isin(categories))
+            parts[str(col)] = pd.Categorical(values, categories=categories)
+        return pd.DataFrame(parts, index=df.index)
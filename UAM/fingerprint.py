@@ -0,0 +1,50 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from UAM.parallel import resolve_n_jobs
+
+# Content fingerprints used as cache keys for derived artifacts (EDA charts, statistics, ...).
+# Every value of a column is hashed with pandas' vectorized hash_pandas_object, so two
+# columns only share a fingerprint when their name, dtype and values all match. Columns are
+# hashed in a thread pool (the numpy hashing kernels release the GIL). Nothing is memoized:
+# every call hashes the current content, so in-place edits always change the fingerprint.
+
+
+def column_fingerprint(series: pd.Series) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(series.name).encode())
+    digest.update(str(series.dtype).encode())
+    try:
+        hashes = pd.util.hash_pandas_object(series, index=False)
+    except TypeError:
+        # Unhashable cell values (lists, dicts) are hashed through their string form
+        hashes = pd.util.hash_pandas_object(series.astype(str), index=False)
+    digest.update(hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def column_fingerprints(df: pd.DataFrame, n_jobs: int = None) -> dict:
+    """Fingerprint of every column, hashed in `n_jobs` threads (default: one per CPU)."""
+    workers = resolve_n_jobs(n_jobs, len(df.columns))
+    if workers <= 1:
+        return {col: column_fingerprint(df[col]) for col in df.columns}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(df.columns, pool.map(lambda col: column_fingerprint(df[col]), df.columns)))
+
+
+def dataset_fingerprint(df: pd.DataFrame, n_jobs: int = None) -> str:
+    """
+    Full-content fingerprint of a DataFrame: the shape plus every column's fingerprint in order.
+    Use it as the cache key for anything derived from the dataset (EDA outputs, insights, models, reports).
+    """
+    fingerprints = column_fingerprints(df, n_jobs)
+    return combine(df.shape, *(f"{col}={fingerprints[col]}" for col in df.columns))
+
+
+def combine(*parts) -> str:
+    """Fingerprint of an ordered sequence of strings (e.g. column fingerprints plus options)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
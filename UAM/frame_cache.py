@@ -0,0 +1,34 @@
+# Memo for derived results (outlier counts, correlation matrices, ...) that several analysis
+# steps need from the same DataFrame within one run. A FrameCache belongs to a single frame and
+# a single run (e.g. the EDA report plus the insight extraction of one pipeline run): create it,
+# pass it explicitly to the steps as `cache=`, and drop it afterwards. Nothing is memoized across calls, so results can never
+# go stale when a frame is edited in place between runs.
+
+
+class FrameCache:
+    """Results derived from one DataFrame, keyed by (name, params)."""
+
+    def __init__(self):
+        self._values = {}
+
+    def get(self, name, params, compute):
+        key = (name, params)
+        if key not in self._values:
+            self._values[key] = compute()
+        return self._values[key]
+
+    def put(self, name, params, value):
+        self._values[(name, params)] = value
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+
+def cached(cache, name, params, compute):
+    """compute() through `cache` when one is given, otherwise computed directly."""
+    if cache is None:
+        return compute()
+    return cache.get(name, params, compute)
@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+# On-disk columnar cache for file sources read by data_loader.load_data.
+# Entries are uncompressed Arrow IPC (Feather v2) files, named after a hash of the source bytes
+# and the parse options. A hit skips parsing: the file is memory-mapped rather than read into an
+# intermediate buffer, but the returned DataFrame is still an ordinary (writable) copy of it.
+
+DEFAULT_CACHE_DIR = os.environ.get('UAM_CACHE_DIR', '.uam_cache')
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+CACHE_FORMAT_VERSION = 1
+_HASH_BLOCK_SIZE = 1024 * 1024
+_SUFFIX = '.arrow'
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+
+def cache_available() -> bool:
+    return feather is not None
+
+
+def content_hash(source) -> str:
+    """BLAKE2b digest of a file path's bytes or of a seekable file-like object (e.g. a Streamlit upload)."""
+    digest = hashlib.blake2b(digest_size=20)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+    else:
+        position = source.tell()
+        source.seek(0)
+        for block in iter(lambda: source.read(_HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def cache_key(source_type: str, source_config: dict) -> str:
+    """Key made of the source content hash plus every parse option that can change the resulting frame."""
+    options = {k: v for k, v in source_config.items() if k not in ('filepath', 'cache', 'cache_dir', 'cache_max_bytes')}
+    payload = json.dumps({
+        'version': CACHE_FORMAT_VERSION,
+        'source_type': source_type,
+        'content': content_hash(source_config['filepath']),
+        'options': options,
+    }, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+def _entry_path(key: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, key + _SUFFIX)
+
+
+def load(key: str, cache_dir: str = DEFAULT_CACHE_DIR):
+    """Return the cached DataFrame for `key`, or None. Hits refresh the entry's LRU timestamp."""
+    path = _entry_path(key, cache_dir)
+    if not cache_available() or not os.path.exists(path):
+        return None
+    table = feather.read_table(path, memory_map=True)
+    os.utime(path)
+    # Deliberately a copy: zero-copy conversion (split_blocks/self_destruct) hands out read-only
+    # arrays, so a cache hit would reject in-place edits that a fresh parse allows
+    return table.to_pandas()
+
+
+def store(key: str, df: pd.DataFrame, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+    """Write `df` as an uncompressed Arrow file, then evict least recently used entries above `max_bytes`."""
+    if not cache_available():
+        return False
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(key, cache_dir)
+    tmp_path = path + '.tmp'
+    try:
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        print(f"Skipping columnar cache for this source: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    evict(cache_dir, max_bytes)
+    return True
+
+
+def evict(cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+    """Remove least recently used entries until the cache fits in `max_bytes`. Returns removed paths."""
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(_SUFFIX):
+            stat = os.stat(os.path.join(cache_dir, name))
+            entries.append((stat.st_mtime, stat.st_size, os.path.join(cache_dir, name)))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        os.remove(path)
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def invalidate(source_type: str = None, source_config: dict = None, cache_dir: str = DEFAULT_CACHE_DIR) -> int:
+    """
+    Drop the cache entry for one source, or every entry when no source is given.
+    Returns the number of entries removed.
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+    if source_config is None:
+        paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(_SUFFIX)]
+    else:
+        paths = [_entry_path(cache_key(source_type, source_config), cache_dir)]
+    removed = 0
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+            removed += 1
+    return removed
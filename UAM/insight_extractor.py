@@ -1,8 +1,14 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 from sklearn.feature_selection import mutual_info_classif, mutual_info_regression
 from typing import Optional
+from UAM.streaming import MomentAccumulator, ReservoirSample, is_chunk_stream, is_reiterable
+from UAM.outliers import count_outliers, count_outliers_in, outlier_bounds
+from UAM.encoding import SparseEncoder
+from UAM.parallel import resolve_n_jobs
+from UAM import frame_cache
 
 def identify_target_column(df: pd.DataFrame) -> Optional[str]:
     """
@@ -39,10 +45,33 @@ def determine_problem_type(df: pd.DataFrame, target_col: Optional[str]) -> str:
     else:
         return 'classification'
 
-def extract_key_insights(df: pd.DataFrame, target_col: Optional[str], problem_type: str) -> dict:
+# Above this many rows, mi_method='auto' ranks features with binned mutual information on a sample
+BINNED_MI_MIN_ROWS = 100000
+
+def extract_key_insights(df: pd.DataFrame, target_col: Optional[str], problem_type: str,
+                         mi_method: str = 'auto', sample_size: int = 100000, n_bins: int = 32,
+                         n_jobs: int = 1, cache: Optional[frame_cache.FrameCache] = None) -> dict:
     """
     Extract key insights including influential features, summary stats, and anomalies.
+    `df` may also be a chunk stream, see _key_insights_from_chunks. `cache` is an optional
+    FrameCache for df shared with the EDA steps of the same run (e.g. the outlier counts).
+
+    Feature influence is ranked by mutual information with the target:
+    - mi_method='knn' runs sklearn's estimators on all rows of the sparse encoding of X
+      (keys are the encoded column names, see knn_mutual_info).
+    - mi_method='binned' scores each original column on a target-stratified sample of `sample_size`
+      rows from a contingency table of `n_bins` quantile bins (or most frequent categories),
+      scoring features in `n_jobs` threads (see binned_mutual_info).
+    - mi_method='auto' uses 'binned' above BINNED_MI_MIN_ROWS rows and 'knn' otherwise.
     """
+    if is_chunk_stream(df):
+        return _key_insights_from_chunks(df, target_col, problem_type, mi_method=mi_method,
+                                         n_bins=n_bins, n_jobs=n_jobs)
+    if mi_method == 'auto':
+        mi_method = 'binned' if len(df) > BINNED_MI_MIN_ROWS else 'knn'
+    if mi_method not in ['knn', 'binned']:
+        raise ValueError(f"Unsupported mi_method: {mi_method}")
+
     insights = {}
 
     # Dataset summary
@@ -66,15 +95,11 @@ def extract_key_insights(df: pd.DataFrame, target_col: Optional[str], problem_ty
         X = X.drop(columns=[col for col in datetime_cols if col in X.columns], errors='ignore')
         y = df[target_col]
 
-        # Encode categorical features for mutual info
-        X_enc = pd.get_dummies(X, drop_first=True)
-
-        if problem_type == 'classification':
-            mi = mutual_info_classif(X_enc, y, discrete_features='auto', random_state=42)
+        if mi_method == 'binned':
+            mi_series = binned_mutual_info(X, y, problem_type == 'classification', sample_size=sample_size,
+                                           n_bins=n_bins, n_jobs=n_jobs)
         else:
-            mi = mutual_info_regression(X_enc, y, random_state=42)
-
-        mi_series = pd.Series(mi, index=X_enc.columns)
+            mi_series = knn_mutual_info(X, y, problem_type == 'classification')
         top_features = mi_series.sort_values(ascending=False).head(10)
         insights['top_influential_features'] = top_features.to_dict()
     else:
@@ -84,7 +109,8 @@ def extract_key_insights(df: pd.DataFrame, target_col: Optional[str], problem_ty
     top_feats = list(insights['top_influential_features'].keys())
     summary_stats = {}
     for feat in top_feats:
-        if feat in df.columns and feat not in df.select_dtypes(include=['datetime64']).columns:
+        # Binned rankings name original categorical columns, which have no mean/median
+        if feat in df.columns and pd.api.types.is_numeric_dtype(df[feat]):
             summary_stats[feat] = {
                 'mean': df[feat].mean(),
                 'median': df[feat].median(),
@@ -93,18 +119,103 @@ def extract_key_insights(df: pd.DataFrame, target_col: Optional[str], problem_ty
     insights['summary_statistics_top_features'] = summary_stats
 
     # Distribution patterns and anomalies (simple outlier detection)
-    anomalies = {}
-    for col in numeric_cols:
-        if col not in df.select_dtypes(include=['datetime64']).columns:
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = df[(df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))]
-            anomalies[col] = len(outliers)
-    insights['outliers_count'] = anomalies
+    insights['outliers_count'] = {col: int(count) for col, count in count_outliers(df, numeric_cols, cache=cache).items()}
 
     return insights
 
+def knn_mutual_info(X: pd.DataFrame, y: pd.Series, discrete_target: bool) -> pd.Series:
+    """
+    sklearn mutual information per encoded column of X (see encoding.SparseEncoder). Continuous
+    columns use the k-NN estimator on their dense block; one-hot indicator columns stay sparse
+    and are scored as discrete features, so no dense dummy matrix is built.
+    """
+    encoder = SparseEncoder()
+    X_enc = encoder.fit_transform(X)
+    discrete = encoder.discrete_features_
+    estimate = mutual_info_classif if discrete_target else mutual_info_regression
+    mi = np.zeros(X_enc.shape[1])
+    if (~discrete).any():
+        mi[~discrete] = estimate(X_enc[:, ~discrete].toarray(), y, discrete_features=False, random_state=42)
+    if discrete.any():
+        mi[discrete] = estimate(X_enc[:, discrete], y, discrete_features=True, random_state=42)
+    return pd.Series(mi, index=encoder.get_feature_names_out())
+
+def binned_mutual_info(X: pd.DataFrame, y: pd.Series, discrete_target: bool, sample_size: Optional[int] = 100000,
+                       n_bins: int = 32, n_jobs: int = 1, random_state: int = 42) -> pd.Series:
+    """
+    Mutual information (nats) between each column of X and y from histogram contingency tables.
+
+    Rows are first reduced to a sample of `sample_size` drawn proportionally from every class
+    (or target quantile bin for a continuous target), so rare classes stay represented. Numeric
+    columns are cut into `n_bins` quantile bins and categorical columns keep their `n_bins - 1`
+    most frequent categories plus one shared bin for the rest; missing values get their own bin.
+    The plug-in estimate is bias-corrected by (kx - 1)(ky - 1) / 2n (Miller-Madow) and clipped at 0.
+    """
+    y_codes = _discretize(y, n_bins) if not discrete_target else pd.factorize(y, use_na_sentinel=False)[0]
+    if sample_size is not None and len(y_codes) > sample_size:
+        rows = _stratified_rows(y_codes, sample_size, random_state)
+        X, y_codes = X.iloc[rows], y_codes[rows]
+    y_codes = pd.factorize(y_codes)[0]
+    n_classes = int(y_codes.max()) + 1 if len(y_codes) else 0
+
+    def score(col):
+        if not len(y_codes):
+            return 0.0
+        x_codes = _discretize(X[col], n_bins)
+        n_x = int(x_codes.max()) + 1
+        joint = np.bincount(x_codes * n_classes + y_codes, minlength=n_x * n_classes).reshape(n_x, n_classes)
+        return _contingency_mutual_info(joint)
+
+    workers = resolve_n_jobs(n_jobs, len(X.columns))
+    if workers <= 1:
+        scores = [score(col) for col in X.columns]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scores = list(pool.map(score, X.columns))
+    return pd.Series(scores, index=X.columns, dtype=np.float64)
+
+def _discretize(values: pd.Series, n_bins: int) -> np.ndarray:
+    """Dense integer bin codes: quantile bins for numeric data, top categories otherwise; NaN gets the last code."""
+    if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+        codes, uniques = pd.factorize(values)
+        if len(uniques) >= n_bins:
+            # Keep the most frequent categories and lump the tail together
+            frequency = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            remap = np.full(len(uniques), n_bins - 1)
+            remap[np.argsort(-frequency, kind='stable')[:n_bins - 1]] = np.arange(n_bins - 1)
+            codes = np.where(codes >= 0, remap[np.maximum(codes, 0)], -1)
+    else:
+        array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(array)
+        codes = np.full(len(array), -1)
+        if present.any():
+            edges = np.unique(np.quantile(array[present], np.linspace(0, 1, n_bins + 1)[1:-1]))
+            codes[present] = np.searchsorted(edges, array[present], side='right')
+    codes = np.where(codes < 0, codes.max(initial=0) + 1, codes)
+    return pd.factorize(codes)[0]
+
+def _stratified_rows(strata: np.ndarray, size: int, random_state: int = 42) -> np.ndarray:
+    """Sorted row positions of a sample of about `size` rows, allocated to strata in proportion (at least one each)."""
+    rng = np.random.default_rng(random_state)
+    counts = np.bincount(strata)
+    quotas = np.minimum(np.maximum(np.round(counts * size / len(strata)), counts > 0), counts).astype(np.int64)
+    # Shuffle within strata by sorting on (stratum, random key), then keep the first quota rows of each
+    order = np.lexsort((rng.random(len(strata)), strata))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(len(strata)) - np.repeat(starts, counts)
+    return np.sort(order[rank < np.repeat(quotas, counts)])
+
+def _contingency_mutual_info(joint: np.ndarray) -> float:
+    n = joint.sum()
+    if n == 0:
+        return 0.0
+    px = joint.sum(axis=1, keepdims=True)
+    py = joint.sum(axis=0, keepdims=True)
+    nz = joint > 0
+    mi = np.sum(joint[nz] / n * np.log(joint[nz] * n / (px @ py)[nz]))
+    bias = (np.count_nonzero(px) - 1) * (np.count_nonzero(py) - 1) / (2 * n)
+    return float(max(mi - bias, 0.0))
+
 def generate_insight_report(insights: dict, output_path: str = "reports/insight_report.md"):
     """
     Generate a human-readable Markdown insight report.
@@ -153,8 +264,53 @@ def generate_insight_report(insights: dict, output_path: str = "reports/insight_
 
     print(f"Insight report generated at: {output_path}")
 
-def run_insight_extraction(df: pd.DataFrame, output_path: str = "reports/insight_report.md"):
+def run_insight_extraction(df: pd.DataFrame, output_path: str = "reports/insight_report.md",
+                           cache: Optional[frame_cache.FrameCache] = None):
     target_col = identify_target_column(df)
     problem_type = determine_problem_type(df, target_col)
-    insights = extract_key_insights(df, target_col, problem_type)
+    insights = extract_key_insights(df, target_col, problem_type, cache=cache)
     generate_insight_report(insights, output_path)
+
+def _key_insights_from_chunks(chunks, target_col: Optional[str], problem_type: str, sample_size: int = 10000,
+                              **mi_options) -> dict:
+    """
+    Streaming counterpart of extract_key_insights. Row counts, means and standard deviations
+    are merged exactly over one pass; mutual information, medians and IQR fences are computed
+    on a uniform reservoir sample. Outliers against those fences are counted exactly in a second
+    pass when the stream is re-iterable, otherwise extrapolated from the sample.
+    """
+    columns = None
+    n_rows = 0
+    sample = ReservoirSample(sample_size)
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+            numeric_cols = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            moments = MomentAccumulator(numeric_cols)
+        n_rows += len(chunk)
+        moments.update(chunk)
+        sample.update(chunk)
+    if columns is None:
+        raise ValueError("Chunk stream is empty")
+
+    sample_df = sample.to_frame()
+    insights = extract_key_insights(sample_df, target_col, problem_type, **mi_options)
+    insights['dataset_summary']['num_rows'] = n_rows
+
+    stats = moments.to_frame()
+    for feat, feat_stats in insights['summary_statistics_top_features'].items():
+        if feat in stats.index:
+            feat_stats['mean'] = stats.loc[feat, 'mean']
+            feat_stats['std'] = stats.loc[feat, 'std']
+
+    lower, upper = outlier_bounds(sample_df[numeric_cols])
+    if is_reiterable(chunks):
+        counts = pd.Series(0, index=numeric_cols, dtype='int64')
+        for chunk in chunks:
+            counts += count_outliers_in(chunk[numeric_cols], lower, upper)
+    else:
+        rate = count_outliers_in(sample_df[numeric_cols], lower, upper) / max(len(sample_df), 1)
+        counts = (rate * n_rows).round().astype('int64')
+    insights['outliers_count'] = {col: int(counts[col]) for col in numeric_cols}
+
+    return insights
@@ -1,17 +1,27 @@
 import os
+import time
 import pandas as pd
 import numpy as np
 import joblib
 from typing import Optional
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, LabelEncoder
+from sklearn.preprocessing import LabelEncoder
 from sklearn.linear_model import LogisticRegression, LinearRegression
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.ensemble import (RandomForestClassifier, RandomForestRegressor, BaseEnsemble,
+                              HistGradientBoostingClassifier, HistGradientBoostingRegressor)
 from sklearn.svm import SVC, SVR
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.compose import TransformedTargetRegressor
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix, mean_squared_error, mean_absolute_error, r2_score
 import matplotlib.pyplot as plt
 import seaborn as sns
 from UAM import insight_extractor
+import scipy.sparse as sp
+from UAM.encoding import SparseEncoder, NativeEncoder
+from UAM.parallel import resolve_n_jobs
 
 def detect_target_column(df: pd.DataFrame, provided_target: Optional[str] = None) -> Optional[str]:
     if provided_target and provided_target in df.columns:
@@ -22,51 +32,195 @@ def detect_target_column(df: pd.DataFrame, provided_target: Optional[str] = None
 def determine_problem_type(df: pd.DataFrame, target_col: str) -> str:
     return insight_extractor.determine_problem_type(df, target_col)
 
-def preprocess_for_modeling(df: pd.DataFrame, target_col: str):
+# File names of the fitted feature encoders saved next to the models
+ENCODER_FILENAME = 'feature_encoder.pkl'
+NATIVE_ENCODER_FILENAME = 'native_feature_encoder.pkl'
+# Estimators fitted on the NativeEncoder frame (categorical dtypes, NaNs) instead of the sparse matrix
+NATIVE_INPUT_MODELS = (HistGradientBoostingClassifier, HistGradientBoostingRegressor)
+
+def preprocess_for_modeling(df: pd.DataFrame, target_col: str, return_encoder: bool = False, **encoder_options):
+    """
+    Encode the features into a scipy CSR matrix with SparseEncoder: numeric columns as-is, datetimes
+    as calendar features, low-cardinality categoricals one-hot and high-cardinality ones frequency
+    encoded (or hashed, see SparseEncoder for `encoder_options`). With `return_encoder`, the fitted
+    encoder (which names the output columns) is returned as a third value.
+    """
     X = df.drop(columns=[target_col])
     y = df[target_col]
 
-    # Handle datetime columns
-    datetime_cols = X.select_dtypes(include=['datetime64']).columns.tolist()
-    if datetime_cols:
-        X = pd.get_dummies(X, columns=datetime_cols)
-        
-    # Encode categorical features
-    cat_cols = X.select_dtypes(include=['object', 'category']).columns.tolist()
-    if cat_cols:
-        ohe = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
-        X_cat = ohe.fit_transform(X[cat_cols])
-        X_cat_df = pd.DataFrame(X_cat, columns=ohe.get_feature_names_out(cat_cols), index=X.index)
-        X = X.drop(columns=cat_cols)
-        X = pd.concat([X, X_cat_df], axis=1)
+    encoder = SparseEncoder(**encoder_options)
+    X = encoder.fit_transform(X)
 
     # Encode target if classification and categorical
-    if y.dtype == 'object' or str(y.dtype).startswith('category'):
+    if not pd.api.types.is_numeric_dtype(y):
         le = LabelEncoder()
         y = le.fit_transform(y)
+    if return_encoder:
+        return X, y, encoder
     return X, y
 
-def train_models(X_train, y_train, problem_type: str):
+# Above this many training rows the kernel SVMs (quadratic to cubic in n) are replaced by scalable substitutes
+SVM_MAX_ROWS = 20000
+
+def candidate_models(problem_type: str, n_rows: Optional[int] = None, svm_max_rows: Optional[int] = SVM_MAX_ROWS,
+                     svm_substitute: str = 'nystroem') -> dict:
+    """
+    Unfitted candidate estimators by report name.
+
+    When `n_rows` exceeds `svm_max_rows` (None never substitutes), 'SVC'/'SVR' are built by
+    scalable_svm with `svm_substitute` instead of the exact kernel SVMs.
+
+    The scale-sensitive candidates (LogisticRegression, the SVMs) standardize their input first:
+    encoded features mix ranges such as calendar years (~2000) and one-hot indicators (0/1).
+    with_mean=False keeps sparse input sparse.
+    """
+    substitute = n_rows is not None and svm_max_rows is not None and n_rows > svm_max_rows
     models = {}
     if problem_type == 'classification':
-        models['LogisticRegression'] = LogisticRegression(max_iter=1000)
+        models['LogisticRegression'] = make_pipeline(StandardScaler(with_mean=False), LogisticRegression(max_iter=1000))
         models['RandomForestClassifier'] = RandomForestClassifier()
-        models['SVC'] = SVC(probability=True)
+        models['SVC'] = scalable_svm(problem_type, svm_substitute) if substitute else make_pipeline(StandardScaler(with_mean=False), SVC(probability=True))
+        models['HistGradientBoostingClassifier'] = HistGradientBoostingClassifier(**_HIST_GRADIENT_BOOSTING_PARAMS)
     else:
         models['LinearRegression'] = LinearRegression()
         models['RandomForestRegressor'] = RandomForestRegressor()
-        models['SVR'] = SVR()
+        models['SVR'] = scalable_svm(problem_type, svm_substitute) if substitute else make_pipeline(StandardScaler(with_mean=False), SVR())
+        models['HistGradientBoostingRegressor'] = HistGradientBoostingRegressor(**_HIST_GRADIENT_BOOSTING_PARAMS)
+    return models
+
+# Native categorical splits on pandas category columns, and early stopping once the score on a
+# held-out 10% of the training rows has not improved for 10 iterations
+_HIST_GRADIENT_BOOSTING_PARAMS = dict(categorical_features='from_dtype', max_iter=500, early_stopping=True,
+                                      validation_fraction=0.1, n_iter_no_change=10, random_state=42)
+
+def scalable_svm(problem_type: str, method: str = 'nystroem', n_components: int = 300):
+    """
+    SVM substitute that trains in time linear in the number of rows.
+
+    'nystroem' maps standardized features through an `n_components` Nystroem approximation of the
+    RBF kernel (SVC/SVR's default kernel) and fits a linear SVM on them with SGD; 'linear' fits
+    the linear SVM on the standardized features directly. Classification uses the modified Huber
+    loss, a smoothed hinge loss that also provides predict_proba like SVC(probability=True);
+    regression uses SVR's epsilon-insensitive loss on a standardized target.
+    """
+    if method not in ['nystroem', 'linear']:
+        raise ValueError(f"Unsupported SVM substitute: {method}")
+    # with_mean=False keeps sparse input sparse
+    steps = [StandardScaler(with_mean=False)]
+    if method == 'nystroem':
+        steps.append(Nystroem(kernel='rbf', n_components=n_components, random_state=42))
+    if problem_type == 'classification':
+        return make_pipeline(*steps, SGDClassifier(loss='modified_huber', alpha=1e-4, random_state=42))
+    regressor = make_pipeline(*steps, SGDRegressor(loss='epsilon_insensitive', epsilon=0.1, alpha=1e-4, random_state=42))
+    return TransformedTargetRegressor(regressor=regressor, transformer=StandardScaler())
+
+def train_models(X_train, y_train, problem_type: str, n_jobs: Optional[int] = 1, timeout: Optional[float] = None,
+                 svm_max_rows: Optional[int] = SVM_MAX_ROWS, svm_substitute: str = 'nystroem', native_train=None):
+    """
+    Fit every candidate model.
 
+    - native_train: DataFrame, the NativeEncoder form of the same rows as X_train. HistGradientBoosting
+      is fitted on it so categoricals and missing values are handled natively; without it, it is
+      fitted on a dense copy of X_train.
+    - svm_max_rows, svm_substitute: above `svm_max_rows` training rows the SVC/SVR candidate is
+      replaced by a scalable substitute under the same name (see candidate_models).
+    - n_jobs: int, total CPU core budget (None or -1 for all cores). With more than one core the
+      candidates are fitted concurrently in worker processes, and the cores left per worker are
+      passed to the ensemble estimators (e.g. the random forests) as their `n_jobs` and used as
+      the thread limit of the others (e.g. HistGradientBoosting's OpenMP threads).
+    - timeout: float, wall-clock seconds allowed per model. A model that is still fitting after
+      `timeout` seconds is stopped and left out of the result, so callers must not assume every
+      candidate is returned.
+    """
+    n_rows = X_train.shape[0]
+    models = candidate_models(problem_type, n_rows, svm_max_rows, svm_substitute)
+    if svm_max_rows is not None and n_rows > svm_max_rows:
+        print(f"{n_rows} training rows exceed {svm_max_rows}: using the '{svm_substitute}' SVM substitute")
+    budget = resolve_n_jobs(n_jobs)
+    if budget == 1 and timeout is None:
+        trained_models = {}
+        for name, model in models.items():
+            model.fit(_model_input(model, X_train, native_train), y_train)
+            trained_models[name] = model
+        return trained_models
+
+    workers = min(budget, len(models))
+    inner_jobs = max(budget // workers, 1)
+    for model in models.values():
+        # Forests build their trees in parallel; LogisticRegression's n_jobs no longer has an effect
+        if isinstance(model, BaseEnsemble) and 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=inner_jobs)
+    inputs = {name: _model_input(model, X_train, native_train) for name, model in models.items()}
+    return _train_in_processes(models, inputs, y_train, workers, timeout, inner_jobs)
+
+def _model_input(model, X, native):
+    if not isinstance(model, NATIVE_INPUT_MODELS):
+        return X
+    if native is not None:
+        return native
+    return X.toarray() if sp.issparse(X) else X
+
+def _fit_in_process(conn, model, X_train, y_train, threads):
+    from threadpoolctl import threadpool_limits
+    try:
+        with threadpool_limits(limits=threads):
+            model.fit(X_train, y_train)
+        conn.send(('ok', model))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+def _train_in_processes(models: dict, inputs: dict, y_train, workers: int, timeout: Optional[float], threads: int) -> dict:
+    """Fit models in at most `workers` processes at a time, terminating any that run past `timeout` seconds."""
+    import multiprocessing
+    from multiprocessing.connection import wait
+
+    pending = list(models.items())
+    running = {}  # result pipe -> (name, process, start time)
     trained_models = {}
-    for name, model in models.items():
-        model.fit(X_train, y_train)
-        trained_models[name] = model
-    return trained_models
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                name, model = pending.pop(0)
+                receiver, sender = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=_fit_in_process, args=(sender, model, inputs[name], y_train, threads), daemon=True)
+                process.start()
+                sender.close()
+                running[receiver] = (name, process, time.monotonic())
+
+            now = time.monotonic()
+            remaining = None if timeout is None else max(min(start + timeout for _, _, start in running.values()) - now, 0)
+            for receiver in wait(list(running), timeout=remaining):
+                name, process, _ = running.pop(receiver)
+                try:
+                    status, result = receiver.recv()
+                except EOFError:
+                    status, result = 'error', f"worker exited with code {process.exitcode}"
+                process.join()
+                if status == 'error':
+                    raise RuntimeError(f"Training {name} failed: {result}")
+                trained_models[name] = result
+
+            if timeout is not None:
+                now = time.monotonic()
+                for receiver, (name, process, start) in list(running.items()):
+                    if now - start >= timeout:
+                        process.terminate()
+                        process.join()
+                        del running[receiver]
+                        print(f"Training {name} exceeded the {timeout}s timeout; skipping it.")
+    finally:
+        for _, process, _ in running.values():
+            process.terminate()
+            process.join()
+    # Keep the candidate order of the report
+    return {name: trained_models[name] for name in models if name in trained_models}
 
-def evaluate_models(models: dict, X_test, y_test, problem_type: str):
+def evaluate_models(models: dict, X_test, y_test, problem_type: str, native_test=None):
     results = {}
     for name, model in models.items():
-        y_pred = model.predict(X_test)
+        y_pred = model.predict(_model_input(model, X_test, native_test))
         if problem_type == 'classification':
             acc = accuracy_score(y_test, y_pred)
             prec = precision_score(y_test, y_pred, average='weighted', zero_division=0)
@@ -132,7 +286,10 @@ def plot_feature_importance(model, feature_names, save_path=None):
             plt.savefig(save_path)
         plt.close()
 
-def run_modeling(df: pd.DataFrame, provided_target: Optional[str] = None, output_dir: str = "reports", model_dir: str = "models"):
+def run_modeling(df: pd.DataFrame, provided_target: Optional[str] = None, output_dir: str = "reports", model_dir: str = "models",
+                 n_jobs: Optional[int] = 1, timeout: Optional[float] = None, svm_max_rows: Optional[int] = SVM_MAX_ROWS,
+                 svm_substitute: str = 'nystroem'):
+    """Train and evaluate the candidate models and write model_report.md; the training options are those of train_models."""
     target_col = detect_target_column(df, provided_target)
     if not target_col:
         print("No target column detected. Skipping modeling step.")
@@ -141,18 +298,27 @@ def run_modeling(df: pd.DataFrame, provided_target: Optional[str] = None, output
     problem_type = determine_problem_type(df, target_col)
     print(f"Detected problem type: {problem_type} with target column: {target_col}")
 
-    X, y = preprocess_for_modeling(df, target_col)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X, y, encoder = preprocess_for_modeling(df, target_col, return_encoder=True)
+    feature_names = encoder.get_feature_names_out()
+    native_encoder = NativeEncoder()
+    native = native_encoder.fit_transform(df.drop(columns=[target_col]))
+    X_train, X_test, native_train, native_test, y_train, y_test = train_test_split(X, native, y, test_size=0.2, random_state=42)
 
-    models = train_models(X_train, y_train, problem_type)
-    results = evaluate_models(models, X_test, y_test, problem_type)
+    models = train_models(X_train, y_train, problem_type, n_jobs=n_jobs, timeout=timeout,
+                          svm_max_rows=svm_max_rows, svm_substitute=svm_substitute, native_train=native_train)
+    results = evaluate_models(models, X_test, y_test, problem_type, native_test=native_test)
     save_models(models, model_dir)
+    joblib.dump(encoder, os.path.join(model_dir, ENCODER_FILENAME))
+    joblib.dump(native_encoder, os.path.join(model_dir, NATIVE_ENCODER_FILENAME))
 
     os.makedirs(output_dir, exist_ok=True)
     report_path = os.path.join(output_dir, "model_report.md")
     with open(report_path, 'w') as f:
         f.write("# Model Evaluation Report\n\n")
         f.write(f"Problem type: {problem_type}\n\n")
+        for name in candidate_models(problem_type):
+            if name not in models:
+                f.write(f"## {name}\n- Skipped: training did not finish within {timeout}s\n\n")
         for name, metrics in results.items():
             f.write(f"## {name}\n")
             for metric, value in metrics.items():
@@ -165,13 +331,13 @@ def run_modeling(df: pd.DataFrame, provided_target: Optional[str] = None, output
             # Feature importance plot for tree-based models
             if problem_type in ['classification', 'regression'] and hasattr(models[name], 'feature_importances_'):
                 fi_path = os.path.join(output_dir, f"{name}_feature_importance.png")
-                plot_feature_importance(models[name], X.columns, save_path=fi_path)
+                plot_feature_importance(models[name], feature_names, save_path=fi_path)
             f.write(f"![Feature Importance]({name}_feature_importance.png)\n\n")
         # Actual vs Predicted plot for regression
-        if problem_type == 'regression':
+        if problem_type == 'regression' and 'LinearRegression' in models:
             y_pred = models['LinearRegression'].predict(X_test)
             avp_path = os.path.join(output_dir, "actual_vs_predicted.png")
             plot_actual_vs_predicted(y_test, y_pred, save_path=avp_path)
-            f.write(f"![Actual vs Predicted]({"actual_vs_predicted.png"})\n\n")
+            f.write("![Actual vs Predicted](actual_vs_predicted.png)\n\n")
 
     print(f"Modeling and evaluation report saved to {report_path}")
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from UAM import frame_cache
+
+# Outlier detection shared by eda_engine and insight_extractor.
+# Fences for every numeric column come from one quantile call over the numeric block and
+# outliers are counted with array masks, so no filtered copy of the data is built.
+
+DEFAULT_THRESHOLDS = {'iqr': 1.5, 'mad': 3.5}
+# Scales the median absolute deviation to the standard deviation of normal data
+MAD_SCALE = 1.4826
+
+
+def outlier_bounds(df: pd.DataFrame, method: str = 'iqr', threshold: float = None):
+    """
+    Lower and upper fences per column of a numeric frame.
+
+    'iqr' uses Q1 - t*IQR and Q3 + t*IQR (t=1.5 by default); 'mad' uses
+    median -/+ t * 1.4826 * MAD (t=3.5, the usual modified z-score cut-off).
+    """
+    if method not in DEFAULT_THRESHOLDS:
+        raise ValueError(f"Unsupported outlier method: {method}")
+    threshold = DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+    if method == 'iqr':
+        quartiles = df.quantile([0.25, 0.75])
+        q1, q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+        iqr = q3 - q1
+        return q1 - threshold * iqr, q3 + threshold * iqr
+    median = df.median()
+    mad = (df - median).abs().median() * MAD_SCALE
+    return median - threshold * mad, median + threshold * mad
+
+
+def count_outliers_in(block: pd.DataFrame, lower: pd.Series, upper: pd.Series) -> pd.Series:
+    """Count values outside [lower, upper] per column; missing values never count."""
+    values = block.to_numpy(dtype=np.float64, na_value=np.nan)
+    lo = lower[block.columns].to_numpy(dtype=np.float64)
+    hi = upper[block.columns].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        counts = ((values < lo) | (values > hi)).sum(axis=0)
+    return pd.Series(counts, index=block.columns, dtype='int64')
+
+
+def count_outliers(df: pd.DataFrame, columns=None, method: str = 'iqr', threshold: float = None,
+                   cache: frame_cache.FrameCache = None) -> pd.Series:
+    """
+    Outlier count per numeric column of df (all numeric columns by default).
+
+    With a `cache` for this frame, steps of the same run share one computation (see frame_cache).
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    columns = list(columns)
+
+    def compute():
+        block = df[columns]
+        lower, upper = outlier_bounds(block, method, threshold)
+        return count_outliers_in(block, lower, upper)
+
+    return frame_cache.cached(cache, 'outliers', (method, threshold, tuple(columns)), compute).copy()
@@ -0,0 +1,13 @@
+import os
+from typing import Optional
+
+# One reading of the n_jobs arguments of the analysis steps (thread and process pools alike):
+# None or -1 means one worker per CPU, any other value is a worker count of at least 1.
+
+
+def resolve_n_jobs(n_jobs: Optional[int], n_tasks: Optional[int] = None) -> int:
+    """Number of workers for `n_jobs`, capped at `n_tasks` when given (never below 1)."""
+    workers = (os.cpu_count() or 1) if n_jobs in (None, -1) else max(int(n_jobs), 1)
+    if n_tasks is not None:
+        workers = min(workers, max(n_tasks, 1))
+    return workers
@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+# Fixed-size, mergeable sketches for statistics that have no exact streaming form:
+# quantiles (t-digest), distinct counts (HyperLogLog) and heavy hitters (Space-Saving).
+# All update from whole arrays at a time and merge by combining their state, so partial sketches built
+# on different chunks or workers can be combined in any order.
+
+
+class TDigest:
+    """
+    Merging t-digest for quantiles (Dunning & Ertl).
+
+    Values are buffered and compressed in bulk: all centroids are sorted by mean and grouped
+    into bins of the k1 scale function, so centroids stay small near the tails and the digest
+    holds roughly `compression / 2` centroids regardless of the number of values seen.
+    """
+
+    def __init__(self, compression=200, buffer_size=None):
+        self.compression = compression
+        self.buffer_size = buffer_size or 25 * compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+        self._buffer = []
+        self._buffered = 0
+
+    @property
+    def count(self):
+        return float(self.weights.sum()) + sum(float(w.sum()) for _, w in self._buffer)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self._add(values, np.ones(len(values)))
+        return self
+
+    def merge(self, other: "TDigest"):
+        other._compress()
+        if len(other.means):
+            self._add(other.means, other.weights)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Interpolated quantile(s) for q in [0, 1]; NaN when no values were seen."""
+        self._compress()
+        q = np.asarray(q, dtype=np.float64)
+        if not len(self.means):
+            return np.full(q.shape, np.nan) if q.ndim else np.nan
+        total = self.weights.sum()
+        # Each centroid sits at the middle of its cumulative weight; the exact min and max anchor the ends
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q * total, positions, values)
+
+    def _add(self, means, weights):
+        self.min = min(self.min, means.min())
+        self.max = max(self.max, means.max())
+        self._buffer.append((means, weights))
+        self._buffered += len(means)
+        if self._buffered >= self.buffer_size:
+            self._compress()
+
+    def _compress(self):
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means] + [m for m, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        self._buffer = []
+        self._buffered = 0
+        order = np.argsort(means, kind='mergesort')
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        q_left = (cum - weights) / cum[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        bins = np.floor(k)
+        starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+
+def _bit_length(values):
+    """Vectorized int.bit_length() for uint64 arrays (split in 32-bit halves so floats stay exact)."""
+    hi = (values >> np.uint64(32)).astype(np.float64)
+    lo = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter over pandas' 64-bit value hashes (Flajolet et al., with
+    linear counting for small cardinalities). Relative error is about 1.04 / sqrt(2 ** precision),
+    0.8% for the default, using 2 ** precision one-byte registers.
+    """
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        values = pd.Series(values).dropna()
+        if values.empty:
+            return self
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        rank = (64 - p) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+        return self
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class SpaceSaving:
+    """
+    Mergeable Space-Saving heavy-hitters summary (Metwally et al., merged as in Cafaro et al.).
+
+    Keeps at most `capacity` monitored values with count upper bounds and their maximum
+    overestimation. `floor` bounds the count of any value that is not monitored, so the
+    count of every value is overestimated by at most total / capacity. Values are added in
+    blocks: each block is counted exactly with value_counts and merged into the summary.
+    With capacity=None nothing is evicted and each update is counted in a single block, exactly.
+    """
+
+    def __init__(self, capacity=1000, block_size=100000):
+        self.capacity = capacity
+        self.block_size = block_size
+        self.counts = pd.Series(dtype='int64')
+        self.errors = pd.Series(dtype='int64')
+        self.floor = 0
+        self.total = 0
+
+    def update(self, values):
+        values = pd.Series(values)
+        block_size = self.block_size if self.capacity is not None else max(len(values), 1)
+        for start in range(0, len(values), block_size):
+            block = values.iloc[start:start + block_size].value_counts(dropna=True)
+            self._merge(block, pd.Series(0, index=block.index, dtype='int64'), 0)
+            self.total += int(block.sum())
+        return self
+
+    def merge(self, other: "SpaceSaving"):
+        self._merge(other.counts, other.errors, other.floor)
+        self.total += other.total
+        return self
+
+    def top(self, k=10) -> pd.DataFrame:
+        """The k most frequent values with count upper bounds and guaranteed (lower bound) counts."""
+        top = self.counts.sort_values(ascending=False, kind='stable').head(k)
+        return pd.DataFrame({'count': top, 'guaranteed': top - self.errors[top.index]})
+
+    def dominance(self) -> float:
+        """Estimated share of the most frequent value among all non-missing values."""
+        return float(self.counts.max()) / self.total if self.total else 0.0
+
+    def _merge(self, counts, errors, floor):
+        # A value missing from one side may have been seen there up to that side's floor times
+        index = self.counts.index.union(counts.index)
+        merged = self.counts.reindex(index, fill_value=self.floor) + counts.reindex(index, fill_value=floor)
+        merged_errors = self.errors.reindex(index, fill_value=self.floor) + errors.reindex(index, fill_value=floor)
+        new_floor = self.floor + floor
+        if self.capacity is not None and len(merged) > self.capacity:
+            values = merged.to_numpy()
+            keep = np.argpartition(-values, self.capacity - 1)[:self.capacity]
+            dropped = np.ones(len(values), dtype=bool)
+            dropped[keep] = False
+            new_floor = max(new_floor, int(values[dropped].max()))
+            merged, merged_errors = merged.iloc[keep], merged_errors.iloc[keep]
+        self.counts = merged.astype('int64')
+        self.errors = merged_errors.astype('int64')
+        self.floor = new_floor
+
+
+def has_at_most_distinct(values, k, block_size=100000) -> bool:
+    """True if `values` holds at most k distinct non-missing values; stops scanning as soon as it has seen k + 1."""
+    values = pd.Series(values)
+    seen = set()
+    for start in range(0, len(values), block_size):
+        seen.update(values.iloc[start:start + block_size].dropna().unique())
+        if len(seen) > k:
+            return False
+    return True
@@ -0,0 +1,287 @@
+import numpy as np
+import pandas as pd
+from UAM.sketches import TDigest, HyperLogLog, SpaceSaving
+
+
+class ChunkStream:
+    """
+    Re-iterable stream of pandas DataFrame chunks.
+
+    Every call to iter() invokes `factory` again, so a stream built on top of a
+    file can be scanned more than once while only one chunk is held in memory.
+    """
+
+    def __init__(self, factory, description="chunk stream"):
+        self._factory = factory
+        self.description = description
+
+    def __iter__(self):
+        return iter(self._factory())
+
+    def __repr__(self):
+        return f"ChunkStream({self.description})"
+
+
+def is_chunk_stream(data) -> bool:
+    """True if `data` is an iterable of DataFrame chunks rather than a single DataFrame."""
+    return not isinstance(data, (pd.DataFrame, pd.Series, str, bytes)) and hasattr(data, '__iter__')
+
+
+def is_reiterable(data) -> bool:
+    """One-shot iterators return themselves from iter(); re-iterable streams do not."""
+    return iter(data) is not data
+
+
+class ReservoirSample:
+    """
+    Uniform fixed-size row sample over a chunk stream (Algorithm R applied per chunk).
+    Used for statistics that are not mergeable, such as medians and modes.
+    """
+
+    def __init__(self, capacity=10000, random_state=42):
+        self.capacity = capacity
+        self.seen = 0
+        self._rng = np.random.default_rng(random_state)
+        self._frame = None
+
+    def update(self, chunk: pd.DataFrame):
+        n = len(chunk)
+        if n == 0:
+            return
+        if self._frame is None:
+            self._frame = chunk.iloc[:0]
+        free = self.capacity - len(self._frame)
+        if free > 0:
+            self._frame = pd.concat([self._frame, chunk.iloc[:free]], ignore_index=True)
+        start = max(free, 0)
+        if start < n:
+            # Row k of the stream (1-based) replaces a random slot with probability capacity / k
+            positions = self.seen + np.arange(start, n) + 1
+            slots = (self._rng.random(n - start) * positions).astype(np.int64)
+            keep = slots < self.capacity
+            rows = np.arange(start, n)[keep]
+            slots = slots[keep]
+            if len(rows):
+                # When a slot is hit twice within a chunk, the later row wins
+                slots, last = np.unique(slots[::-1], return_index=True)
+                rows = rows[::-1][last]
+                combined = pd.concat([self._frame, chunk.iloc[rows]], ignore_index=True)
+                take = np.arange(self.capacity)
+                take[slots] = self.capacity + np.arange(len(rows))
+                self._frame = combined.iloc[take].reset_index(drop=True)
+        self.seen += n
+
+    def to_frame(self) -> pd.DataFrame:
+        return self._frame if self._frame is not None else pd.DataFrame()
+
+
+class MomentAccumulator:
+    """
+    Mergeable per-column count, mean, central moments (M2..M4), min and max for numeric data.
+    Partial results are combined with the pairwise update formulas of Chan et al. / Pebay,
+    which stay numerically stable regardless of the order chunks arrive in.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns is not None else None
+        self.n = self.mean = self.m2 = self.m3 = self.m4 = None
+        self.min = self.max = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame):
+        return cls.from_array(df.to_numpy(dtype=np.float64, na_value=np.nan), df.columns)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray, columns):
+        acc = cls(columns)
+        mask = ~np.isnan(values)
+        n = mask.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, np.nansum(values, axis=0) / np.maximum(n, 1), 0.0)
+            centered = np.where(mask, values - mean, 0.0)
+            sq = centered * centered
+            acc.n = n
+            acc.mean = mean
+            acc.m2 = sq.sum(axis=0)
+            acc.m3 = (sq * centered).sum(axis=0)
+            acc.m4 = (sq * sq).sum(axis=0)
+            acc.min = np.where(n > 0, np.where(mask, values, np.inf).min(axis=0, initial=np.inf), np.nan)
+            acc.max = np.where(n > 0, np.where(mask, values, -np.inf).max(axis=0, initial=-np.inf), np.nan)
+        return acc
+
+    def update(self, chunk: pd.DataFrame):
+        if self.columns is not None:
+            chunk = chunk[self.columns]
+        self.merge(MomentAccumulator.from_frame(chunk))
+        return self
+
+    def merge(self, other: "MomentAccumulator"):
+        if other.n is None:
+            return self
+        if self.n is None:
+            self.columns = other.columns
+            self.n, self.mean, self.m2, self.m3, self.m4 = other.n, other.mean, other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        with np.errstate(invalid='ignore', divide='ignore'):
+            safe_n = np.where(n > 0, n, 1.0)
+            delta = other.mean - self.mean
+            d2 = delta * delta
+            mean = self.mean + delta * nb / safe_n
+            m2 = self.m2 + other.m2 + d2 * na * nb / safe_n
+            m3 = (self.m3 + other.m3 + d2 * delta * na * nb * (na - nb) / safe_n ** 2
+                  + 3.0 * delta * (na * other.m2 - nb * self.m2) / safe_n)
+            m4 = (self.m4 + other.m4 + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / safe_n ** 3
+                  + 6.0 * d2 * (na * na * other.m2 + nb * nb * self.m2) / safe_n ** 2
+                  + 4.0 * delta * (na * other.m3 - nb * self.m3) / safe_n)
+            self.min = np.fmin(self.min, other.min)
+            self.max = np.fmax(self.max, other.max)
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        """Statistics in the same conventions as pandas std (ddof=1) and scipy skew/kurtosis (biased, Fisher)."""
+        cols = self.columns or []
+        if self.n is None:
+            return pd.DataFrame(index=cols, columns=['count', 'mean', 'std', 'min', 'max', 'skew', 'kurtosis'])
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(n > 1, np.sqrt(self.m2 / np.maximum(n - 1, 1)), np.nan)
+            skew = np.where(self.m2 > 0, np.sqrt(n) * self.m3 / self.m2 ** 1.5, np.nan)
+            kurt = np.where(self.m2 > 0, n * self.m4 / (self.m2 * self.m2) - 3.0, np.nan)
+        return pd.DataFrame({
+            'count': n,
+            'mean': np.where(n > 0, self.mean, np.nan),
+            'std': std,
+            'min': self.min,
+            'max': self.max,
+            'skew': skew,
+            'kurtosis': kurt,
+        }, index=cols)
+
+
+class CorrelationAccumulator:
+    """
+    Accumulates pairwise-complete sums for a Pearson correlation matrix over chunks.
+    Matches DataFrame.corr(), which ignores rows where either column of a pair is missing.
+    Values are shifted by the first chunk's means to limit cancellation error.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        p = len(self.columns)
+        self.shift = None
+        self.count = np.zeros((p, p))
+        self.sum_x = np.zeros((p, p))
+        self.sum_xx = np.zeros((p, p))
+        self.sum_xy = np.zeros((p, p))
+
+    def update(self, chunk: pd.DataFrame):
+        return self.update_array(chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def update_array(self, values: np.ndarray):
+        if self.shift is None:
+            present_count = (~np.isnan(values)).sum(axis=0)
+            self.shift = np.nansum(values, axis=0) / np.maximum(present_count, 1)
+        values = values - self.shift
+        present = (~np.isnan(values)).astype(np.float64)
+        filled = np.where(present > 0, values, 0.0)
+        self.count += present.T @ present
+        self.sum_x += filled.T @ present
+        self.sum_xx += (filled * filled).T @ present
+        self.sum_xy += filled.T @ filled
+        return self
+
+    def corr(self) -> pd.DataFrame:
+        n = self.count
+        sx, sxx = self.sum_x, self.sum_xx
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = n * self.sum_xy - sx * sx.T
+            var_i = n * sxx - sx * sx
+            var_j = var_i.T
+            corr = cov / np.sqrt(var_i * var_j)
+        corr[n < 2] = np.nan
+        return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=self.columns, columns=self.columns)
+
+
+class SummaryAccumulator:
+    """
+    Mergeable summary statistics for a chunk stream or partitioned dataset.
+
+    Numeric columns get exact moments (MomentAccumulator) and t-digest medians; categorical
+    columns get HyperLogLog distinct counts plus a Space-Saving summary of the `capacity` most
+    frequent values for the mode frequency and dominance ratio, so memory stays bounded for
+    high-cardinality columns. Distinct counts are only estimated once Space-Saving has had to
+    evict a value; until then it holds every value's exact count. With `exact`, categorical
+    values are counted exactly instead.
+    Accumulators built on separate partitions or workers combine with merge().
+    """
+
+    def __init__(self, numeric_columns, categorical_columns, compression=200, precision=14,
+                 capacity=1000, exact=False):
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+        self.exact = exact
+        self.moments = MomentAccumulator(self.numeric_columns)
+        self.digests = {col: TDigest(compression) for col in self.numeric_columns}
+        self.distinct = {col: HyperLogLog(precision) for col in self.categorical_columns}
+        self.heavy_hitters = {col: SpaceSaving(None if exact else capacity) for col in self.categorical_columns}
+        self.missing = pd.Series(0, index=self.categorical_columns, dtype='int64')
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame, **kwargs):
+        return cls(df.select_dtypes(include=[np.number]).columns,
+                   df.select_dtypes(include=['object', 'category']).columns, **kwargs)
+
+    def update(self, chunk: pd.DataFrame):
+        if self.numeric_columns:
+            values = chunk[self.numeric_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.moments.merge(MomentAccumulator.from_array(values, self.numeric_columns))
+            for i, col in enumerate(self.numeric_columns):
+                self.digests[col].update(values[:, i])
+        for col in self.categorical_columns:
+            if not self.exact:
+                self.distinct[col].update(chunk[col])
+            self.heavy_hitters[col].update(chunk[col])
+        self.missing += chunk[self.categorical_columns].isnull().sum()
+        return self
+
+    def merge(self, other: "SummaryAccumulator"):
+        self.moments.merge(other.moments)
+        for col in self.numeric_columns:
+            self.digests[col].merge(other.digests[col])
+        for col in self.categorical_columns:
+            self.distinct[col].merge(other.distinct[col])
+            self.heavy_hitters[col].merge(other.heavy_hitters[col])
+        self.missing += other.missing
+        return self
+
+    def numerical(self) -> pd.DataFrame:
+        stats = self.moments.to_frame()
+        stats.insert(2, 'median', [self.digests[col].quantile(0.5) for col in self.numeric_columns])
+        return stats
+
+    def categorical(self, top_k=5) -> pd.DataFrame:
+        # floor == 0: nothing was evicted, so the monitored values are all the distinct values
+        rows = [categorical_row(self.heavy_hitters[col], self.missing[col], top_k,
+                                None if self.exact or self.heavy_hitters[col].floor == 0 else self.distinct[col].count())
+                for col in self.categorical_columns]
+        return pd.DataFrame(rows, index=self.categorical_columns, columns=CATEGORICAL_FIELDS, dtype=object)
+
+
+CATEGORICAL_FIELDS = ['unique_count', 'mode_freq', 'dominance', 'top_values', 'missing']
+
+
+def categorical_row(counts: SpaceSaving, missing, top_k=5, unique_count=None) -> list:
+    """
+    Summary row for one categorical column: distinct count (exact when the counts are, or the
+    given estimate), mode frequency, dominance ratio of the mode and the top_k values as "value (count)".
+    """
+    top = counts.top(top_k)
+    if unique_count is None:
+        unique_count = len(counts.counts)
+    mode_freq = int(top['count'].iloc[0]) if len(top) else 0
+    top_values = ', '.join(f"{value} ({count})" for value, count in top['count'].items())
+    return [unique_count, mode_freq, counts.dominance(), top_values, int(missing)]
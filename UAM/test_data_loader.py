@@ -1,5 +1,10 @@
 import os
+import pytest
 from UAM import data_loader as dl
+from UAM import ingest_cache
+from UAM import eda_engine as eda
+from UAM import insight_extractor as ie
+import numpy as np
 import pandas as pd
 
 def test_load_and_preprocess_csv():
@@ -31,5 +36,290 @@ def test_load_and_preprocess_csv():
     # Clean up sample file
     os.remove(sample_csv)
 
+def test_chunked_csv_stream_matches_in_memory():
+    sample_csv = 'sample_chunked.csv'
+    rng = np.random.default_rng(0)
+    n = 500
+    base = rng.normal(size=n)
+    df_sample = pd.DataFrame({
+        'const': 7,
+        'x': base,
+        'x_dup': base * 2 + 1,  # redundant with x
+        'y': rng.normal(10, 3, size=n),
+        'gap': np.where(np.arange(n) % 10 == 0, np.nan, rng.normal(size=n)),
+        'cat': rng.choice(['a', 'b', 'c'], size=n),
+    })
+    df_sample.to_csv(sample_csv, index=False)
+    try:
+        stream = dl.load_data('csv', {'filepath': sample_csv, 'chunksize': 64})
+        chunks = list(stream)
+        assert len(chunks) == 8
+        assert all(chunk['x'].dtype == np.float64 for chunk in chunks)
+
+        df_full = dl.load_data('csv', {'filepath': sample_csv})
+        expected_df, expected_meta, _ = dl.preprocess_data(df_full)
+        processed, metadata, pca_fig = dl.preprocess_data(stream)
+        assert pca_fig is None
+        for key in ['original_shape', 'final_shape', 'constant_columns_removed',
+                    'highly_correlated_columns_removed', 'columns_dropped_missing', 'column_types']:
+            assert metadata[key] == expected_meta[key]
+        streamed = pd.concat(list(processed), ignore_index=True)
+        assert streamed['gap'].isnull().sum() == 0
+        pd.testing.assert_frame_equal(streamed, expected_df.reset_index(drop=True))
+
+        stats = eda.generate_summary_statistics(stream)['numerical']
+        expected = eda.generate_summary_statistics(df_full)['numerical']
+        for col in ['count', 'mean', 'std', 'min', 'max', 'skew', 'kurtosis']:
+            np.testing.assert_allclose(stats.loc[['x', 'y'], col], expected.loc[['x', 'y'], col].astype(float), rtol=1e-9)
+
+        insights = ie.extract_key_insights(processed, 'y', 'regression')
+        expected_insights = ie.extract_key_insights(expected_df, 'y', 'regression')
+        assert insights['dataset_summary'] == expected_insights['dataset_summary']
+        assert insights['outliers_count'] == expected_insights['outliers_count']
+    finally:
+        os.remove(sample_csv)
+
+def test_chunk_stream_rereads_file_objects_and_keeps_late_text(capsys):
+    import io
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'a': rng.normal(size=200), 'b': rng.normal(size=200), 'k': rng.choice(['u', 'v'], 200)})
+    # An upload (file-like object) must support every pass of preprocess_data
+    upload = io.BytesIO(df.to_csv(index=False).encode())
+    stream = dl.load_data('csv', {'filepath': upload, 'chunksize': 30})
+    processed, metadata, _ = dl.preprocess_data(stream)
+    assert metadata['original_shape'] == (200, 3) and len(pd.concat(list(processed))) == 200
+    assert len(pd.concat(list(stream))) == 200
+
+    # A column that looks like integers in the first chunk keeps its later text values
+    late = io.BytesIO(('n\n' + '1\n' * 40 + 'a\n' + '2\n').encode())
+    merged = pd.concat(list(dl.load_data('csv', {'filepath': late, 'chunksize': 30})), ignore_index=True)
+    assert merged['n'].tolist()[40] == 'a' and merged['n'].notnull().all()
+    assert "Column 'n' has 1 non-numeric values" in capsys.readouterr().out
+
+def test_columnar_cache_hit_invalidate_and_evict(tmp_path):
+    sample_csv = tmp_path / 'cached.csv'
+    cache_dir = str(tmp_path / 'cache')
+    pd.DataFrame({'a': [1, 2, 3], 'b': ['x', 'y', 'z']}).to_csv(sample_csv, index=False)
+    config = {'filepath': str(sample_csv), 'cache': True, 'cache_dir': cache_dir}
+
+    first = dl.load_data('csv', config)
+    assert len(os.listdir(cache_dir)) == 1
+    second = dl.load_data('csv', config)
+    pd.testing.assert_frame_equal(first, second)
+    # A cache hit is as editable as a fresh parse
+    second.loc[0, 'a'] = 10
+
+    # Different parse options and different content get their own entries
+    dl.load_data('csv', dict(config, dtype={'a': 'float64'}))
+    assert len(os.listdir(cache_dir)) == 2
+    pd.DataFrame({'a': [4], 'b': ['w']}).to_csv(sample_csv, index=False)
+    assert dl.load_data('csv', config).shape == (1, 2)
+    assert len(os.listdir(cache_dir)) == 3
+
+    assert ingest_cache.invalidate('csv', config, cache_dir=cache_dir) == 1
+    assert len(os.listdir(cache_dir)) == 2
+    assert len(ingest_cache.evict(cache_dir, max_bytes=0)) == 2
+    assert ingest_cache.invalidate(cache_dir=cache_dir) == 0
+
+def test_infer_dtypes_downcasts_and_records_schema(tmp_path, capsys):
+    sample_csv = tmp_path / 'typed.csv'
+    n = 300
+    pd.DataFrame({
+        'small_int': np.arange(n) % 100,
+        'wide_int': np.where(np.arange(n) == n - 1, 100000, 1),  # out of sample range at the end
+        'ratio': np.linspace(0, 1, n),
+        'city': np.tile(['Oslo', 'Lima', 'Pune'], n // 3),
+        'when': pd.date_range('2024-01-01', periods=n, freq='D').strftime('%Y-%m-%d'),
+        'note': [f'free text {i}' for i in range(n)],
+    }).to_csv(sample_csv, index=False)
+
+    df = dl.load_data('csv', {'filepath': str(sample_csv), 'infer_dtypes': True, 'infer_sample_rows': 50})
+    assert df['small_int'].dtype == np.int8
+    assert df['wide_int'].dtype == np.int32
+    assert df['wide_int'].iloc[-1] == 100000
+    assert df['ratio'].dtype == np.float32
+    assert isinstance(df['city'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df['when'])
+    assert not isinstance(df['note'].dtype, pd.CategoricalDtype)
+
+    _, metadata, _ = dl.preprocess_data(df)
+    assert metadata['schema']['small_int'] == 'int8'
+    assert metadata['schema']['city'] == 'category'
+
+    # A malformed file fails once, without the sampled-dtypes retry
+    ragged = tmp_path / 'ragged.csv'
+    ragged.write_text('a,b\n1,2\n3,4,5\n')
+    with pytest.raises(pd.errors.ParserError):
+        dl.load_data('csv', {'filepath': str(ragged)})
+    assert 'Sampled dtypes did not fit' not in capsys.readouterr().out
+
+def test_sqlite_pooled_streaming_and_partitioned_reads(tmp_path, capsys):
+    db_path = tmp_path / 'sample.db'
+    connection_string = f"sqlite:///{db_path}"
+    df_sample = pd.DataFrame({'id': np.arange(1000), 'value': np.arange(1000) * 0.5})
+    df_sample.loc[::97, 'id'] = np.nan  # NULL keys must not be lost by partitioning
+    df_sample.to_sql('items', dl.get_engine(connection_string), index=False)
+    config = {'connection_string': connection_string, 'query': 'SELECT * FROM items'}
+    try:
+        full = dl.load_data('sqlite', config)
+        assert dl.get_engine(connection_string) is dl.get_engine(connection_string)
+
+        stream = dl.load_data('sqlite', dict(config, chunksize=300))
+        chunks = list(stream)
+        assert [len(chunk) for chunk in chunks] == [300, 300, 300, 100]
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+
+        parts = dl.load_data('sqlite', dict(config, partition_column='id', num_partitions=4, lower_bound=100, upper_bound=800))
+        parts = parts.sort_values('value').reset_index(drop=True)
+        pd.testing.assert_frame_equal(parts, full.sort_values('value').reset_index(drop=True))
+
+        # ':word' inside a string literal of user SQL is not a bind parameter
+        literal = dict(config, query="SELECT id, value, 'ratio :x' AS note FROM items")
+        assert (dl.load_data('sqlite', literal)['note'] == 'ratio :x').all()
+        assert (pd.concat(dl.load_data('sqlite', dict(literal, chunksize=400)))['note'] == 'ratio :x').all()
+        parts = dl.load_data('sqlite', dict(literal, partition_column='id', num_partitions=3))
+        assert len(parts) == len(full) and (parts['note'] == 'ratio :x').all()
+
+        # A trailing ';' as typed at a prompt; more partitions than the pool has connections
+        assert dl._pool_capacity(dl.get_engine(connection_string)) == 15
+        parts = dl.load_data('sqlite', dict(config, query='SELECT * FROM items ;\n', partition_column='id', num_partitions=30))
+        assert len(parts) == len(full)
+        assert 'Reading 31 partitions of \'id\' with 15 connections.' in capsys.readouterr().out
+    finally:
+        dl.dispose_engines()
+
+def test_partitioned_directory_and_glob_ingestion(tmp_path):
+    for day in ['2024-01-01', '2024-01-02', '2024-01-03']:
+        pd.DataFrame({'day_value': [1, 2, 3], 'label': ['a', 'b', 'c']}).to_csv(tmp_path / f'{day}.csv', index=False)
+    (tmp_path / 'notes.txt').write_text('not a partition')
+
+    df = dl.load_data('csv', {'filepath': str(tmp_path), 'max_workers': 2})
+    assert df.shape == (9, 3)
+    assert list(df['partition'].cat.categories) == ['2024-01-01', '2024-01-02', '2024-01-03']
+    assert (df['partition'] == '2024-01-02').sum() == 3
+
+    pruned = dl.load_data('csv', {'filepath': str(tmp_path / '*.csv'), 'partition_filter': '*-0[23].csv',
+                                  'partition_key': 'day'})
+    assert sorted(pruned['day'].unique()) == ['2024-01-02', '2024-01-03']
+
+    chunks = list(dl.load_data('csv', {'filepath': str(tmp_path), 'chunksize': 2}))
+    assert sum(len(chunk) for chunk in chunks) == 9
+    assert chunks[-1]['partition'].iloc[0] == '2024-01-03'
+
+    # Eager and chunked reads agree on the partition column, including clashing file names
+    (tmp_path / 'more').mkdir()
+    pd.DataFrame({'day_value': [4], 'label': ['d']}).to_csv(tmp_path / 'more' / '2024-01-01.csv', index=False)
+    config = {'filepath': str(tmp_path / '**' / '*.csv')}
+    eager = dl.load_data('csv', config)
+    chunked = pd.concat(list(dl.load_data('csv', dict(config, chunksize=2))), ignore_index=True)
+    assert chunked['partition'].dtype == eager['partition'].dtype
+    assert chunked['partition'].tolist() == eager['partition'].tolist()
+    assert 'more/2024-01-01' in eager['partition'].cat.categories
+    with pytest.raises(ValueError, match='clashes'):
+        list(dl.load_data('csv', dict(config, chunksize=2, partition_key='label')))
+
+def test_profile_columns_single_sweep():
+    df = pd.DataFrame({
+        'const': [2.0] * 6,
+        'all_nan': [np.nan] * 6,
+        'half_nan': [1.0, np.nan, 1.0, np.nan, 1.0, np.nan],  # NaN counts as a second value
+        'x': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        'text': ['a', 'a', 'a', 'a', 'a', 'a'],
+        'ids': ['u1', 'u2', 'u3', 'u4', 'u5', None],
+    })
+    profile, corr = dl.profile_columns(df, rows_per_block=4)
+    assert profile.index[profile['is_constant']].tolist() == ['const', 'all_nan', 'text']
+    assert profile['null_count'].to_dict() == {'const': 0, 'all_nan': 6, 'half_nan': 3, 'x': 0, 'text': 0, 'ids': 1}
+    assert profile.at['ids', 'nunique'] == 5
+    assert profile.at['x', 'mean'] == 3.5
+    np.testing.assert_allclose(profile.at['x', 'std'], df['x'].std())
+    assert list(corr.columns) == ['const', 'all_nan', 'half_nan', 'x']
+
+def test_sampled_correlation_pruning_matches_exact():
+    rng = np.random.default_rng(3)
+    n = 4000
+    df = pd.DataFrame(rng.normal(size=(n, 30)), columns=[f'c{i}' for i in range(30)])
+    df.iloc[::9, 4] = np.nan
+    for k in range(5):
+        df[f'dup{k}'] = -2 * df[f'c{k}'] + rng.normal(scale=0.1, size=n)
+    df['near'] = df['c10'] + rng.normal(scale=0.5, size=n)  # corr ~0.89, below the threshold
+
+    exact_profile, corr = dl.profile_columns(df)
+    upper = corr.abs().where(np.triu(np.ones(corr.shape), k=1).astype(bool))
+    expected = [col for col in upper.columns if any(upper[col] > 0.95)]
+    sampled = dl.find_correlated_columns(df, df.columns, 0.95, sample_rows=1000, block_size=8)
+    assert sampled == expected == [f'dup{k}' for k in range(5)]
+
+    # Chunk streams honour corr_method: the reservoir sample is screened, no p x p accumulator
+    stream = dl.ChunkStream(lambda: (df.iloc[start:start + 700] for start in range(0, n, 700)))
+    pipeline = dl.PreprocessingPipeline(corr_method='sampled', sample_size=1000).fit(stream)
+    assert pipeline.metadata_['correlation_method'] == 'sampled'
+    assert pipeline.metadata_['highly_correlated_columns_removed'] == expected
+
+def _low_rank_frame(n=3000, p=30, rank=4, seed=5):
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(n, rank))
+    values = latent @ rng.normal(size=(rank, p)) + rng.normal(scale=0.3, size=(n, p))
+    return pd.DataFrame(values, columns=[f'f{i}' for i in range(p)])
+
+def test_pca_methods_agree_and_model_is_reusable(tmp_path):
+    df = _low_rank_frame()
+    results = {}
+    for method in ['full', 'randomized', 'incremental']:
+        model_path = str(tmp_path / f'pca_{method}.pkl')
+        processed, metadata, _ = dl.preprocess_data(df, corr_threshold=0.99, pca_variance=0.9, pca_method=method,
+                                                    pca_batch_size=500, pca_model_path=model_path,
+                                                    corr_method='exact')
+        assert metadata['pca_applied'] and metadata['pca_method'] == method
+        assert metadata['pca_explained_variance'] >= 90
+        results[method] = metadata['pca_n_components']
+
+        reapplied = dl.apply_pca_model(df, model_path)
+        np.testing.assert_allclose(reapplied.to_numpy(), processed.to_numpy(), atol=1e-8)
+    assert results['full'] == results['randomized'] == results['incremental'] == 4
+
+def test_chunk_stream_gets_incremental_pca(tmp_path):
+    sample_csv = tmp_path / 'wide.csv'
+    df = _low_rank_frame(n=1200, p=20)
+    df['label'] = np.where(df['f0'] > 0, 'pos', 'neg')
+    df.to_csv(sample_csv, index=False)
+    stream = dl.load_data('csv', {'filepath': str(sample_csv), 'chunksize': 250})
+    processed, metadata, pca_fig = dl.preprocess_data(stream, corr_threshold=0.99, pca_variance=0.9, pca_batch_size=300)
+    assert metadata['pca_method'] == 'incremental' and not pca_fig.rendered
+    assert pca_fig.figure.axes[0].get_title() == 'PCA Explained Variance' and pca_fig.rendered
+    merged = pd.concat(list(processed))
+    assert merged.shape == metadata['final_shape']
+    assert list(merged.columns) == [f'PCA_{i+1}' for i in range(metadata['pca_n_components'])] + ['label']
+
+def test_preprocessing_pipeline_transforms_new_data(tmp_path):
+    df = _low_rank_frame(n=2000, p=20)
+    df['const'] = 1
+    df['label'] = np.where(df['f0'] > 0, 'pos', 'neg')
+    df.loc[::7, 'f3'] = np.nan
+    train, new = df.iloc[:1500], df.iloc[1500:].copy()
+    new.loc[new.index[::5], 'f5'] = np.nan
+    new.loc[new.index[::9], 'label'] = None
+
+    pipeline = dl.PreprocessingPipeline(corr_threshold=0.99, pca_variance=0.9)
+    processed = pipeline.fit_transform(train)
+    assert 'const' in pipeline.dropped_columns_ and 'f3' in pipeline.fill_values_
+    assert list(processed.columns)[-1] == 'label'
+
+    path = pipeline.save(str(tmp_path / 'models' / dl.PIPELINE_FILENAME))
+    restored = dl.PreprocessingPipeline.load(path)
+    assert not restored.pca_fig_.rendered and restored.metadata_ == pipeline.metadata_
+    transformed = restored.transform(new)
+    assert list(transformed.columns) == list(processed.columns)
+    assert not transformed.isnull().any().any()
+    np.testing.assert_allclose(restored.transform(train).iloc[:, :-1].to_numpy(),
+                               processed.iloc[:, :-1].to_numpy(), atol=1e-8)
+
+    # Category columns (e.g. from load_data's infer_dtypes) get the default fill as a new category
+    cat_train = pd.DataFrame({'x': np.arange(6.0), 'colour': pd.Categorical(['red', 'blue'] * 3)})
+    cat_pipeline = dl.PreprocessingPipeline(pca_variance=None).fit(cat_train)
+    cat_new = pd.DataFrame({'x': [1.0, 2.0], 'colour': pd.Categorical(['red', None], categories=['blue', 'red'])})
+    filled = cat_pipeline.transform(cat_new)
+    assert filled['colour'].tolist() == ['red', 'Missing']
+
 if __name__ == '__main__':
     test_load_and_preprocess_csv()
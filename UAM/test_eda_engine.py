@@ -0,0 +1,131 @@
+import os
+from UAM import eda_engine as eda
+import numpy as np
+import pandas as pd
+
+def test_correlation_pairs_shared_and_top_k():
+    from UAM import frame_cache
+    rng = np.random.default_rng(6)
+    base = rng.normal(size=(500, 3))
+    df = pd.DataFrame(np.repeat(base, 4, axis=1) + rng.normal(scale=0.1, size=(500, 12)),
+                      columns=[f'c{i}' for i in range(12)])
+    cache = frame_cache.FrameCache()
+    corr = eda.correlation_matrix(df, cache=cache)
+    assert eda.correlation_matrix(df, cache=cache) is corr
+
+    abs_corr = corr.abs()
+    expected = [(a, b, abs_corr.loc[a, b]) for i, a in enumerate(df.columns) for b in df.columns[i + 1:]
+                if abs_corr.loc[a, b] > 0.8]
+    pairs = eda.correlated_pairs(corr, 0.8)
+    assert [(a, b) for a, b, _ in pairs] == [(a, b) for a, b, _ in expected] and len(pairs) == 18
+
+    insights = eda.extract_eda_insights(df, max_correlation_pairs=5)
+    corr_lines = [line for line in insights if 'strong correlation:' in line]
+    assert len(corr_lines) == 5 and any(line.startswith('18 feature pairs') for line in insights)
+    strongest = max(expected, key=lambda pair: pair[2])
+    assert corr_lines[0] == f"Features '{strongest[0]}' and '{strongest[1]}' have strong correlation: {strongest[2]:.2f}"
+
+def test_eda_visuals_render_in_process_pool(tmp_path):
+    rng = np.random.default_rng(7)
+    n = 400
+    x = rng.normal(size=n)
+    df = pd.DataFrame({
+        'a': x,
+        'b': x + rng.normal(scale=0.5, size=n),
+        'kind': rng.choice(['u', 'v', None], size=n),
+        'when': pd.date_range('2024-01-01', periods=n, freq='h'),
+    })
+    serial = eda.generate_eda_visuals(df, str(tmp_path / 'serial'))
+    pooled = eda.generate_eda_visuals(df, str(tmp_path / 'pooled'), n_jobs=2)
+    files = sorted(os.path.basename(entry['file']) for entry in pooled)
+    assert files == sorted(os.path.basename(entry['file']) for entry in serial)
+    assert files == sorted(name for name in os.listdir(tmp_path / 'pooled') if name.endswith('.png'))
+    assert {'correlation_heatmap.png', 'scatter_a_b.png', 'box_abykind.png', 'trend_aoverwhen.png'} <= set(files)
+    assert {entry['chart']: entry['columns'] for entry in pooled}['trend'] == ['when', 'a']
+
+def test_distribution_plots_use_prebinned_json(tmp_path):
+    import json
+    from scipy.stats import gaussian_kde
+    rng = np.random.default_rng(8)
+    values = np.r_[rng.normal(size=3000), rng.normal(6, 0.5, size=2000), [np.nan] * 10]
+    manifest = eda.generate_eda_visuals(pd.DataFrame({'mix': values}), str(tmp_path))
+    entry, = [item for item in manifest if item['chart'] == 'dist']
+    with open(entry['data']) as f:
+        binned = json.load(f)
+    assert binned['column'] == 'mix' and binned['n'] == 5000 and sum(binned['counts']) == 5000
+    assert len(binned['bin_edges']) == 31
+    finite = values[~np.isnan(values)]
+    bin_width = binned['bin_edges'][1] - binned['bin_edges'][0]
+    exact = gaussian_kde(finite)(binned['kde_x']) * len(finite) * bin_width
+    np.testing.assert_allclose(binned['kde_y'], exact, atol=1e-3 * exact.max())
+
+def test_scatter_and_trend_downsampling_respect_point_budget(tmp_path):
+    rng = np.random.default_rng(9)
+    n = 50000
+    x = rng.normal(size=n)
+    y = x + rng.normal(size=n)
+    y[123] = 50.0  # a spike that must survive the reduction
+
+    keep = eda.stratified_sample_indices(x, y, 2000)
+    assert len(keep) <= 2000 and 123 in keep
+    keep = eda.minmax_bucket_indices(x, y, 500)
+    assert len(keep) <= 1000 and 123 in keep and np.all(np.diff(x[keep]) >= 0)
+    keep = eda.lttb_indices(x, y, 1000)
+    assert len(keep) == 1000 and 123 in keep and np.all(np.diff(x[keep]) >= 0)
+    np.testing.assert_array_equal(eda.lttb_indices(x[:50], y[:50], 1000), np.argsort(x[:50], kind='stable'))
+
+    df = pd.DataFrame({'a': x, 'b': y, 'when': pd.date_range('2024-01-01', periods=n, freq='min')})
+    for scatter_mode, trend_mode in [('hexbin', 'minmax'), ('sample', 'lttb')]:
+        manifest = eda.generate_eda_visuals(df, str(tmp_path / scatter_mode), max_points=1000,
+                                            scatter_mode=scatter_mode, trend_mode=trend_mode)
+        assert {'scatter', 'trend'} <= {entry['chart'] for entry in manifest}
+
+def test_incremental_eda_rerenders_only_changed_columns(tmp_path):
+    import json
+    rng = np.random.default_rng(10)
+    n = 600
+    x = rng.normal(size=n)
+    df = pd.DataFrame({'a': x, 'b': x + rng.normal(size=n), 'c': rng.normal(size=n), 'k': rng.choice(['u', 'v'], n)})
+    out = str(tmp_path)
+    eda.generate_eda_report(df, out)
+    first = {name: os.path.getmtime(os.path.join(out, name)) for name in os.listdir(out) if name.endswith('.png')}
+
+    changed = df.copy()
+    changed['c'] = changed['c'] * 2
+    for name in first:
+        os.utime(os.path.join(out, name), (0, 0))
+    eda.generate_eda_report(changed, out)
+    rerendered = {name for name in first if os.path.getmtime(os.path.join(out, name)) != 0}
+    # dist_c depends on c; the heatmap and top-pair scatter depend on every numeric column
+    assert rerendered == {'dist_c.png', 'correlation_heatmap.png', 'scatter_a_b.png'}
+
+    with open(os.path.join(out, eda.EDA_MANIFEST)) as f:
+        manifest = json.load(f)
+    expected = eda.generate_summary_statistics(changed)['numerical']
+    np.testing.assert_allclose(pd.DataFrame(manifest['summary']['numerical']).T.loc[expected.index, expected.columns],
+                               expected.to_numpy(dtype=float))
+
+    eda.generate_eda_report(changed.drop(columns=['k']), out)
+    assert not [name for name in os.listdir(out) if name.startswith(('count_k', 'box_'))]
+
+def test_eda_visuals_data_output_mode(tmp_path):
+    import json
+    rng = np.random.default_rng(12)
+    n = 5000
+    x = rng.normal(size=n)
+    df = pd.DataFrame({'a': x, 'b': x + rng.normal(size=n), 'k': rng.choice(['u', 'v'], n),
+                       'when': pd.date_range('2024-01-01', periods=n, freq='min')})
+    manifest = eda.generate_eda_visuals(df, str(tmp_path), output='data', max_points=400)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.png')]
+    charts = {}
+    for entry in manifest:
+        with open(entry['file']) as f:
+            charts[entry['chart']] = json.load(f)
+    assert charts['heatmap']['columns'] == ['a', 'b']
+    assert sum(charts['dist']['counts']) == n
+    assert dict(zip(charts['count']['categories'], charts['count']['counts'])) == df['k'].value_counts().to_dict()
+    assert len(charts['scatter']['x']) <= 400 and charts['scatter']['fit']['slope'] > 0.5
+    assert len(charts['trend']['x']) <= 400
+    group = charts['box']['groups'][0]
+    values = df.loc[df['k'] == group['category'], 'a']
+    assert np.isclose(group['median'], values.median()) and group['count'] == len(values)
@@ -0,0 +1,26 @@
+import os
+import numpy as np
+import pandas as pd
+
+def test_dataset_fingerprint_covers_full_content():
+    from UAM.fingerprint import dataset_fingerprint, column_fingerprints
+    rng = np.random.default_rng(11)
+    df = pd.DataFrame({'a': rng.normal(size=1000), 'b': rng.choice(['x', 'y'], 1000), 'c': [[i] for i in range(1000)]})
+    same = df.copy()
+    tail_changed = df.copy()
+    tail_changed.loc[999, 'a'] += 1
+    assert dataset_fingerprint(df) == dataset_fingerprint(same, n_jobs=1)
+    assert dataset_fingerprint(df) != dataset_fingerprint(tail_changed)
+    assert dataset_fingerprint(df) != dataset_fingerprint(df.rename(columns={'a': 'z'}))
+    # Same-shape in-place edits change the fingerprint of the same object
+    before = dataset_fingerprint(same)
+    same.loc[0, 'a'] = 999
+    assert dataset_fingerprint(same) != before
+    changed = column_fingerprints(tail_changed, n_jobs=3)
+    assert [col for col, fp in column_fingerprints(df).items() if changed[col] != fp] == ['a']
+
+    # n_jobs=-1 means one worker per CPU (capped at one per column), not a serial run
+    from UAM.parallel import resolve_n_jobs
+    assert resolve_n_jobs(-1) == resolve_n_jobs(None) == (os.cpu_count() or 1)
+    assert resolve_n_jobs(-1, n_tasks=3) == min(os.cpu_count() or 1, 3) and resolve_n_jobs(0) == 1
+    assert column_fingerprints(df, n_jobs=-1) == column_fingerprints(df, n_jobs=1)
@@ -0,0 +1,63 @@
+from UAM import eda_engine as eda
+from UAM import insight_extractor as ie
+import numpy as np
+import pandas as pd
+
+def test_binned_mutual_information_ranking_matches_knn():
+    rng = np.random.default_rng(13)
+    n = 30000
+    df = pd.DataFrame({
+        'strong': rng.normal(size=n),
+        'weak': rng.normal(size=n),
+        'noise': rng.normal(size=n),
+        'colour': rng.choice(['red', 'green', 'blue'], size=n),
+    })
+    df['y'] = (df['strong'] + 0.4 * df['weak'] + (df['colour'] == 'red') + rng.normal(scale=0.5, size=n) > 0.5).astype(int)
+    df.loc[::40, 'weak'] = np.nan
+
+    binned = ie.extract_key_insights(df, 'y', 'classification', mi_method='binned', sample_size=10000, n_jobs=2)
+    knn = ie.extract_key_insights(df.fillna(0), 'y', 'classification', mi_method='knn')
+    # Binned scores name the original columns; k-NN scores name the one-hot columns
+    assert list(binned['top_influential_features']) == ['strong', 'colour', 'weak', 'noise']
+    assert list(knn['top_influential_features'])[:3] == ['strong', 'colour_red', 'weak']
+    scores = binned['top_influential_features']
+    for col in ['strong', 'weak']:
+        assert abs(scores[col] - knn['top_influential_features'][col]) < 0.01
+    assert scores['noise'] < 0.01
+    assert set(binned['summary_statistics_top_features']) == {'strong', 'weak', 'noise'}
+
+    # A 1% class keeps its share of the stratified sample
+    strata = np.r_[np.zeros(9900, dtype=int), np.ones(100, dtype=int)]
+    rows = ie._stratified_rows(strata, 1000)
+    assert len(rows) == 1000 and strata[rows].sum() == 10
+
+def test_vectorized_outlier_counts_are_shared_and_cached():
+    from UAM import outliers, frame_cache
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({'a': rng.standard_t(3, size=2000), 'b': rng.normal(size=2000), 'c': rng.choice(['x', 'y'], 2000)})
+    df.loc[::11, 'b'] = np.nan
+    expected = {}
+    for col in ['a', 'b']:
+        q1, q3 = df[col].quantile(0.25), df[col].quantile(0.75)
+        expected[col] = int(((df[col] < q1 - 1.5 * (q3 - q1)) | (df[col] > q3 + 1.5 * (q3 - q1))).sum())
+
+    insights = ie.extract_key_insights(df, None, 'clustering')
+    assert insights['outliers_count'] == expected
+    cache = frame_cache.FrameCache()
+    assert f"Feature 'a' has {expected['a']} potential outliers." in eda.extract_eda_insights(df, cache=cache)
+    assert outliers.count_outliers(df, cache=cache).to_dict() == expected
+    # The insight step of the same run reuses the fences computed for the EDA step
+    assert ie.extract_key_insights(df, None, 'clustering', cache=cache)['outliers_count'] == expected
+    assert sum(name == 'outliers' for name, _ in cache._values) == 1
+
+    # Without a shared cache, every call sees the current content of the frame
+    edited = df.copy()
+    edited.loc[0, 'b'] = 1e6
+    before = outliers.count_outliers(edited)['b']
+    edited.loc[1, 'b'] = -1e6
+    assert outliers.count_outliers(edited)['b'] == before + 1
+
+    mad = outliers.count_outliers(df, method='mad')
+    median = df['a'].median()
+    modified_z = (df['a'] - median).abs() / (1.4826 * (df['a'] - median).abs().median())
+    assert mad['a'] == (modified_z > 3.5).sum()
@@ -0,0 +1,140 @@
+import os
+import warnings
+import numpy as np
+import pandas as pd
+
+def test_sparse_encoder_and_modeling_on_csr(tmp_path):
+    import scipy.sparse as sp
+    from UAM.encoding import SparseEncoder
+    from UAM import modeling
+    rng = np.random.default_rng(14)
+    n = 1500
+    df = pd.DataFrame({
+        'x': rng.normal(size=n),
+        'colour': rng.choice(['red', 'green', 'blue'], size=n),
+        'user': rng.integers(0, 1000, size=n).astype(str),
+        'when': pd.date_range('2021-03-01', periods=n, freq='h'),
+    })
+    df.loc[::9, 'colour'] = None
+    df['y'] = np.where(df['x'] + (df['colour'] == 'red') > 0.3, 'yes', 'no')
+
+    encoder = SparseEncoder(max_onehot_categories=10)
+    X = encoder.fit_transform(df.drop(columns=['y']))
+    names = encoder.get_feature_names_out()
+    assert sp.isspmatrix_csr(X) and X.shape == (n, len(names))
+    # One column per calendar attribute instead of one per timestamp
+    assert [name for name in names if name.startswith('when_')] == ['when_year', 'when_month', 'when_day', 'when_dayofweek', 'when_hour']
+    assert {'colour_red', 'colour_nan', 'user_frequency'} <= set(names)
+    assert encoder.discrete_features_.sum() == 4
+    unseen = df.head(2).drop(columns=['y']).assign(colour='purple', user='new')
+    row = encoder.transform(unseen).toarray()[0]
+    assert row[names.index('user_frequency')] == 0 and row[encoder.discrete_features_].sum() == 0
+
+    hashed = SparseEncoder(max_onehot_categories=10, high_cardinality='hashing', hash_features=256)
+    X_hashed = hashed.fit_transform(df.drop(columns=['y']))
+    assert X_hashed.shape[1] == 1 + 5 + 4 + 256
+    assert (abs(X_hashed[:, -256:]).sum(axis=1) == 1).all()
+    np.testing.assert_array_equal(hashed.transform(df.drop(columns=['y'])).toarray(), X_hashed.toarray())
+
+    X_model, y = modeling.preprocess_for_modeling(df, 'y')
+    assert sp.isspmatrix_csr(X_model) and set(y) == {0, 1}
+    modeling.run_modeling(df, 'y', output_dir=str(tmp_path / 'reports'), model_dir=str(tmp_path / 'models'))
+    assert os.path.exists(tmp_path / 'models' / modeling.ENCODER_FILENAME)
+    report = (tmp_path / 'reports' / 'model_report.md').read_text()
+    assert '## RandomForestClassifier' in report and 'accuracy' in report
+
+def test_parallel_training_skips_models_past_timeout(tmp_path, monkeypatch):
+    import time
+    import joblib
+    from sklearn.linear_model import LinearRegression
+    from sklearn.ensemble import RandomForestRegressor
+    from UAM import modeling
+
+    class SlowRegressor(LinearRegression):
+        def fit(self, X, y):
+            time.sleep(60)
+            return super().fit(X, y)
+
+    monkeypatch.setattr(modeling, 'candidate_models', lambda problem_type, *options: {
+        'LinearRegression': LinearRegression(),
+        'SlowRegressor': SlowRegressor(),
+        'RandomForestRegressor': RandomForestRegressor(n_estimators=20, random_state=0),
+    })
+    rng = np.random.default_rng(15)
+    df = pd.DataFrame(rng.normal(size=(400, 4)), columns=['a', 'b', 'c', 'd'])
+    df['target'] = df['a'] * 2 + rng.normal(size=400) * 0.1
+
+    start = time.monotonic()
+    modeling.run_modeling(df, 'target', output_dir=str(tmp_path / 'reports'), model_dir=str(tmp_path / 'models'),
+                          n_jobs=4, timeout=5)
+    assert time.monotonic() - start < 30
+    assert sorted(os.listdir(tmp_path / 'models')) == sorted(['LinearRegression.pkl', 'RandomForestRegressor.pkl',
+                                                              modeling.ENCODER_FILENAME, modeling.NATIVE_ENCODER_FILENAME])
+    forest = joblib.load(tmp_path / 'models' / 'RandomForestRegressor.pkl')
+    assert forest.n_jobs == 1  # 4 cores over 3 concurrent workers
+    report = (tmp_path / 'reports' / 'model_report.md').read_text()
+    assert '## SlowRegressor\n- Skipped' in report and '## RandomForestRegressor' in report
+
+def test_svm_substitute_above_row_threshold(tmp_path):
+    from sklearn.svm import SVC
+    from UAM import modeling
+    rng = np.random.default_rng(16)
+    n = 3000
+    df = pd.DataFrame(rng.normal(size=(n, 3)), columns=['a', 'b', 'c'])
+    # A circular boundary that a linear model cannot separate
+    df['label'] = np.where(df['a'] ** 2 + df['b'] ** 2 > 1.4, 'out', 'in')
+    X, y = modeling.preprocess_for_modeling(df, 'label')
+
+    assert isinstance(modeling.candidate_models('classification', n)['SVC'][-1], SVC)
+    models = modeling.train_models(X[:2000], y[:2000], 'classification', svm_max_rows=1000)
+    assert not isinstance(models['SVC'][-1], SVC)
+    results = modeling.evaluate_models(models, X[2000:], y[2000:], 'classification')
+    assert results['SVC']['accuracy'] > 0.9
+    assert models['SVC'].predict_proba(X[:5]).shape == (5, 2)
+
+    models = modeling.train_models(X[:2000], df['a'].to_numpy()[:2000] ** 2, 'regression', svm_max_rows=1000)
+    assert modeling.evaluate_models(models, X[2000:], df['a'].to_numpy()[2000:] ** 2, 'regression')['SVR']['r2_score'] > 0.6
+
+    modeling.run_modeling(df, 'label', output_dir=str(tmp_path), model_dir=str(tmp_path), svm_max_rows=1000)
+    assert '## SVC\n- accuracy' in (tmp_path / 'model_report.md').read_text()
+
+    # Raw calendar features (year ~2020) must not swamp the kernel of the exact SVC
+    df['when'] = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 3 * 365 * 24, size=n), unit='h')
+    X, y = modeling.preprocess_for_modeling(df, 'label')
+    models = modeling.train_models(X[:2000], y[:2000], 'classification')
+    results = modeling.evaluate_models(models, X[2000:], y[2000:], 'classification')
+    assert results['SVC']['accuracy'] > 0.9
+
+def test_hist_gradient_boosting_uses_native_categories_and_missing_values(tmp_path):
+    from UAM import modeling
+    from UAM.encoding import NativeEncoder
+    rng = np.random.default_rng(17)
+    n = 4000
+    df = pd.DataFrame({
+        'x': rng.normal(size=n),
+        'shop': rng.choice([f"shop{i}" for i in range(40)], size=n),
+        'when': pd.date_range('2022-01-01', periods=n, freq='D'),
+    })
+    df['amount'] = df['x'] * 3 + df['shop'].str[4:].astype(int) % 5 + rng.normal(scale=0.1, size=n)
+
+    native = NativeEncoder().fit_transform(df.drop(columns=['amount']))
+    assert native['shop'].dtype == 'category' and 'when_month' in native
+    native.loc[::10, 'x'] = np.nan
+    model = modeling.candidate_models('regression')['HistGradientBoostingRegressor']
+    model.fit(native, df['amount'])
+    assert model.is_categorical_[list(native.columns).index('shop')]
+    # Early stopping ends well before max_iter on this easy target
+    assert model.n_iter_ < model.max_iter
+    assert model.score(native, df['amount']) > 0.9
+
+    # Rare and unseen values map to missing without the pandas "not in categories" warning
+    encoder = NativeEncoder(max_categories=2).fit(pd.DataFrame({'c': ['a'] * 3 + ['b'] * 2 + ['rare']}))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        encoded = encoder.transform(pd.DataFrame({'c': ['a', 'rare', 'unseen', None]}))
+    assert encoded['c'].tolist()[0] == 'a' and encoded['c'].isna().tolist() == [False, True, True, True]
+
+    modeling.run_modeling(df, 'amount', output_dir=str(tmp_path), model_dir=str(tmp_path))
+    report = (tmp_path / 'model_report.md').read_text()
+    r2 = float(report.split('## HistGradientBoostingRegressor')[1].split('r2_score: ')[1].split()[0])
+    assert r2 > 0.9
@@ -0,0 +1,71 @@
+from UAM import eda_engine as eda
+import numpy as np
+import pandas as pd
+
+def test_summary_accumulator_merges_partitions():
+    from UAM.streaming import SummaryAccumulator
+    rng = np.random.default_rng(3)
+    n = 40000
+    df = pd.DataFrame({
+        'x': rng.lognormal(size=n),
+        'y': np.where(np.arange(n) % 13 == 0, np.nan, rng.normal(size=n)),
+        'cat': rng.integers(0, 3000, size=n).astype(str),
+    })
+    df.loc[::17, 'cat'] = None
+    chunks = [df.iloc[i:i + 4096] for i in range(0, n, 4096)]
+    left, right = SummaryAccumulator.for_frame(df), SummaryAccumulator.for_frame(df)
+    for i, chunk in enumerate(chunks):
+        (left if i % 2 else right).update(chunk)
+    merged = left.merge(right)
+
+    stats = merged.numerical()
+    expected = eda.generate_summary_statistics(df)['numerical']
+    for col in ['count', 'mean', 'std', 'min', 'max', 'skew', 'kurtosis']:
+        np.testing.assert_allclose(stats[col], expected[col].astype(float), rtol=1e-9)
+    for col in ['x', 'y']:
+        rank = (df[col] < stats.at[col, 'median']).sum() / df[col].count()
+        assert abs(rank - 0.5) < 0.002
+
+    cat = merged.categorical()
+    assert abs(cat.at['cat', 'unique_count'] - df['cat'].nunique()) / df['cat'].nunique() < 0.03
+    # 3000 distinct values against 1000 monitored ones: the mode is overestimated by at most n / capacity
+    true_mode = df['cat'].value_counts().max()
+    assert true_mode <= cat.at['cat', 'mode_freq'] <= true_mode + n / 1000
+    assert cat.at['cat', 'missing'] == df['cat'].isnull().sum()
+
+def test_bounded_categorical_profile_tracks_heavy_hitters():
+    from UAM.sketches import SpaceSaving
+    rng = np.random.default_rng(12)
+    n = 300000
+    # Zipf-distributed categories: a few heavy hitters over a long tail of ~100k distinct values
+    values = pd.Series(rng.zipf(1.3, size=n).astype(str))
+    values[rng.random(n) < 0.02] = None
+    df = pd.DataFrame({'cat': values, 'flag': np.where(rng.random(n) < 0.95, 'a', 'b')})
+    exact_counts = values.value_counts()
+
+    sketch = SpaceSaving(capacity=500, block_size=20000).update(values)
+    top = sketch.top(5)
+    assert list(top.index) == list(exact_counts.index[:5])
+    truth = exact_counts[top.index]
+    assert (top['guaranteed'] <= truth).all() and (truth <= top['count']).all()
+    assert (top['count'] - truth).max() <= sketch.total / 500
+    assert len(sketch.counts) <= 500
+
+    halves = SpaceSaving(500, 20000).update(values[:n // 2]).merge(SpaceSaving(500, 20000).update(values[n // 2:]))
+    assert list(halves.top(5).index) == list(exact_counts.index[:5])
+
+    cat = eda.generate_summary_statistics(df)['categorical']
+    exact = eda.generate_summary_statistics(df, exact=True)['categorical']
+    assert exact.at['cat', 'unique_count'] == values.nunique()
+    assert abs(cat.at['cat', 'unique_count'] - values.nunique()) / values.nunique() < 0.03
+    assert exact.at['cat', 'mode_freq'] == cat.at['cat', 'mode_freq'] == exact_counts.iloc[0]
+    assert cat.at['flag', 'top_values'] == exact.at['flag', 'top_values']
+    assert cat.at['cat', 'missing'] == values.isnull().sum()
+    assert abs(cat.at['flag', 'dominance'] - (df['flag'] == 'a').mean()) < 1e-12
+    # Below `capacity` distinct values nothing is evicted and the distinct count is exact
+    few = pd.DataFrame({'cat': pd.Series(np.arange(n) % 900).astype(str).astype(object)})
+    assert eda.generate_summary_statistics(few)['categorical'].at['cat', 'unique_count'] == 900
+
+    insights = eda.extract_eda_insights(df)
+    assert any("'flag' is highly imbalanced" in line for line in insights)
+    assert not any("'cat' is highly imbalanced" in line for line in insights)
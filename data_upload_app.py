@@ -1,6 +1,18 @@
 import streamlit as st
 import os
 from UAM import data_loader
+from UAM.fingerprint import dataset_fingerprint
+
+def store_dataset(key, df):
+    """Keep `df` in the session with its content fingerprint, hashed once here instead of on every rerun."""
+    st.session_state[key] = df
+    st.session_state[f"{key}_fingerprint"] = dataset_fingerprint(df)
+
+def stored_fingerprint(key):
+    """Fingerprint saved by store_dataset for the session frame `key` (computed now if it was stored otherwise)."""
+    if st.session_state.get(f"{key}_fingerprint") is None:
+        st.session_state[f"{key}_fingerprint"] = dataset_fingerprint(st.session_state[key])
+    return st.session_state[f"{key}_fingerprint"]
 
 def show_data_upload():
     st.title("Data Ingestion")
@@ -30,9 +42,13 @@ def show_data_upload():
             st.error("Unsupported file type")
             return
         
-        with st.spinner("Loading data..."):
-            df = data_loader.load_data(source_type, {'filepath': temp_file_path})
-            st.session_state.df = df
+        # Every widget interaction reruns this page; only a new upload is loaded (and hashed) again
+        upload_id = (uploaded_file.name, uploaded_file.size)
+        if st.session_state.get("upload_id") != upload_id or st.session_state.get("df") is None:
+            with st.spinner("Loading data..."):
+                store_dataset("df", data_loader.load_data(source_type, {'filepath': temp_file_path}))
+            st.session_state.upload_id = upload_id
+        df = st.session_state.df
         
         st.success("Data loaded successfully!")
         st.dataframe(df.head())
@@ -50,7 +66,7 @@ def show_data_upload():
                     missing_threshold=missing_threshold, 
                     pca_variance=pca_variance
                 )
-                st.session_state.preprocessed_df = df_processed
+                store_dataset("preprocessed_df", df_processed)
                 st.session_state.metadata = metadata
                 
                 st.success("Preprocessing complete!")
@@ -58,4 +74,4 @@ def show_data_upload():
                 st.dataframe(df_processed.head())
                 
                 if pca_fig:
-                    st.pyplot(pca_fig)
+                    st.pyplot(pca_fig.figure)
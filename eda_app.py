@@ -1,30 +1,105 @@
 import streamlit as st
 import os
 import glob
-import hashlib
+import json
 import pandas as pd
 from UAM import eda_engine
+from data_upload_app import stored_fingerprint
 
-def get_dataset_hash(df):
+def get_dataset_hash(key):
     """Generate a unique hash for the dataset to identify if it's the same data"""
-    # Create a string representation of the dataframe structure and content
-    data_str = str(df.shape) + str(df.dtypes) + str(df.head(100).values.tobytes())
-    return hashlib.md5(data_str.encode()).hexdigest()
+    # Full-content fingerprint taken when the frame was stored in the session, so reruns
+    # (every checkbox or button click) do not hash the data again
+    return stored_fingerprint(key)
+
+def chart_spec(chart):
+    """Vega-Lite spec for one chart JSON written by generate_eda_visuals(..., output='data')."""
+    kind = chart['chart']
+    if kind == 'dist':
+        edges = chart['bin_edges']
+        bars = [{'start': lo, 'end': hi, 'count': count} for lo, hi, count in zip(edges[:-1], edges[1:], chart['counts'])]
+        kde = [{'x': x, 'count': y} for x, y in zip(chart['kde_x'], chart['kde_y'])]
+        return {'title': f"Distribution of {chart['column']}", 'layer': [
+            {'data': {'values': bars}, 'mark': {'type': 'bar', 'opacity': 0.5},
+             'encoding': {'x': {'field': 'start', 'type': 'quantitative', 'title': chart['column']},
+                          'x2': {'field': 'end'}, 'y': {'field': 'count', 'type': 'quantitative'}}},
+            {'data': {'values': kde}, 'mark': 'line',
+             'encoding': {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'field': 'count', 'type': 'quantitative'}}},
+        ]}
+    if kind == 'count':
+        values = [{'category': c, 'count': n} for c, n in zip(chart['categories'], chart['counts'])]
+        return {'title': f"Count of {chart['column']}", 'data': {'values': values}, 'mark': 'bar',
+                'encoding': {'x': {'field': 'category', 'type': 'nominal', 'sort': None, 'title': chart['column']},
+                             'y': {'field': 'count', 'type': 'quantitative'}}}
+    if kind == 'heatmap':
+        cols = chart['columns']
+        values = [{'a': a, 'b': b, 'corr': chart['matrix'][i][j]} for i, a in enumerate(cols) for j, b in enumerate(cols)]
+        return {'title': 'Correlation Heatmap', 'data': {'values': values}, 'mark': 'rect',
+                'encoding': {'x': {'field': 'a', 'type': 'nominal', 'sort': cols, 'title': None},
+                             'y': {'field': 'b', 'type': 'nominal', 'sort': cols, 'title': None},
+                             'color': {'field': 'corr', 'type': 'quantitative',
+                                       'scale': {'scheme': 'redblue', 'domain': [-1, 1], 'reverse': True}},
+                             'tooltip': [{'field': 'a'}, {'field': 'b'}, {'field': 'corr', 'format': '.2f'}]}}
+    if kind == 'scatter':
+        x_col, y_col = chart['x_column'], chart['y_column']
+        points = [{x_col: x, y_col: y} for x, y in zip(chart['x'], chart['y'])]
+        layers = [{'data': {'values': points}, 'mark': {'type': 'circle', 'opacity': 0.6},
+                   'encoding': {'x': {'field': x_col, 'type': 'quantitative'}, 'y': {'field': y_col, 'type': 'quantitative'}}}]
+        if chart['fit'] and points:
+            xs = [min(chart['x']), max(chart['x'])]
+            line = [{x_col: x, y_col: chart['fit']['slope'] * x + chart['fit']['intercept']} for x in xs]
+            layers.append({'data': {'values': line}, 'mark': {'type': 'line', 'color': 'red'},
+                           'encoding': {'x': {'field': x_col, 'type': 'quantitative'}, 'y': {'field': y_col, 'type': 'quantitative'}}})
+        return {'title': f"Relationship: {x_col} vs {y_col}", 'layer': layers}
+    if kind == 'box':
+        x = {'field': 'category', 'type': 'nominal', 'sort': None, 'title': chart['category_column']}
+        value = {'type': 'quantitative', 'title': chart['value_column']}
+        return {'title': f"{chart['value_column']} by {chart['category_column']}", 'data': {'values': chart['groups']}, 'layer': [
+            {'mark': 'rule', 'encoding': {'x': x, 'y': {'field': 'whisker_low', **value}, 'y2': {'field': 'whisker_high'}}},
+            {'mark': {'type': 'bar', 'size': 20}, 'encoding': {'x': x, 'y': {'field': 'q1', **value}, 'y2': {'field': 'q3'}}},
+            {'mark': {'type': 'tick', 'color': 'white', 'size': 20}, 'encoding': {'x': x, 'y': {'field': 'median', **value}}},
+        ]}
+    if kind == 'trend':
+        values = [{'x': x, 'y': y} for x, y in zip(chart['x'], chart['y'])]
+        return {'title': f"Trend of {chart['value_column']} over {chart['date_column']}", 'data': {'values': values},
+                'mark': 'line', 'encoding': {'x': {'field': 'x', 'type': 'temporal', 'title': chart['date_column']},
+                                             'y': {'field': 'y', 'type': 'quantitative', 'title': chart['value_column']}}}
+    return None
+
+def show_interactive_charts(df, data_dir):
+    """Charts drawn in the browser from the aggregated JSON, so reruns never touch matplotlib."""
+    if st.button("Generate Chart Data") or not glob.glob(os.path.join(data_dir, "*.json")):
+        with st.spinner("Aggregating chart data..."):
+            eda_engine.generate_eda_visuals(df, data_dir, output='data')
+    chart_files = sorted(glob.glob(os.path.join(data_dir, "*.json")))
+    for i in range(0, len(chart_files), 2):
+        cols = st.columns(2)
+        for j, path in enumerate(chart_files[i:i + 2]):
+            with open(path, encoding='utf-8') as f:
+                spec = chart_spec(json.load(f))
+            if spec is not None:
+                cols[j].vega_lite_chart(spec, use_container_width=True)
 
 def show_eda():
     st.title("Exploratory Data Analysis")
     
     # Use preprocessed_df if available, else fallback to raw df
-    df = st.session_state.get("preprocessed_df")
+    key = "preprocessed_df"
+    df = st.session_state.get(key)
     if df is None:
-        df = st.session_state.get("df")
+        key = "df"
+        df = st.session_state.get(key)
         if df is None:
             st.warning("Please upload data first!")
             return
     
     # Generate dataset hash for caching
-    dataset_hash = get_dataset_hash(df)
+    dataset_hash = get_dataset_hash(key)
     cache_dir = f"eda_outputs/{dataset_hash}"
+
+    if st.checkbox("Interactive charts (rendered in the browser)", value=True):
+        show_interactive_charts(df, os.path.join(cache_dir, "interactive"))
+        return
     
     # Check if visualizations already exist
     existing_visualizations = []
@@ -4,7 +4,7 @@ import pickle
 import json
 import streamlit as st
 import pandas as pd
-from utils.cli_interface import load_data, preprocess_data, run_eda, run_insight_extraction_local, run_modeling, generate_report
+from utils.cli_interface import load_data, clear_ingest_cache, preprocess_data, run_eda, run_insight_extraction_local, run_modeling, generate_report, new_run_cache
 from utils.temp_storage import download_report, download_visualizations
 
 STATE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'streamlit_app', 'state')
@@ -77,6 +77,7 @@ def show():
 
     if st.button("Clear saved state and start fresh"):
         clear_state()
+        clear_ingest_cache()
         st.session_state.df = None
         st.session_state.pipeline_status = {
             "Data Loaded": False,
@@ -99,7 +100,7 @@ def show():
                 st.error("Unsupported file format")
                 return
 
-            source_config = {'filepath': uploaded_file}
+            source_config = {'filepath': uploaded_file, 'cache': True}
             df = load_data(source_type, source_config)
             st.session_state.df = df
             st.session_state.file_name = uploaded_file.name
@@ -138,12 +139,13 @@ def show():
             model_dir = "models"
 
             st.info("Running Exploratory Data Analysis (EDA)...")
-            run_eda(df, save_path=save_path)
+            run_cache = new_run_cache()  # shared by the EDA and insight steps on this df
+            run_eda(df, save_path=save_path, cache=run_cache)
             st.session_state.pipeline_status["EDA"] = True
             st.success("EDA completed.")
 
             st.info("Running Insight Extraction...")
-            run_insight_extraction_local(df, output_path=insight_report_path)
+            run_insight_extraction_local(df, output_path=insight_report_path, cache=run_cache)
             st.session_state.pipeline_status["Insight Extraction"] = True
             st.success("Insight Extraction completed.")
 
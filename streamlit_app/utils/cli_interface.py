@@ -2,21 +2,27 @@ import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
-from UAM import data_loader, eda_engine, modeling, nl_query_interface, report_generator
+from UAM import data_loader, eda_engine, modeling, nl_query_interface, report_generator, ingest_cache, frame_cache
 from  UAM import insight_extractor
 from UAM.nl_query_interface import NaturalLanguageQueryInterface
 
 def load_data(source_type, source_config):
     return data_loader.load_data(source_type, source_config)
 
+def clear_ingest_cache():
+    return ingest_cache.invalidate()
+
 def preprocess_data(df, **kwargs):
     return data_loader.preprocess_data(df, **kwargs)
 
-def run_eda(df, save_path="eda_outputs/"):
-    eda_engine.run_full_eda(df, save_path=save_path)
+def new_run_cache():
+    return frame_cache.FrameCache()
 
-def run_insight_extraction_local(df, output_path):
-    return insight_extractor.run_insight_extraction(df, output_path)
+def run_eda(df, save_path="eda_outputs/", cache=None):
+    eda_engine.run_full_eda(df, save_path=save_path, cache=cache)
+
+def run_insight_extraction_local(df, output_path, cache=None):
+    return insight_extractor.run_insight_extraction(df, output_path, cache=cache)
 
 def run_modeling(df, provided_target=None, output_dir="reports", model_dir="models"):
     return modeling.run_modeling(df, provided_target, output_dir, model_dir)